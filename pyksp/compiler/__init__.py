@@ -1,7 +1,7 @@
-import os
-import sys
-path = os.path.abspath(os.path.dirname(__file__))
-sys.path.append(path)
+import importlib as _importlib
+import os as _os
+import sys as _sys
+_sys.path.append(_os.path.abspath(_os.path.dirname(__file__)))
 
 from native_types import kInt
 from native_types import kStr
@@ -13,27 +13,8 @@ from native_types import kNone
 from native_types import kVar
 
 from script import kScript
-
-from bi_ui_controls import kMainWindow
-from bi_ui_controls import kWidget
-from bi_ui_controls import KspNativeControl
-from bi_ui_controls import kButton
-from bi_ui_controls import kSlider
-from bi_ui_controls import kSwitch
-from bi_ui_controls import kKnob
-from bi_ui_controls import kMenu
-from bi_ui_controls import kLabel
-
-from bi_ui_controls import kLevelMeter
-from bi_ui_controls import kTable
-from bi_ui_controls import kValueEdit
-from bi_ui_controls import kTextEdit
-from bi_ui_controls import kWaveForm
-from bi_ui_controls import kXy
-from bi_ui_controls import kFileSelector
-
-from bi_misc import kLog
-from bi_misc import logpr
+from context import CompileContext
+from report import CompileReport
 
 import callbacks as on
 
@@ -51,3 +32,46 @@ from stack import kLoc
 from functions import kArg
 from functions import kOut
 from functions import func
+
+# built-ins modules are heavy, so they are imported on the first
+# access to their names (PEP 562). "from pyksp.compiler import *"
+# has to bind every name, so it imports them all; import names
+# explicitly to keep the loading lazy
+_lazy = {
+    'kMainWindow': 'bi_ui_controls',
+    'kWidget': 'bi_ui_controls',
+    'KspNativeControl': 'bi_ui_controls',
+    'kButton': 'bi_ui_controls',
+    'kSlider': 'bi_ui_controls',
+    'kSwitch': 'bi_ui_controls',
+    'kKnob': 'bi_ui_controls',
+    'kMenu': 'bi_ui_controls',
+    'kLabel': 'bi_ui_controls',
+    'kLevelMeter': 'bi_ui_controls',
+    'kTable': 'bi_ui_controls',
+    'kValueEdit': 'bi_ui_controls',
+    'kTextEdit': 'bi_ui_controls',
+    'kWaveForm': 'bi_ui_controls',
+    'kXy': 'bi_ui_controls',
+    'kFileSelector': 'bi_ui_controls',
+    'kLog': 'bi_misc',
+    'logpr': 'bi_misc'}
+
+
+def __getattr__(name):
+    try:
+        module = _lazy[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(_importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
+
+
+__all__ = [name for name in globals() if not name.startswith('_')] + \
+    list(_lazy)
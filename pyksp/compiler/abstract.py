@@ -1,46 +1,81 @@
-from abc import ABCMeta
 from abc import abstractmethod
 import hashlib
+import itertools
+import re
+import string
 
 from typing import List
+from typing import Set
 
+from context import current_context
+from context import ContextAttr
+from context import ContextMeta
 
-class SingletonMeta(ABCMeta):
-    '''Singleton metaclass'''
-    def __init__(cls, *args, **kw):
-        cls.instance = None
+
+class SingletonMeta(ContextMeta):
+    '''Singleton metaclass
+    instance is owned by the current CompileContext'''
+
+    @property
+    def instance(cls):
+        return current_context().singletons.get(cls)
+
+    @instance.setter
+    def instance(cls, val):
+        # behaves as class attribute, so descriptors are resolved
+        if hasattr(type(val), '__get__'):
+            val = type(val).__get__(val, None, cls)
+        singletons = current_context().singletons
+        if val is None:
+            singletons.pop(cls, None)
+            return
+        singletons[cls] = val
 
     def __call__(cls, *args, **kw):
-        if cls.instance is None:
+        try:
+            return current_context().singletons[cls]
+        except KeyError:
             cls.instance = \
                 super(SingletonMeta, cls).__call__(*args, **kw)
         return cls.instance
 
 
-class KspBoolProp:
+class KspBoolProp(ContextAttr):
     '''class property, initialized at False and accepts only bool'''
 
     def __init__(self):
-        self.__val = False
-
-    def __get__(self, obj, cls):
-        return self.__val
+        super().__init__(default=False)
 
     def __set__(self, obj, val):
         if not isinstance(val, bool):
             raise TypeError('has to be bool')
-        self.__val = val
+        super().__set__(obj, val)
 
     def __delete__(self):
         raise RuntimeError('can not be deleted')
 
 
-class KSP(metaclass=ABCMeta):
+# every change of names gets the unique epoch, even in other contexts
+_epochs = itertools.count()
+
+
+class KspNameProp(ContextAttr):
+    '''class property, which changes compiled names of objects'''
+
+    def __set__(self, obj, val):
+        super().__set__(obj, val)
+        KSP.names_changed()
+
+
+class KSP(metaclass=ContextMeta):
     '''Base abstract class for all compiler classes'''
-    __is_compiled = False
-    __is_bool = False
-    __in_init = True
-    __callback = None
+    __slots__ = ()
+    __is_compiled = ContextAttr(False)
+    __names_epoch = ContextAttr(factory=lambda: next(_epochs))
+    __is_bool = ContextAttr(False)
+    __is_simulated = ContextAttr(True)
+    __in_init = ContextAttr(True)
+    __callback = ContextAttr(None)
 
     @staticmethod
     def is_compiled():
@@ -69,6 +104,35 @@ class KSP(metaclass=ABCMeta):
             raise TypeError('has to be bool')
         KSP.__is_compiled = val
 
+    @staticmethod
+    def is_simulated():
+        '''False if runtime values are not computed under
+        compilation (see set_simulated())'''
+        return KSP.__is_simulated or not KSP.__is_compiled
+
+    @staticmethod
+    def set_simulated(val):
+        '''with val False, compiled objects only emit the code:
+        runtime values of variables, arrays and built-in functions
+        are not computed. Bodies of loops are never simulated under
+        compilation (see For)'''
+        if not isinstance(val, bool):
+            raise TypeError('has to be bool')
+        KSP.__is_simulated = val
+
+    @staticmethod
+    def names_epoch():
+        '''returns id of the current state of compiled names
+        (see names_changed())'''
+        return KSP.__names_epoch
+
+    @staticmethod
+    def names_changed():
+        '''has to be called on every change of compiled
+        representation of objects. Invalidates expanded strings,
+        cached by Ast objects'''
+        KSP.__names_epoch = next(_epochs)
+
     @staticmethod
     def is_bool():
         '''check state (for usage in if/else select/case blocks)'''
@@ -96,7 +160,9 @@ class KSP(metaclass=ABCMeta):
         '''sets KSP variables to default'''
         KSP.__is_compiled = False
         KSP.__is_bool = False
+        KSP.__is_simulated = True
         KSP.__in_init = True
+        KSP.names_changed()
 
 
 class INameLocal(KSP):
@@ -109,7 +175,7 @@ class INameLocal(KSP):
     prefix and postfix used in childs for preserving order of strings
     '''
 
-    script_prefix = ''
+    script_prefix = KspNameProp('')
 
     def __init__(self, name, prefix='', postfix=''):
         self._name = name
@@ -129,10 +195,19 @@ class IName(INameLocal):
     '''name can be compacted by default. For preserving use
     preserve=True
     prefix and postfix are always preserved and placed at sides.
+
+    compact mode can be:
+    - False: names are used as is
+    - True: names are hashed to 5 letters
+    - IName.shortest: names are replaced by shortest unique
+        identifiers after the code generation (see IName.shorten)
     '''
 
-    __is_compact = False
-    __names: List[str] = list()
+    shortest = 'shortest'
+
+    __is_compact = ContextAttr(False)
+    __names: Set[str] = ContextAttr(factory=set)
+    __shortened: List['IName'] = ContextAttr(factory=list)
 
     @staticmethod
     def is_compact():
@@ -141,22 +216,26 @@ class IName(INameLocal):
 
     @staticmethod
     def set_compact(val):
-        '''at True hashes names to 5-letter'''
-        if not isinstance(val, bool):
-            raise TypeError('has to be bool')
+        '''at True hashes names to 5-letter, at IName.shortest
+        names are shortened after generation'''
+        if not isinstance(val, bool) and val != IName.shortest:
+            raise TypeError('has to be bool or IName.shortest')
         IName.__is_compact = val
+        KSP.names_changed()
 
     def __init__(self, name, prefix='', postfix='',
                  preserve=False):
         self._preserve = preserve
         self._full = name
-        if not preserve and self.is_compact() is True:
+        compact = self.is_compact()
+        if not preserve and compact is True:
             name = self.get_compact_name(name)
-        else:
-            name = name
         if name in IName.__names:
             raise NameError(f'name "{name}" exists')
-        IName.__names.append(name)
+        IName.__names.add(name)
+        if not preserve and compact == IName.shortest:
+            name = f'\x00{len(IName.__shortened)}\x00'
+            IName.__shortened.append(self)
         super().__init__(name=name, prefix=prefix, postfix=postfix)
 
     @staticmethod
@@ -169,6 +248,43 @@ class IName(INameLocal):
                            in hash.digest()[:5]))
         return compact
 
+    @staticmethod
+    def shorten(lines):
+        '''returns list of lines, where names, declared in
+        IName.shortest mode are replaced by the shortest unique
+        identifiers. Names with more references get shorter ones.
+        Persistent variables get hashed names, as they are the same
+        for every compilation and persistent values are not lost.'''
+        lines = list(lines)
+        counts = dict()
+        persistent = set()
+        for line in lines:
+            if '\x00' not in line:
+                continue
+            for idx in _placeholder_re.findall(line):
+                counts[idx] = counts.get(idx, 0) + 1
+            if 'persistent' in line:
+                persistent.update(_persistent_re.findall(line))
+        inames = IName.__shortened
+        taken = set(IName.__names)
+        names = dict()
+        for idx in persistent:
+            names[idx] = IName.get_compact_name(inames[int(idx)].full)
+            taken.add(names[idx])
+        ids = _short_ids(taken)
+        for idx in sorted(counts, key=lambda idx: (-counts[idx], int(idx))):
+            if idx not in names:
+                names[idx] = next(ids)
+        for iname in inames:
+            idx = iname._name[1:-1]
+            iname._name = names.get(idx) or next(ids)
+        KSP.names_changed()
+
+        def replace(match):
+            return names[match.group(1)]
+        return [_placeholder_re.sub(replace, line) if '\x00' in line
+                else line for line in lines]
+
     @property
     def full(self):
         return self._full
@@ -176,16 +292,49 @@ class IName(INameLocal):
     @staticmethod
     def refresh():
         INameLocal.refresh()
-        IName.__names = list()
+        IName.__names = set()
+        IName.__shortened = list()
         IName.__is_compact = False
 
 
+_placeholder_re = re.compile(r'\x00(\d+)\x00')
+_persistent_re = re.compile(
+    r'(?:make_persistent|read_persistent_var)\([^)]*?\x00(\d+)\x00')
+# keywords of KSP
+_keywords = (
+    'and', 'by', 'call', 'case', 'const', 'declare', 'downto', 'else',
+    'end', 'family', 'for', 'function', 'if', 'in', 'mod', 'not', 'on',
+    'or', 'override', 'select', 'to', 'while', 'xor')
+# words, which can not be used as unprefixed names (of functions):
+# keywords and names of built-in functions (see reserve())
+_reserved = set(_keywords)
+
+
+def reserve(name: str):
+    '''marks name of KSP built-in function, so it is not generated
+    as a name in IName.shortest mode'''
+    _reserved.add(name)
+
+
+def _short_ids(taken):
+    '''yields identifiers in order of length: a, ..., z, aa, ab, ...
+    skipping taken and reserved'''
+    first = string.ascii_lowercase
+    rest = string.ascii_lowercase + string.digits
+    for length in itertools.count(1):
+        for head in first:
+            for tail in itertools.product(rest, repeat=length - 1):
+                name = head + ''.join(tail)
+                if name not in taken and name not in _reserved:
+                    yield name
+
+
 class KspObject(KSP):
     '''Base abstract class for all objects can be
     translated to code'''
 
     comments = KspBoolProp()
-    _instances: List['KspObject'] = list()
+    _instances: List['KspObject'] = ContextAttr(factory=list)
 
     @property
     def has_init(self):
@@ -287,6 +436,8 @@ class Output(metaclass=SingletonMeta):
         self.callable_on_put = None
         self.exception_on_put = None
         self.__output = self.__default
+        # count of put() calls, is never refreshed
+        self.puts = 0
 
     def set(self, obj):
         '''set list for code from internal to external
@@ -311,6 +462,7 @@ class Output(metaclass=SingletonMeta):
         callable_on_put - executes callable once at put
         and set it to None
         '''
+        self.puts += 1
         if self.exception_on_put:
             raise self.exception_on_put
         if self.callable_on_put:
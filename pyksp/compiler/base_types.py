@@ -1,13 +1,132 @@
 from abc import abstractmethod
+from array import array
+from functools import wraps
+import operator
 from warnings import warn
 
 from abstract import KspObject
 from abstract import KSP
 from abstract import Output
+from context import ContextAttr
+from context import CompileContext
 
 from typing import Union
 
 
+_int_min = -2 ** 31
+
+
+def int32(value: int) -> int:
+    '''wraps int to the range of KSP 32-bit integer'''
+    return (value - _int_min) % 2 ** 32 + _int_min
+
+
+def ksp_div(a, b):
+    '''division as KSP does: integer division truncates toward zero'''
+    if isinstance(a, int) and isinstance(b, int):
+        quotient = abs(a) // abs(b)
+        return quotient if (a < 0) == (b < 0) else -quotient
+    return a / b
+
+
+def ksp_mod(a: int, b: int) -> int:
+    '''modulo as KSP does: result has the sign of the dividend'''
+    if not isinstance(a, int) or not isinstance(b, int):
+        raise TypeError('mod is defined only for integers')
+    return a - b * ksp_div(a, b)
+
+
+def _folding(expand):
+    '''decorator of AstOperator.expand(): expands folded constant
+    subtree to the literal'''
+    @wraps(expand)
+    def wrapper(self):
+        value = self.folded()
+        if value is not None:
+            return f'{value}'
+        return expand(self)
+    return wrapper
+
+
+# priority of comparisons, which are bracketed inside "and" and "or"
+_comparison = 7
+# deeper trees are expanded by _expand_subtrees()
+_max_depth = 32
+
+
+def _depth(args):
+    '''returns depth of Ast tree with args'''
+    depth = 0
+    for arg in args:
+        if isinstance(arg, AstBase):
+            depth = max(depth, getattr(arg, '_depth', 1))
+    return depth + 1
+
+
+def _intern_key(arg):
+    '''literals are equal by value, other args by identity'''
+    if type(arg) in (int, float, str):
+        return (type(arg), arg)
+    return id(arg)
+
+
+def _int_literal(arg):
+    '''returns int value of literal or folded subtree or None'''
+    if isinstance(arg, AstOperator):
+        arg = arg.folded()
+    return arg if type(arg) is int else None
+
+
+def _split(kind, args):
+    '''returns (x, c) of args of "x op c" or "c op x" with int literal
+    c, or None. "x - c" is returned as (x, -c), "c - x" is not split'''
+    left, right = args
+    if kind is not AstSub and _int_literal(left) is not None:
+        left, right = right, left
+    value = _int_literal(right)
+    if value is None or _int_literal(left) is not None:
+        return None
+    return left, -value if kind is AstSub else value
+
+
+def _chain(node, kinds):
+    '''returns _split() of node of kinds or None'''
+    if type(node) not in kinds:
+        return None
+    return _split(type(node), node._args)
+
+
+def _offset(expr, value):
+    '''returns "expr + value" ("expr - -value" for negative value)
+    or None if value does not fit 32-bit integer'''
+    if value != int32(value):
+        return None
+    if value < 0 and value != _int_min:
+        return AstSub(expr, -value)
+    return AstAdd(expr, value)
+
+
+def _memoized(expand):
+    '''decorator of Ast expand(): in compiled mode expanded string is
+    cached until compiled names of objects are changed
+    (see KSP.names_changed()).
+    Uncached subtrees are expanded from the deepest nodes, so
+    long chains of operators are expanded without deep recursion.'''
+    @wraps(expand)
+    def wrapper(self):
+        if not self.is_compiled():
+            return expand(self)
+        key = (self.names_epoch(), self.is_bool())
+        if self._expanded_key == key:
+            return self._expanded
+        if self._depth > _max_depth:
+            self._expand_subtrees(key)
+        self._expanded = expand(self)
+        self._expanded_key = key
+        return self._expanded
+    return wrapper
+
+
 class AstBase(KSP):
     '''Base abstract class for all Ast objects.
     Requires overriding of methods expand() and get_value()
@@ -15,6 +134,7 @@ class AstBase(KSP):
     expand(self) has to return string representation of method
     get_value(self) has to behave like real representation of method
     '''
+    __slots__ = ()
 
     @abstractmethod
     def expand(self):
@@ -24,11 +144,36 @@ class AstBase(KSP):
     def get_value(self):
         pass
 
+    def _subtrees(self):
+        '''returns Ast args, which expansions are needed for the own'''
+        return [arg for arg in getattr(self, '_args', ())
+                if isinstance(arg, AstBase)]
+
+    def _expand_subtrees(self, key):
+        '''expands uncached Ast args in post-order without recursion'''
+        seen = set()
+        stack = [(self, False)]
+        while stack:
+            node, ready = stack.pop()
+            if ready:
+                if node is not self:
+                    node.expand()
+                continue
+            stack.append((node, True))
+            for arg in node._subtrees():
+                # not memoized args are expanded by the node itself
+                if getattr(arg, '_expanded_key', key) == key \
+                        or id(arg) in seen:
+                    continue
+                seen.add(id(arg))
+                stack.append((arg, False))
+
 
 class AstAssign(AstBase):
     '''special top-level Ast class for making assigements.
     Has not method get_value()
     '''
+    __slots__ = ('_to_arg', '_from_arg')
 
     def __init__(self, to_arg, from_arg):
         if isinstance(to_arg, KspVar):
@@ -66,29 +211,54 @@ class AstAddString(AstBase):
     '''special operator method for strings concatenation
     args has to be instances of (callable, str, AstBase, KspVar)
     '''
+    __slots__ = ('_args', '_depth', '_parts', '_expanded', '_expanded_key')
 
     def __init__(self, arg1, arg2):
         self._args = [arg1, arg2]
+        self._depth = _depth(self._args)
+        self._expanded_key = None
 
+    @_memoized
     def expand(self):
-        '''returns "a & b"'''
+        '''returns "a & b".
+        Adjacent string literals are concatenated at compile time'''
         super().expand()
-        args = list()
+        parts = list()
+        self._expand_parts(parts)
+        self._parts = parts
+        return ' & '.join(f'"{part}"' if literal else part
+                          for literal, part in parts)
+
+    def _expand_parts(self, parts):
+        '''appends (is_literal, str) pairs of all concatenated args
+        to parts, merging adjacent literals'''
         for arg in self._args:
             if callable(arg):
                 arg = arg()
+            if isinstance(arg, AstAddString):
+                # parts of nested concatenation are cached with it
+                arg.expand()
+                for literal, part in arg._parts:
+                    self._add_part(parts, literal, part)
+                continue
             if isinstance(arg, str):
-                args.append(f'"{arg}"')
+                self._add_part(parts, True, arg)
                 continue
             if isinstance(arg, AstBase):
-                args.append(arg.expand())
+                parts.append((False, arg.expand()))
                 continue
             if isinstance(arg, KspVar):
-                args.append(f'{arg.val}')
+                parts.append((False, f'{arg.val}'))
                 continue
             raise NotImplementedError('maybe something has to be ' +
                                       f'added to {AstAddString}?')
-        return f'{args[0]} & {args[1]}'
+
+    @staticmethod
+    def _add_part(parts, literal, part):
+        if literal and parts and parts[-1][0]:
+            parts[-1] = (True, parts[-1][1] + part)
+        else:
+            parts.append((literal, part))
 
     def get_value(self):
         '''returns self.expand()'''
@@ -119,10 +289,112 @@ class AstAddString(AstBase):
 
 
 class AstOperator(AstBase):
-    '''Base abstract class for all operators.'''
+    '''Base abstract class for all operators.
+
+    Subtrees, which leaves are int or float literals are folded
+    at compile time by operators with _fold function (see folded()).
+    Int literals of additive and multiplicative chains are folded
+    as well, e.g. (x + 3) - 4 is built as x - 1 (see _reassociate())
+
+    With interning (see set_interning()) structurally identical
+    expressions within a callback are the same object'''
+    __slots__ = ('_args', '_depth', '_folded', '_expanded', '_expanded_key')
+
+    # function of literal args, returns value as KSP evaluates it
+    _fold = None
+    # {(class, callback, args): node} or None if interning is off
+    _interned = ContextAttr(None)
+
+    def __new__(cls, *args, **kwargs):
+        if not kwargs:
+            node = cls._reassociate(*args)
+            if node is not None:
+                return node
+        table = AstOperator._interned
+        if table is not None and not kwargs:
+            key = (cls, id(KSP.callback()), *map(_intern_key, args))
+            node = table.get(key)
+            if node is not None:
+                return node
+        node = object.__new__(cls)
+        node._args = None
+        if table is not None and not kwargs:
+            table[key] = node
+        return node
 
     def __init__(self, *args):
+        if self._args is not None:
+            # interned node is initialized yet
+            return
         self._args = args
+        self._depth = _depth(args)
+        self._expanded_key = None
+        # args are folded yet, so chains are folded without recursion
+        self._folded = self._fold_args()
+
+    @classmethod
+    def _reassociate(cls, *args):
+        '''returns node equal to cls(*args) with int literals
+        of the chain folded, or None'''
+        return None
+
+    @staticmethod
+    def set_interning(val):
+        '''at True operators return the same node for structurally
+        identical expressions within a callback'''
+        if not isinstance(val, bool):
+            raise TypeError('has to be bool')
+        AstOperator._interned = dict() if val else None
+
+    @staticmethod
+    def is_interning():
+        return AstOperator._interned is not None
+
+    @staticmethod
+    def refresh():
+        '''clears the interning table'''
+        if AstOperator._interned is not None:
+            AstOperator._interned = dict()
+
+    def folded(self):
+        '''returns int or float value of the subtree, if all its leaves
+        are literals of the same type, otherwise None.
+        Follows KSP semantics: integers are 32-bit, division
+        truncates toward zero, modulo has the sign of the dividend'''
+        try:
+            return self._folded
+        except AttributeError:
+            self._folded = self._fold_args()
+            return self._folded
+
+    def _subtrees(self):
+        if self.folded() is not None:
+            return []
+        return super()._subtrees()
+
+    def _fold_args(self):
+        if self._fold is None:
+            return None
+        args = list()
+        for arg in self._args:
+            if isinstance(arg, AstOperator):
+                arg = arg.folded()
+            if type(arg) not in (int, float):
+                return None
+            args.append(arg)
+        if len(set(map(type, args))) > 1:
+            # KSP does not mix integers and reals
+            return None
+        try:
+            value = self._fold(*args)
+        except (ArithmeticError, TypeError):
+            return None
+        if isinstance(value, int):
+            return int32(value)
+        if value != value or value in (float('inf'), float('-inf')) \
+                or 'e' in repr(value):
+            return None
+        return value
 
     def unpack_args(self, *args):
         '''gets values of KspVar objects and expands AstBase objects
@@ -158,10 +430,16 @@ class AstOperator(AstBase):
         '''returns f"{val1} {string} {val2}"'''
         pr = list()
         for arg in self._args:
+            if isinstance(arg, AstOperator) and arg.folded() is not None:
+                pr.append(0)
+                continue
             if isinstance(arg, AstBase):
                 pr.append(arg.priority)
                 continue
             pr.append(0)
+        if self.priority > _comparison:
+            pr = [self.priority + 1 if p == _comparison else p
+                  for p in pr]
         val1, val2 = self.unpack_args(val1, val2)
         if self.priority <= pr[1]:
             val2 = f'({val2})'
@@ -316,8 +594,12 @@ class AstOperator(AstBase):
 
 
 class AstNeg(AstOperator):
+    __slots__ = ()
     priority = 2
+    _fold = staticmethod(operator.neg)
 
+    @_memoized
+    @_folding
     def expand(self):
         val = self.unpack_args(*self._args)
         return self.unary('-', val)
@@ -327,8 +609,12 @@ class AstNeg(AstOperator):
 
 
 class AstNot(AstOperator):
+    __slots__ = ()
     priority = 2
+    _fold = staticmethod(operator.invert)
 
+    @_memoized
+    @_folding
     def expand(self):
         val = self.unpack_args(*self._args)
         return self.unary('.not.', val)
@@ -338,8 +624,20 @@ class AstNot(AstOperator):
 
 
 class AstAdd(AstOperator):
+    __slots__ = ()
     priority = 4
-
+    _fold = staticmethod(operator.add)
+
+    @classmethod
+    def _reassociate(cls, *args):
+        outer = _split(cls, args)
+        inner = outer and _chain(outer[0], (AstAdd, AstSub))
+        if not inner:
+            return None
+        return _offset(inner[0], inner[1] + outer[1])
+
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('+', val1, val2)
@@ -349,8 +647,20 @@ class AstAdd(AstOperator):
 
 
 class AstSub(AstOperator):
+    __slots__ = ()
     priority = 4
-
+    _fold = staticmethod(operator.sub)
+
+    @classmethod
+    def _reassociate(cls, *args):
+        outer = _split(cls, args)
+        inner = outer and _chain(outer[0], (AstAdd, AstSub))
+        if not inner:
+            return None
+        return _offset(inner[0], inner[1] + outer[1])
+
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('-', val1, val2)
@@ -360,8 +670,23 @@ class AstSub(AstOperator):
 
 
 class AstMul(AstOperator):
+    __slots__ = ()
     priority = 3
-
+    _fold = staticmethod(operator.mul)
+
+    @classmethod
+    def _reassociate(cls, *args):
+        outer = _split(cls, args)
+        inner = outer and _chain(outer[0], (AstMul,))
+        if not inner:
+            return None
+        value = inner[1] * outer[1]
+        if value != int32(value):
+            return None
+        return AstMul(inner[0], value)
+
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('*', val1, val2)
@@ -371,30 +696,40 @@ class AstMul(AstOperator):
 
 
 class AstDiv(AstOperator):
+    __slots__ = ()
     priority = 3
+    _fold = staticmethod(ksp_div)
 
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('/', val1, val2)
 
     def get_value(self):
-        return super().get_value(lambda arg1, arg2: arg1 / arg2)
+        return super().get_value(ksp_div)
 
 
 class AstMod(AstOperator):
+    __slots__ = ()
     priority = 3
+    _fold = staticmethod(ksp_mod)
 
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('mod', val1, val2)
 
     def get_value(self):
-        return super().get_value(lambda arg1, arg2: arg1 & arg2)
+        return super().get_value(ksp_mod)
 
 
 class AstPow(AstOperator):
+    __slots__ = ()
     priority = 1
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.bracket_double('pow', val1, val2)
@@ -404,8 +739,10 @@ class AstPow(AstOperator):
 
 
 class AstLogAnd(AstOperator):
+    __slots__ = ()
     priority = 8
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('and', val1, val2)
@@ -415,8 +752,22 @@ class AstLogAnd(AstOperator):
 
 
 class AstBinAnd(AstOperator):
-    priority = 6
+    __slots__ = ()
+    _fold = staticmethod(operator.and_)
+
+    @property
+    def priority(self):
+        '''in boolean context binds as "and"'''
+        return AstLogAnd.priority if self.is_bool() else 6
 
+    def folded(self):
+        '''in boolean context is not folded'''
+        if self.is_bool():
+            return None
+        return super().folded()
+
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         if self.is_bool():
@@ -428,8 +779,11 @@ class AstBinAnd(AstOperator):
 
 
 class AstLogOr(AstOperator):
-    priority = 8
+    __slots__ = ()
+    # "and" binds tighter
+    priority = 9
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('or', val1, val2)
@@ -439,8 +793,22 @@ class AstLogOr(AstOperator):
 
 
 class AstBinOr(AstOperator):
-    priority = 6
+    __slots__ = ()
+    _fold = staticmethod(operator.or_)
+
+    @property
+    def priority(self):
+        '''in boolean context binds as "or"'''
+        return AstLogOr.priority if self.is_bool() else 6
+
+    def folded(self):
+        '''in boolean context is not folded'''
+        if self.is_bool():
+            return None
+        return super().folded()
 
+    @_memoized
+    @_folding
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         if self.is_bool():
@@ -452,8 +820,10 @@ class AstBinOr(AstOperator):
 
 
 class AstEq(AstOperator):
+    __slots__ = ()
     priority = 7
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('=', val1, val2)
@@ -463,8 +833,10 @@ class AstEq(AstOperator):
 
 
 class AstNe(AstOperator):
+    __slots__ = ()
     priority = 7
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('#', val1, val2)
@@ -474,8 +846,10 @@ class AstNe(AstOperator):
 
 
 class AstLt(AstOperator):
+    __slots__ = ()
     priority = 7
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('<', val1, val2)
@@ -485,8 +859,10 @@ class AstLt(AstOperator):
 
 
 class AstGt(AstOperator):
+    __slots__ = ()
     priority = 7
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('>', val1, val2)
@@ -496,8 +872,10 @@ class AstGt(AstOperator):
 
 
 class AstLe(AstOperator):
+    __slots__ = ()
     priority = 7
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('<=', val1, val2)
@@ -507,8 +885,10 @@ class AstLe(AstOperator):
 
 
 class AstGe(AstOperator):
+    __slots__ = ()
     priority = 7
 
+    @_memoized
     def expand(self):
         val1, val2 = self.unpack_args(*self._args)
         return self.standart('>=', val1, val2)
@@ -614,7 +994,8 @@ class KspVar(KspObject):
         '''Puts AstAssign to Output()
         calls self._set_runtime with "val" rutime val
         '''
-        self._set_runtime(self._get_rutime_other(val))
+        if self.is_simulated():
+            self._set_runtime(self._get_rutime_other(val))
         Output().put(AstAssign(self, val).expand())
 
     def _get_rutime_other(self, other):
@@ -689,13 +1070,14 @@ class KspStrVar(KspVar):
     '''
 
     def _set_compiled(self, other):
-        if isinstance(other, KspNumeric):
-            runtime = f'{other._get_runtime()}'
-        else:
-            runtime = other
+        if self.is_simulated():
+            if isinstance(other, KspNumeric):
+                runtime = f'{other._get_runtime()}'
+            else:
+                runtime = other
+            self._set_runtime(runtime)
         if isinstance(other, str):
             other = f'"{other}"'
-        self._set_runtime(runtime)
         Output().put(AstAssign(self, other).expand())
 
     def __add__(self, other):
@@ -1106,8 +1488,16 @@ class KspArray(KspVar):
     via __getitem__ and _runtime_iter.
     (local maked by kwarg "local=True", value handles via standart
     kwarg value)
+
+    Runtime values are stored in list, or in array.array of
+    _typecode, if it is specified by subclass. Typed storage keeps
+    only runtime values: objects of the init sequence are resolved
+    and integers are wrapped to 32 bit as KSP does
     '''
 
+    # typecode of array.array for runtime values or None for list
+    _typecode = None
+
     def __init__(self, name, name_prefix='', name_postfix='',
                  preserve_name=False, has_init=True,
                  is_local=False, ref_type=None, item_type=None,
@@ -1130,7 +1520,8 @@ class KspArray(KspVar):
         self.__prefix = name_prefix
         self.__postfix = name_postfix
         self.__init_seq = None
-        self._seq = []
+        self.__default = def_val
+        self._seq = self._new_seq(())
 
         if size is not None:
             if seq:
@@ -1142,22 +1533,43 @@ class KspArray(KspVar):
             else:
                 self._size = 0
             self._init_size = get_runtime(size)
-            self._seq = [None] * get_runtime(size)
+            self._seq = self._new_seq([None]) * self._init_size
         else:
             self._size = 0
             self._init_size = 0
-        self._cashed = [None] * self._init_size
         if seq is not None:
             self._seq = self._init_seq(seq)
             self.__init_seq = seq.copy()
-        self.__default = def_val
 
     @property
     def default(self):
         return self.__default
 
+    def _new_seq(self, values):
+        '''returns storage of runtime values (see class doc)'''
+        if self._typecode is None:
+            return list(values)
+        values = [self.__default if val is None else
+                  val if type(val) in (int, float) else get_runtime(val)
+                  for val in values]
+        try:
+            return array(self._typecode, values)
+        except OverflowError:
+            if self._typecode != 'i':
+                raise
+            return array(self._typecode, map(int32, values))
+
+    def _store(self, idx, val):
+        '''puts runtime value to the storage at idx'''
+        try:
+            self._seq[idx] = val
+        except OverflowError:
+            if self._typecode != 'i':
+                raise
+            self._seq[idx] = int32(val)
+
     def _init_seq(self, seq):
-        '''makes self._cashed and returns seq
+        '''returns seq
         depends on init arguments'''
         if not isinstance(seq, list):
             raise TypeError('seq has to be instance of list')
@@ -1166,8 +1578,7 @@ class KspArray(KspVar):
                 seq.extend([None] * (self._init_size - len(seq)))
         else:
             self._size = len(seq)
-            self._cashed = [None] * len(seq)
-        return seq.copy()
+        return self._new_seq(seq)
 
     def _generate_init(self):
         '''returns declaration line and optional addition assignement
@@ -1213,8 +1624,7 @@ class KspArray(KspVar):
         if not self.in_init():
             raise RuntimeError('can not append outside init block')
         if not self._init_size:
-            self._seq.append(val)
-            self._cashed.append(None)
+            self._seq.extend(self._new_seq([val]))
             self.set_at_idx(self._size, val)
             self._size += 1
             return
@@ -1230,29 +1640,33 @@ class KspArray(KspVar):
             self.append(val)
 
     def __getitem__(self, idx):
-        '''returns item_type (KspVar instance) local objects with
-        value from squence and name of array index ("array[idx]")
-        resource-unefficient. cashes object for later usage, but
-        rewrites several methods for keeping index fresh
+        '''returns item_type (KspVar instance) local object with
+        value from squence and name of array index ("array[idx]").
+        Item is the view of the array (see KspArrayItem).
         For lite usage (just what puted in seq) use _getitem_fast(idx)
         '''
         return self._getitem_full(idx)
 
     def _getitem_full(self, idx):
         compiled_idx = self._check_idx(idx)
-        runtime_idx = self._get_runtime_idx(idx)
-        self._check_cashed_item(runtime_idx)
-        item = self._cashed[runtime_idx]
-        item._set_runtime = \
-            lambda val, idx=idx, self=item, arr=self: \
-            KspArray._item_set_runtime(self, arr, runtime_idx, val)
-        item.name = \
-            lambda idx=idx, self=item, arr=self: \
-            KspArray._item_name(self, arr, compiled_idx)
-        item._get_runtime = \
-            lambda idx=idx, self=item, arr=self: \
-            KspArray._item_get_runtime(self, arr, runtime_idx)
-        return item
+        runtime_idx = None
+        if isinstance(idx, int) or self.is_simulated():
+            runtime_idx = self._get_runtime_idx(idx)
+        return self._item(compiled_idx, runtime_idx)
+
+    def _item(self, compiled_idx, runtime_idx):
+        '''returns KspArrayItem view of the array'''
+        if runtime_idx is not None:
+            val = self._seq[runtime_idx]
+            if val is None:
+                self._seq[runtime_idx] = self.__default
+            elif not isinstance(val, self.ref_type):
+                raise TypeError(
+                    f'items has to be of type {self.ref_type}; ' +
+                    f'returned {val} ' +
+                    f'({type(val)})')
+        return KspArrayItem.item_class(self._item_type).view(
+            self, compiled_idx, runtime_idx)
 
     def _getitem_fast(self, idx):
         '''returns value from sequence (even None)
@@ -1266,18 +1680,23 @@ class KspArray(KspVar):
         self.set_at_idx(idx, val)
 
     def set_at_idx(self, idx, val):
-        '''puts value to the cashed object at idx.
-        Or makes one if not exists'''
+        '''puts value to the sequence at idx.
+        Under compilation assigns it to the item at idx, if val is not
+        the item itself (as in "arr[idx] <<= val")'''
         if not isinstance(val, self.ref_type):
             raise TypeError(
                 f'has to be instance of {self.ref_type}')
-        runtime_idx = self._get_runtime_idx(idx)
-        if self._size < runtime_idx:
-            self._size = runtime_idx
-        self._seq[runtime_idx] = self._get_rutime_other(val)
-        if self._check_cashed_item(runtime_idx):
-            self._getitem_full(idx)
-            self._cashed[idx] <<= val
+        compiled_idx = self._check_idx(idx)
+        runtime_idx = None
+        if isinstance(idx, int) or self.is_simulated():
+            runtime_idx = self._get_runtime_idx(idx)
+            if self._size < runtime_idx:
+                self._size = runtime_idx
+        item = self._item(compiled_idx, runtime_idx)
+        if not self.is_compiled():
+            self._store(runtime_idx, self._get_rutime_other(val))
+        elif not item.is_same(val):
+            item <<= val
 
     def _get_runtime_idx(self, idx):
         '''get runtime value from KspIntVar, or return int index'''
@@ -1304,35 +1723,12 @@ class KspArray(KspVar):
             idx = idx.expand()
         return idx
 
-    def _check_cashed_item(self, idx):
-        '''returns cashed object from index, or make one.'''
-        if self._cashed[idx] is not None:
-            return False
-        val = self._seq[idx]
-        if val is None:
-            self._seq[idx] = self.__default
-            val = self._seq[idx]
-        if not isinstance(val, self.ref_type):
-            raise TypeError(
-                f'items has to be of type {self.ref_type}; ' +
-                f'returned {val} ' +
-                f'({type(val)})')
-        if isinstance(val, KspVar):
-            val = val._get_runtime()
-        if isinstance(val, AstBase):
-            val = val.get_value()
-        item = self._item_type(name=f'{self.name()}[{idx}]',
-                               value=val,
-                               is_local=True)
-        self._cashed[idx] = item
-        return True
-
     def _item_get_compiled(self, arr, idx):
         '''method for overriding cashed item method within new name'''
         return f'{arr.name()}[{idx}]'
 
     def _item_get_runtime(self, arr, idx):
-        '''method for overriding cashed item method within new value'''
+        '''returns runtime value of item at idx'''
         val = arr._seq[idx]
         if isinstance(val, KspVar):
             val = val._get_runtime()
@@ -1341,11 +1737,11 @@ class KspArray(KspVar):
         return val
 
     def _item_set_runtime(self, arr, idx, val):
-        '''method for overriding cashed item method within new value'''
-        arr._seq[idx] = self._get_rutime_other(val)
+        '''sets runtime value of item at idx'''
+        arr._store(idx, self._get_rutime_other(val))
 
     def _item_name(self, arr, idx):
-        '''method for overriding cashed item method within new name'''
+        '''returns name of item at idx'''
         return f'{arr.name()}[{idx}]'
 
     def _set_runtime(self, val):
@@ -1371,22 +1767,107 @@ class KspArray(KspVar):
 
     def iter_runtime_fast(self):
         '''returns pure objects, stored in seq at each idx'''
-        for idx in range(self.__len__()):
-            yield self._seq[idx]
+        yield from self._seq[:self.__len__()]
+
+    def runtime_values(self):
+        '''returns sequence of runtime values of items.
+        Typed storage is returned as array.array copy'''
+        if self._typecode is not None:
+            return self._seq[:self.__len__()]
+        return [self.__default if val is None else get_runtime(val)
+                for val in self.iter_runtime_fast()]
 
     def _generate_executable(self):
         raise NotImplementedError
 
     def _sort(self, direction):
-        for idx in range(len(self._cashed)):
-            self._cashed[idx] = None
-        self._seq.sort()
-        if direction == 0:
+        values = sorted(self._seq)
+        if direction != 0:
+            values.reverse()
+        self._seq = self._new_seq(values)
+
+
+class KspArrayItem:
+    '''element of KspArray, returned by its __getitem__.
+
+    Keeps the array with compiled and runtime indices and resolves
+    name and value on demand. Class of item is derived from item_type
+    of the array (see item_class()), so item behaves as local variable
+    of item_type. runtime_idx is None if runtime values are not
+    simulated (see KSP.set_simulated)'''
+
+    __slots__ = ('_array', '_compiled_idx', '_runtime_idx')
+    _is_local = True
+    _has_init = False
+    _has_executable = False
+    _persistent = False
+    _read = False
+    # {item_type: class of item}
+    _classes = dict()
+
+    @classmethod
+    def item_class(cls, item_type):
+        '''returns class of items of arrays with item_type.
+        Methods of item_type are copied to the class, which is derived
+        from bases of item_type and is registered as virtual subclass
+        of item_type: as item is not the instance of its real subclass,
+        python does not reflect comparisons (e.g. "x == arr[0]")
+        to the item'''
+        if item_type in cls._classes:
+            return cls._classes[item_type]
+        namespace = {name: attr for name, attr in vars(item_type).items()
+                     if not name.startswith('_' * 2) and
+                     name != '_abc_impl' and name not in vars(cls) and
+                     not isinstance(attr, ContextAttr)}
+        # accepted types are known only by instance
+        with CompileContext():
+            namespace['_ref_type'] = item_type(
+                name='item', is_local=True).ref_type
+        namespace['__slots__'] = ()
+        item_class = type(item_type)(f'{item_type.__name__}Item',
+                                     (cls, *item_type.__bases__),
+                                     namespace)
+        # items are accepted as values of item_type
+        item_type.register(item_class)
+        cls._classes[item_type] = item_class
+        return item_class
+
+    @classmethod
+    def view(cls, array, compiled_idx, runtime_idx):
+        item = object.__new__(cls)
+        item._array = array
+        item._compiled_idx = compiled_idx
+        item._runtime_idx = runtime_idx
+        return item
+
+    def is_same(self, other):
+        '''True if other is the same element of the same array'''
+        return isinstance(other, KspArrayItem) and \
+            other._array is self._array and \
+            other._compiled_idx == self._compiled_idx
+
+    def name(self):
+        return self._array._item_name(self._array, self._compiled_idx)
+
+    def _get_runtime(self):
+        if self._runtime_idx is None:
+            return self._array.default
+        return self._array._item_get_runtime(self._array,
+                                             self._runtime_idx)
+
+    def _set_runtime(self, val):
+        if self._runtime_idx is None:
             return
-        new = list()
-        for idx in range(len(self._seq)):
-            new.append(self._seq.pop())
-        self._seq = new
+        KspArray._item_set_runtime(self, self._array, self._runtime_idx,
+                                   val)
+
+    @property
+    def _value(self):
+        return self._get_runtime()
+
+    @_value.setter
+    def _value(self, val):
+        self._set_runtime(val)
 
 
 def get_val(*args):
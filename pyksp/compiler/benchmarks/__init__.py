@@ -0,0 +1,19 @@
+'''compile-time benchmarks on synthetic scripts.
+
+Every scenario of synthetic module is compiled over the sweep of
+sizes, time and memory peak of kScript._generate_code() are measured
+and can be stored to (or compared with) the JSON baseline.
+Timings depend on the machine, so the baseline is not shipped:
+save it before the change and compare with it after.
+
+usage:
+python -m pyksp.compiler.benchmarks [-s scenario ...] [--sizes N ...]
+    [--save baseline.json] [--compare baseline.json]
+python -m pyksp.compiler.benchmarks --imports
+    measures cold import time of the compiler (see imports module)
+'''
+import os
+import sys
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path + '/..')
+sys.path.append(path)
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path + '/..')
+sys.path.append(path)
+
+from synthetic import scenarios
+import runner
+import imports
+
+
+BASELINE = os.path.join(path, 'baseline.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pyksp.compiler.benchmarks',
+        description='measures compile time of synthetic scripts')
+    parser.add_argument('-i', '--imports', action='store_true',
+                        help='measure cold import time of the compiler '
+                        'instead')
+    parser.add_argument('-s', '--scenario', action='append',
+                        choices=list(scenarios),
+                        help='scenario to run (default: all)')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        help='sizes of sweep instead of the defaults')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='repeats of every measurement (best is used)')
+    parser.add_argument('--no-simulate', dest='simulate',
+                        action='store_false',
+                        help='compile with kScript(simulate=False)')
+    parser.add_argument('--save', nargs='?', const=BASELINE,
+                        help='write results as the baseline')
+    parser.add_argument('--compare', nargs='?', const=BASELINE,
+                        help='compare results with the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown (default: 0.25)')
+    args = parser.parse_args(argv)
+    if args.compare and args.compare != args.save and \
+            not os.path.isfile(args.compare):
+        parser.error(f'baseline {args.compare} does not exist, '
+                     'create it by --save')
+
+    if args.imports:
+        imports.run(repeat=args.repeat)
+        return 0
+
+    results = runner.run(args.scenario, args.sizes, args.repeat,
+                         simulate=args.simulate)
+    if args.save:
+        runner.save(args.save, results)
+    if args.compare:
+        print('compared with', args.compare)
+        regressions = runner.compare(
+            results, runner.load(args.compare), args.tolerance)
+        for name, size, field, ratio in regressions:
+            print(f'regression: {name}[{size}] {field} x{ratio:.2f}')
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+'''cold start time of the compiler.
+
+Every target is executed in the fresh interpreter, so nothing
+is imported before it.'''
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                     '..', '..', '..'))
+
+_short_script = '''
+from pyksp.compiler import kScript, kInt
+script = kScript(kScript.clipboard, deterministic=True)
+script.main = lambda: kInt(1, 'x')
+lines = list(script._generate_code())
+'''
+
+targets = OrderedDict([
+    ('compiler', 'import pyksp.compiler'),
+    ('compiler_star', 'from pyksp.compiler import *'),
+    ('classic_builtins',
+     'from pyksp.compiler.classic_builtins import message'),
+    ('classic_builtins_star',
+     'from pyksp.compiler import *\n'
+     'from pyksp.compiler.classic_builtins import *'),
+    ('short_script', _short_script)])
+
+_timer = '''import time
+start = time.perf_counter()
+exec(compile({code!r}, '<benchmark>', 'exec'), dict())
+print(time.perf_counter() - start)
+'''
+
+
+def measure(code, repeat=5):
+    '''returns the best time of executing code in the fresh
+    interpreter (without the interpreter startup)'''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (_root, env.get('PYTHONPATH'))))
+    times = list()
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', _timer.format(code=code)],
+            cwd=_root, env=env, stdout=subprocess.PIPE, check=True)
+        times.append(float(out.stdout.decode().split()[-1]))
+    return min(times)
+
+
+def run(names=None, repeat=5, output=sys.stdout):
+    '''measures targets (all by default).
+    returns results as {target: time}'''
+    results = dict()
+    for name in names or targets:
+        results[name] = measure(targets[name], repeat)
+        print(f'{name:<24}{results[name]:>10.4f}s', file=output)
+    return results
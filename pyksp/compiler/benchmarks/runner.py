@@ -0,0 +1,107 @@
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from context import CompileContext
+from script import kScript
+
+from synthetic import scenarios
+
+
+def measure(factory, size, repeat=3, simulate=True):
+    '''compiles script of scenario factory with size repeat times,
+    every time in the fresh CompileContext.
+    simulate is passed to kScript.
+
+    returns dict with the best and mean time of
+    kScript._generate_code(), its tracemalloc peak and count
+    of generated lines'''
+    times = list()
+    for _ in range(repeat):
+        elapsed, lines = _generate(factory, size, simulate)
+        times.append(elapsed)
+    tracemalloc.start()
+    try:
+        _generate(factory, size, simulate)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'time': min(times),
+            'mean': sum(times) / len(times),
+            'peak': peak,
+            'lines': lines}
+
+
+def _generate(factory, size, simulate=True):
+    with CompileContext():
+        script = kScript(kScript.clipboard, deterministic=True,
+                         simulate=simulate)
+        script.main = factory(size)
+        # as timeit does, garbage collection does not add noise
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            lines = sum(1 for _ in script._generate_code())
+            return time.perf_counter() - start, lines
+        finally:
+            gc.enable()
+
+
+def run(names=None, sizes=None, repeat=3, output=sys.stdout,
+        simulate=True):
+    '''runs sweeps of scenarios (all by default) over their default
+    sizes or over passed sizes.
+    returns results as {scenario: {size: measurements}}'''
+    results = dict()
+    for name in names or scenarios:
+        factory, default_sizes = scenarios[name]
+        results[name] = dict()
+        for size in sizes or default_sizes:
+            result = measure(factory, size, repeat, simulate)
+            results[name][str(size)] = result
+            print(f'{name:<12}{size:>8}{result["time"]:>10.4f}s'
+                  f'{result["peak"] / 1024:>12.1f}KiB'
+                  f'{result["lines"]:>9} lines', file=output)
+    return results
+
+
+def save(path, results):
+    '''writes results to the JSON file of baseline'''
+    data = {'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def load(path):
+    '''returns results of the JSON file of baseline'''
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance=0.25, output=sys.stdout):
+    '''prints ratios of results to the baseline.
+    returns list of (scenario, size, field, ratio) of measurements,
+    which exceed baseline more than on tolerance'''
+    regressions = list()
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            row = f'{name:<12}{size:>8}'
+            for field in ('time', 'peak'):
+                ratio = result[field] / base[field] if base[field] else 1.0
+                row += f'{field:>7} x{ratio:<6.2f}'
+                if ratio > 1 + tolerance:
+                    regressions.append((name, size, field, ratio))
+            if result['lines'] != base['lines']:
+                row += f' lines {base["lines"]} -> {result["lines"]}'
+            print(row, file=output)
+    return regressions
@@ -0,0 +1,164 @@
+'''synthetic scripts for compile-time benchmarks.
+
+Every scenario is a function, which gets size and returns main
+function of kScript. Scenarios are registered with default sizes
+of the sweep by @scenario decorator.
+'''
+from collections import OrderedDict
+
+from native_types import kInt
+from native_types import kArrInt
+from bi_ui_controls import kKnob
+from bi_ui_controls import kButton
+from conditions_loops import If
+from conditions_loops import Else
+from conditions_loops import For
+from conditions_loops import check
+from functions import func
+from k_built_ins import message
+import callbacks as on
+
+
+scenarios = OrderedDict()
+
+
+def scenario(*sizes):
+    '''registers scenario with the default sizes of sweep'''
+    def decorator(factory):
+        scenarios[factory.__name__] = (factory, sizes)
+        return factory
+    return decorator
+
+
+@scenario(100, 1000, 5000)
+def variables(size):
+    '''size kInt and size / 10 kArrInt[10] declarations
+    with assignments'''
+    def main():
+        prev = kInt(0, 'var_0')
+        for idx in range(1, size):
+            var = kInt(idx, f'var_{idx}')
+            var <<= prev + idx
+            prev = var
+        for idx in range(size // 10):
+            arr = kArrInt([idx] * 10, f'arr_{idx}')
+            arr[idx % 10] <<= prev
+    return main
+
+
+@scenario(10, 100, 500)
+def controls(size):
+    '''size kKnob and size kButton controls with
+    ui_control callbacks'''
+    def main():
+        buttons = dict()
+
+        def knob_cb(control):
+            buttons[control] <<= control.var
+
+        for idx in range(size):
+            knob = kKnob(0, 100, 1, name=f'knob_{idx}')
+            buttons[knob] = kButton(name=f'button_{idx}')
+            knob.bound_callback(knob_cb)
+    return main
+
+
+@scenario(10, 50, 150)
+def nested_if(size):
+    '''If / Else chains, nested for size levels'''
+    def nest(x, level):
+        if level == size:
+            message(x)
+            return
+        with If(x == level):
+            check()
+            x += level
+            nest(x, level + 1)
+        with Else():
+            check()
+            x -= level
+
+    def main():
+        x = kInt(0, 'x')
+
+        @on.note
+        def note_cb():
+            nest(x, 0)
+    return main
+
+
+@scenario(100, 1000, 10000)
+def for_loop(size):
+    '''For loops over array of size items'''
+    def main():
+        arr = kArrInt(list(range(size)), 'arr')
+        total = kInt(0, 'total')
+
+        @on.note
+        def note_cb():
+            nonlocal total
+            with For(arr=arr) as seq:
+                for item in seq:
+                    with If(item > total):
+                        check()
+                        total <<= item
+
+    return main
+
+
+@scenario(100, 1000, 10000)
+def array_items(size):
+    '''size reads and assignments of kArrInt items at constant
+    and variable indices. With --no-simulate only compiled
+    names of items are resolved'''
+    def main():
+        arr = kArrInt(list(range(10)), 'items')
+        idx = kInt(0, 'idx')
+
+        @on.note
+        def note_cb():
+            nonlocal idx
+            for num in range(size):
+                arr[num % 10] <<= arr[idx] + arr[(num + 1) % 10]
+                idx <<= num % 10
+    return main
+
+
+_chains = dict()
+
+
+def _chain(length):
+    '''returns the last of length @func functions, each one
+    calls the previous. Functions are created once per length,
+    as they are registered globally'''
+    if length in _chains:
+        return _chains[length]
+
+    def link(idx, prev):
+        def step(x: kInt):
+            x += idx
+            if prev is not None:
+                prev(x)
+        step.__qualname__ = f'chain{length}_{idx}'
+        return func(step)
+
+    last = None
+    for idx in range(length):
+        last = link(idx, last)
+    _chains[length] = last
+    return last
+
+
+@scenario(5, 20, 50)
+def func_chain(size):
+    '''chain of size @func functions, invoked from the note
+    callback'''
+    last = _chain(size)
+
+    def main():
+        x = kInt(0, 'x')
+
+        @on.note
+        def note_cb():
+            last(x)
+    return main
@@ -752,6 +752,7 @@ START_CRITERIA_OR_NEXT = bEngineParVar('START_CRITERIA_OR_NEXT')
 
 
 class FindMod(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('find_mod',
@@ -776,6 +777,7 @@ find_mod = FindMod().__call__
 
 
 class FindTarget(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('find_target',
@@ -849,6 +851,7 @@ class EnginePars(metaclass=SingletonMeta):
 
 
 class GetEnginePar(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_engine_par',
@@ -885,6 +888,7 @@ get_engine_par = GetEnginePar().__call__
 
 
 class GetEngineParDisp(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('get_engine_par_disp',
@@ -920,6 +924,7 @@ get_engine_par_disp = GetEngineParDisp().__call__
 
 
 class GetVoiceLimit(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_voice_limit',
@@ -963,6 +968,7 @@ set_voice_limit = SetVoiceLimit().__call__
 
 
 class OutputChannelName(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('output_channel_name',
@@ -15,6 +15,7 @@ from base_types import KspArray
 
 
 class GetFolder(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('get_folder',
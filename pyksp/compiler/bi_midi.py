@@ -285,6 +285,7 @@ mf_set_buffer_size = MfSetBufferSize().__call__
 
 
 class MfGetBufferSize(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('mf_get_buffer_size',
@@ -432,6 +433,7 @@ mf_set_event_par = MfSetEventPar().__call__
 
 
 class MfGetEventPar(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('mf_get_event_par',
@@ -466,6 +468,7 @@ mf_get_event_par = MfGetEventPar().__call__
 
 
 class MfGetId(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('mf_get_id',
@@ -506,6 +509,7 @@ mf_set_mark = MfSetMark().__call__
 
 
 class MfGetMark(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('mf_get_mark',
@@ -529,6 +533,7 @@ mf_get_mark = MfGetMark().__call__
 
 
 class MfByTrack(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('by_track',
@@ -663,6 +668,7 @@ mf_get_prev_at = MfGetPrevAt().__call__
 
 
 class MfGetNumTracks(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('mf_get_num_tracks',
@@ -39,6 +39,7 @@ from conditions_loops import check
 
 
 class InRange(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('in_range',
@@ -62,6 +63,7 @@ in_range = InRange().__call__
 
 
 class ArrayEqual(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('array_equal',
@@ -74,16 +76,17 @@ class ArrayEqual(BuiltInFuncInt):
         return super().__call__(array_1, array_2)
 
     def calculate(self, array_1, array_2):
-        for f, s in zip(array_1.iter_runtime(), array_2.iter_runtime()):
-            if f._get_runtime() != s._get_runtime():
-                return 0
-        return 1
+        values_1 = array_1.runtime_values()
+        values_2 = array_2.runtime_values()
+        length = min(len(values_1), len(values_2))
+        return int(values_1[:length] == values_2[:length])
 
 
 array_equal = ArrayEqual().__call__
 
 
 class NumElements(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('num_elements',
@@ -101,6 +104,7 @@ num_elements = NumElements().__call__
 
 
 class Search(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('search',
@@ -115,9 +119,10 @@ class Search(BuiltInFuncInt):
             value = value._get_runtime()
         if hasattr(value, 'get_value'):
             value = value.get_value()
-        for idx, item in enumerate(array.iter_runtime()):
-            if item._get_runtime() == value:
-                return idx
+        try:
+            return array.runtime_values().index(value)
+        except ValueError:
+            return None
 
 
 search = Search().__call__
@@ -186,6 +191,7 @@ disallow_group = DisAllowGroup().__call__
 
 
 class FindGroup(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('find_group',
@@ -206,6 +212,7 @@ find_group = FindGroup().__call__
 
 
 class GetPurgeState(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_purge_state',
@@ -225,6 +232,7 @@ get_purge_state = GetPurgeState().__call__
 
 
 class GroupName(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__(name='group_name',
@@ -292,6 +300,7 @@ change_listener_par = ChangeListener().__call__
 
 
 class MsToTicks(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('ms_to_ticks',
@@ -308,6 +317,7 @@ ms_to_ticks = MsToTicks().__call__
 
 
 class TicksToMs(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('ticks_to_ms',
@@ -501,6 +511,7 @@ keys = [Key(idx) for idx in range(128)]
 
 
 class GetKeyColor(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_key_color',
@@ -559,6 +570,7 @@ set_key_color = SetKeyColor().__call__
 
 
 class GetKeyName(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('get_key_name',
@@ -597,6 +609,7 @@ set_key_name = SetKeyName().__call__
 
 
 class GetKeyTriggerstate(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_key_triggerstate',
@@ -615,6 +628,7 @@ get_key_triggerstate = GetKeyTriggerstate().__call__
 
 
 class GetKeyType(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_key_type',
@@ -633,6 +647,7 @@ get_key_type = GetKeyType().__call__
 
 
 class GetKeyRangeMinNote(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_keyrange_min_note',
@@ -648,6 +663,7 @@ get_keyrange_min_note = GetKeyRangeMinNote().__call__
 
 
 class GetKeyRangeMaxNote(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_keyrange_max_note',
@@ -663,6 +679,7 @@ get_keyrange_max_note = GetKeyRangeMaxNote().__call__
 
 
 class GetKeyRangeMaxNote(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('get_keyrange_name',
@@ -841,6 +858,7 @@ RESET_CONDITION = ResetCondition().__call__
 
 
 class FindZone(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('find_zone',
@@ -857,6 +875,7 @@ find_zone = FindZone().__call__
 
 
 class GetSampleLength(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_sample_length',
@@ -873,6 +892,7 @@ get_sample_length = GetSampleLength().__call__
 
 
 class NumSlicesZone(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('num_slices_zone',
@@ -888,6 +908,7 @@ num_slices_zone = NumSlicesZone().__call__
 
 
 class ZoneSliceLength(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('zone_slice_length',
@@ -905,6 +926,7 @@ zone_slice_length = ZoneSliceLength().__call__
 
 
 class ZoneSliceStart(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('zone_slice_start',
@@ -922,6 +944,7 @@ zone_slice_start = ZoneSliceStart().__call__
 
 
 class ZoneLoopStart(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('zone_slice_idx_loop_start',
@@ -938,6 +961,7 @@ zone_slice_idx_loop_start = ZoneLoopStart().__call__
 
 
 class ZoneLoopEnd(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('zone_slice_idx_loop_end',
@@ -954,6 +978,7 @@ zone_slice_idx_loop_end = ZoneLoopEnd().__call__
 
 
 class ZoneLoopCount(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('zone_slice_loop_count',
@@ -1093,6 +1118,7 @@ pgs_create_str_key = PgsCreateKeyStr().__call__
 
 
 class PgsKeyExsists(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('pgs_key_exists',
@@ -1114,6 +1140,7 @@ pgs_key_exists = PgsKeyExsists().__call__
 
 
 class PgsStrKeyExsists(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('pgs_str_key_exists',
@@ -1178,6 +1205,7 @@ pgs_set_str_key_val = PgsSetStrKeyVal().__call__
 
 
 class PgsGetKeyVal(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('pgs_get_key_val',
@@ -1201,6 +1229,7 @@ pgs_get_key_val = PgsGetKeyVal().__call__
 
 
 class PgsGetStrKeyVal(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('pgs_get_str_key_val',
@@ -1231,7 +1260,7 @@ def logpr(*args, sep=' '):
     try:
         kLog().put(*args, sep=sep)
     except TypeError as e:
-        if str(e).startswith('__init__()'):
+        if '__init__()' in str(e):
             pass
         else:
             raise e
@@ -257,6 +257,7 @@ set_snapshot_type = SetSnapshotType().__call__
 
 
 class ByMarks(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('by_marks',
@@ -442,6 +443,7 @@ delete_event_mark = DeleteEventMark().__call__
 
 
 class EventStatus(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('event_status',
@@ -535,6 +537,7 @@ get_event_ids = GetEventIds().__call__
 
 
 class GetEventPar(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_event_par',
@@ -578,6 +581,7 @@ get_event_par = GetEventPar().__call__
 
 
 class GetEventParArr(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_event_par_arr',
@@ -15,6 +15,10 @@ from abc import ABCMeta
 
 from abstract import KSP
 from abstract import Output
+from context import current_context
+from context import ContextAttr
+from context import ContextInstanceAttr
+from context import ContextMeta
 
 from base_types import KspVar
 from base_types import KspIntVar
@@ -133,6 +137,7 @@ class WidgetPar(kInt):
         if isinstance(val, WidgetPar):
             val = get_runtime_val(val)
         self._val = val
+        self.names_changed()
 
     def _set_runtime(self, val):
         self._val = get_runtime_val(val)
@@ -1154,6 +1159,13 @@ class ControlParControls:
 
 class ControlPar():
     '''control attribute represents it's respective parameter state'''
+    _used = ContextInstanceAttr(lambda self: False)
+    _controls = ContextInstanceAttr(lambda self: dict())
+    _obj_count = ContextInstanceAttr(lambda self: int())
+    _values = ContextInstanceAttr(
+        lambda self: list([list()] * self._init_size))
+    _vars = ContextInstanceAttr(lambda self: list())
+    _size = ContextInstanceAttr(lambda self: self._init_size)
 
     def __init__(self, name: str, cls: Type['KspNativeControl'],
                  arr_type: Type[KspArray],
@@ -1367,6 +1379,8 @@ class SetControlPar(BuiltInFuncInt, ControlParFunc):
 
     def _set_runtime(self, control_or_id: Union['KspNativeControl', int],
                      parameter: Union[bControlParVar, str], value: int):
+        if not self.is_simulated():
+            return
         ctrl = self._get_contrl_obj(control_or_id)
         attr = getattr(ctrl, parameter._attr)
         attr._set_runtime(value)
@@ -1459,6 +1473,8 @@ class SetControlParStr(BuiltInFuncInt, ControlParFunc):
 
     def _set_runtime(self, control_or_id: Union['KspNativeControl', int],
                      parameter: bControlParVar, value: str):
+        if not self.is_simulated():
+            return
         ctrl = self._get_contrl_obj(control_or_id)
         attr = getattr(ctrl, parameter._attr)
         attr._set_runtime(value)
@@ -1559,6 +1575,8 @@ class SetControlParArr(BuiltInFuncInt, ControlParFunc):
     def _set_runtime(self, control_or_id: Union['KspNativeControl', int],
                      parameter: Union[bControlParVar, str], value: int,
                      idx: int):
+        if not self.is_simulated():
+            return
         ctrl = self._get_contrl_obj(control_or_id)
         attr = getattr(ctrl, parameter._attr)
         idx = get_runtime_val(idx)
@@ -1667,6 +1685,8 @@ class SetControlParStrArr(BuiltInFuncInt, ControlParFunc):
     def _set_runtime(self, control_or_id: Union['KspNativeControl', int],
                      parameter: Union[bControlParVar, str], value: str,
                      idx: int):
+        if not self.is_simulated():
+            return
         ctrl = self._get_contrl_obj(control_or_id)
         attr = getattr(ctrl, parameter._attr)
         idx = get_runtime_val(idx)
@@ -1751,10 +1771,10 @@ def refresh():
 
 
 class ControlId(kInt):
-    _controls_arr = None
-    _controls = list()
-    _controls_ids = dict()
-    _id_count = int()
+    _controls_arr = ContextAttr(None)
+    _controls = ContextAttr(factory=list)
+    _controls_ids = ContextAttr(factory=dict)
+    _id_count = ContextAttr(0)
 
     def __init__(self, control_obj: 'KspNativeControl'):
 
@@ -1780,11 +1800,21 @@ class ControlId(kInt):
 ParentTuple = Optional[Union[kWidget, kMainWindow]]
 
 
-class KspNativeControlMeta(WidgetMeta):
-    objects_count = int()
-    objects = list()
+class KspNativeControlMeta(WidgetMeta, metaclass=ContextMeta):
+    objects_count = ContextAttr(0)
+    objects = ContextAttr(factory=list)
     classes = list()
 
+    @property
+    def ids(cls):
+        '''kArrInt of ids of class instances'''
+        return current_context().get_local(KspNativeControlMeta, cls,
+                                           lambda cls: None)
+
+    @ids.setter
+    def ids(cls, val):
+        current_context().set_local(KspNativeControlMeta, cls, val)
+
     def __new__(self, name, bases, dct):
         cls = super().__new__(self, name, bases, dct)
         KspNativeControlMeta.classes.append(cls)
@@ -2730,6 +2760,7 @@ class kMenu(KspNativeControl, metaclass=kMenuMeta):
 
 
 class GetMenuItemStr(BuiltInFuncStr):
+    pure = True
 
     def __init__(self):
         super().__init__('get_menu_item_str',
@@ -2758,6 +2789,7 @@ get_menu_item_str = GetMenuItemStr().__call__
 
 
 class GetMenuItemValue(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_menu_item_value',
@@ -2786,6 +2818,7 @@ get_menu_item_value = GetMenuItemValue().__call__
 
 
 class GetMenuItemVisibility(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_menu_item_visibility',
@@ -3168,6 +3201,7 @@ class kWaveFormMeta(KspNativeControlMeta):
 
 
 class GetWfProperty(BuiltInFuncInt):
+    pure = True
 
     def __init__(self):
         super().__init__('get_ui_wf_property',
@@ -0,0 +1,93 @@
+'''call graph of the compiled script.
+
+The pass does not change the code. It collects callbacks and
+functions of the program with sizes of their bodies and "call"
+statements between them, so it can be seen, where the call overhead
+concentrates:
+- nodes is the dict of {header ("on note", "function foo"):
+    {'kind': 'callback' or 'function', 'lines': count of lines of
+    body, 'calls': count of calls of the function in the program}}
+- edges is the dict of {(caller header, callee header): count of
+    call statements}
+
+Calls are counted as they appear in the code, e.g. call inside
+a loop is counted once. Graph is exported by to_dot() (Graphviz)
+and to_json(). If path is passed, the graph is written to it after
+every compilation: DOT, if it ends with ".dot", JSON otherwise.
+
+Example:
+script = kScript('out.txt', passes=[CallGraph('calls.dot')])
+'''
+import json
+
+from ir import CallFunction
+from ir import walk
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def _quote(text):
+    return f'"{_escape(text)}"'
+
+
+class CallGraph:
+    '''analysis pass (see module doc)'''
+
+    name = 'callgraph'
+
+    def __init__(self, path: str=None) -> None:
+        self.path = path
+        self.nodes = dict()
+        self.edges = dict()
+
+    def __call__(self, program):
+        self.nodes = dict()
+        self.edges = dict()
+        for block in program.blocks:
+            lines = sum(1 for stmt in block.body for _ in stmt.render())
+            self.nodes[block.header] = {'kind': block.kind,
+                                        'lines': lines, 'calls': 0}
+        for block in program.blocks:
+            for stmt in walk(block.body):
+                if not isinstance(stmt, CallFunction):
+                    continue
+                callee = 'function ' + stmt.name.split()[0]
+                if callee not in self.nodes:
+                    continue
+                edge = (block.header, callee)
+                self.edges[edge] = self.edges.get(edge, 0) + 1
+                self.nodes[callee]['calls'] += 1
+        if self.path is not None:
+            with open(self.path, 'w') as f:
+                if self.path.endswith('.dot'):
+                    f.write(self.to_dot())
+                else:
+                    f.write(self.to_json(indent=2))
+
+    def to_dict(self):
+        return {'nodes': [dict(name=name, **node)
+                          for name, node in self.nodes.items()],
+                'edges': [{'caller': caller, 'callee': callee,
+                           'count': count}
+                          for (caller, callee), count
+                          in self.edges.items()]}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_dot(self):
+        out = ['digraph calls {']
+        for name, node in self.nodes.items():
+            label = f'{_escape(name)}\\n{node["lines"]} lines'
+            if node['kind'] == 'callback':
+                attrs = f'shape=box, label="{label}"'
+            else:
+                attrs = f'label="{label}, {node["calls"]} calls"'
+            out.append(f'    {_quote(name)} [{attrs}];')
+        for (caller, callee), count in self.edges.items():
+            out.append(f'    {_quote(caller)} -> {_quote(callee)} '
+                       f'[label="{count}"];')
+        out.append('}')
+        return '\n'.join(out) + '\n'
@@ -1,820 +1,348 @@
-from k_built_ins import message
-from k_built_ins import exit
-from k_built_ins import reset_ksp_timer
-from k_built_ins import ignore_controller
-from k_built_ins import exp
-from k_built_ins import log
-from k_built_ins import kpow
-from k_built_ins import sqrt
-from k_built_ins import ceil
-from k_built_ins import floor
-from k_built_ins import kround
-from k_built_ins import cos
-from k_built_ins import sin
-from k_built_ins import tan
-from k_built_ins import acos
-from k_built_ins import asin
-from k_built_ins import atan
-from k_built_ins import NI_CALLBACK_ID
-from k_built_ins import NI_CALLBACK_TYPE
-from k_built_ins import NI_CB_TYPE_ASYNC_OUT
-from k_built_ins import NI_CB_TYPE_CONTROLLER
-from k_built_ins import NI_CB_TYPE_INIT
-from k_built_ins import NI_CB_TYPE_LISTENER
-from k_built_ins import NI_CB_TYPE_NOTE
-from k_built_ins import NI_CB_TYPE_PERSISTENCE_CHANGED
-from k_built_ins import NI_CB_TYPE_PGS
-from k_built_ins import NI_CB_TYPE_POLY_AT
-from k_built_ins import NI_CB_TYPE_RELEASE
-from k_built_ins import NI_CB_TYPE_RPN
-from k_built_ins import NI_CB_TYPE_NRPN
-from k_built_ins import NI_CB_TYPE_UI_CONTROL
-from k_built_ins import NI_CB_TYPE_UI_UPDATE
-from k_built_ins import NI_CB_TYPE_MIDI_IN
-from k_built_ins import CURRENT_SCRIPT_SLOT
-from k_built_ins import GROUPS_SELECTED
-from k_built_ins import NI_ASYNC_EXIT_STATUS
-from k_built_ins import NI_ASYNC_ID
-from k_built_ins import NI_BUS_OFFSET
-from k_built_ins import NUM_GROUPS
-from k_built_ins import NUM_OUTPUT_CHANNELS
-from k_built_ins import NUM_ZONES
-from k_built_ins import PLAYED_VOICES_INST
-from k_built_ins import PLAYED_VOICES_TOTAL
-from k_built_ins import GET_FOLDER_LIBRARY_DIR
-from k_built_ins import GET_FOLDER_FACTORY_DIR
-from k_built_ins import GET_FOLDER_PATCH_DIR
-from k_built_ins import NI_VL_TMPRO_STANDARD
-from k_built_ins import NI_VL_TMRPO_HQ
-from k_built_ins import REF_GROUP_IDX
-from k_built_ins import ALL_GROUPS
-from k_built_ins import ALL_EVENTS
-from k_built_ins import KEY_DOWN
-from k_built_ins import KEY_DOWN_OCT
-from k_built_ins import DISTANCE_BAR_START
-from k_built_ins import DURATION_BAR
-from k_built_ins import DURATION_QUARTER
-from k_built_ins import DURATION_EIGHTH
-from k_built_ins import DURATION_SIXTEENTH
-from k_built_ins import DURATION_QUARTER_TRIPLET
-from k_built_ins import DURATION_EIGHTH_TRIPLET
-from k_built_ins import DURATION_SIXTEENTH_TRIPLET
-from k_built_ins import ENGINE_UPTIME
-from k_built_ins import KSP_TIMER
-from k_built_ins import NI_SONG_POSITION
-from k_built_ins import NI_TRANSPORT_RUNNING
-from k_built_ins import SIGNATURE_NUM
-from k_built_ins import SIGNATURE_DENOM
-from k_built_ins import NI_SYNC_UNIT_ABS
-from k_built_ins import NI_SYNC_UNIT_WHOLE
-from k_built_ins import NI_SYNC_UNIT_WHOLE_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_HALF
-from k_built_ins import NI_SYNC_UNIT_HALF_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_QUARTER
-from k_built_ins import NI_SYNC_UNIT_QUARTER_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_8TH
-from k_built_ins import NI_SYNC_UNIT_8TH_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_16TH
-from k_built_ins import NI_SYNC_UNIT_16TH_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_32ND
-from k_built_ins import NI_SYNC_UNIT_32ND_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_64TH
-from k_built_ins import NI_SYNC_UNIT_64TH_TRIPLET
-from k_built_ins import NI_SYNC_UNIT_256TH
-from k_built_ins import NI_SYNC_UNIT_ZONE
-from k_built_ins import NOTE_DURATION
-from k_built_ins import NI_SIGNAL_TRANSP_STOP
-from k_built_ins import NI_SIGNAL_TRANSP_START
-from k_built_ins import NI_SIGNAL_TIMER_MS
-from k_built_ins import NI_SIGNAL_TIMER_BEAT
-from k_built_ins import NI_SIGNAL_TYPE
-from k_built_ins import NI_MATH_PI
-from k_built_ins import NI_MATH_E
-from bi_engine_par import ENGINE_PAR_VOLUME
-from bi_engine_par import ENGINE_PAR_PAN
-from bi_engine_par import ENGINE_PAR_TUNE
-from bi_engine_par import ENGINE_PAR_SMOOTH
-from bi_engine_par import ENGINE_PAR_FORMANT
-from bi_engine_par import ENGINE_PAR_SPEED
-from bi_engine_par import ENGINE_PAR_GRAIN_LENGTH
-from bi_engine_par import ENGINE_PAR_SLICE_ATTACK
-from bi_engine_par import ENGINE_PAR_SLICE_RELEASE
-from bi_engine_par import ENGINE_PAR_TRANSIENT_SIZE
-from bi_engine_par import ENGINE_PAR_ENVELOPE_ORDER
-from bi_engine_par import ENGINE_PAR_FORMANT_SHIFT
-from bi_engine_par import ENGINE_PAR_SPEED_UNIT
-from bi_engine_par import ENGINE_PAR_OUTPUT_CHANNEL
-from bi_engine_par import NI_BUS_OFFSET
-from bi_engine_par import ENGINE_PAR_EFFECT_BYPASS
-from bi_engine_par import ENGINE_PAR_INSERT_EFFECT_OUTPUT_GAIN
-from bi_engine_par import ENGINE_PAR_RELEASE_TRIGGER
-from bi_engine_par import ENGINE_PAR_THRESHOLD
-from bi_engine_par import ENGINE_PAR_RATIO
-from bi_engine_par import ENGINE_PAR_COMP_ATTACK
-from bi_engine_par import ENGINE_PAR_COMP_DECAY
-from bi_engine_par import ENGINE_PAR_LIM_IN_GAIN
-from bi_engine_par import ENGINE_PAR_LIM_RELEASE
-from bi_engine_par import ENGINE_PAR_SP_OFFSET_DISTANCE
-from bi_engine_par import ENGINE_PAR_SP_OFFSET_AZIMUTH
-from bi_engine_par import ENGINE_PAR_SP_OFFSET_X
-from bi_engine_par import ENGINE_PAR_SP_OFFSET_Y
-from bi_engine_par import ENGINE_PAR_SP_LFE_VOLUME
-from bi_engine_par import ENGINE_PAR_SP_SIZE
-from bi_engine_par import ENGINE_PAR_SP_DIVERGENCE
-from bi_engine_par import ENGINE_PAR_SHAPE
-from bi_engine_par import ENGINE_PAR_BITS
-from bi_engine_par import ENGINE_PAR_FREQUENCY
-from bi_engine_par import ENGINE_PAR_NOISELEVEL
-from bi_engine_par import ENGINE_PAR_NOISECOLOR
-from bi_engine_par import ENGINE_PAR_STEREO
-from bi_engine_par import ENGINE_PAR_STEREO_PAN
-from bi_engine_par import ENGINE_PAR_DRIVE
-from bi_engine_par import ENGINE_PAR_DAMPING
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_0
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_1
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_2
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_3
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_4
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_5
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_6
-from bi_engine_par import ENGINE_PAR_SENDLEVEL_7
-from bi_engine_par import ENGINE_PAR_SK_TONE
-from bi_engine_par import ENGINE_PAR_SK_DRIVE
-from bi_engine_par import ENGINE_PAR_SK_BASS
-from bi_engine_par import ENGINE_PAR_SK_BRIGHT
-from bi_engine_par import ENGINE_PAR_SK_MIX
-from bi_engine_par import ENGINE_PAR_RT_SPEED
-from bi_engine_par import ENGINE_PAR_RT_BALANCE
-from bi_engine_par import ENGINE_PAR_RT_ACCEL_HI
-from bi_engine_par import ENGINE_PAR_RT_ACCEL_LO
-from bi_engine_par import ENGINE_PAR_RT_DISTANCE
-from bi_engine_par import ENGINE_PAR_RT_MIX
-from bi_engine_par import ENGINE_PAR_TW_VOLUME
-from bi_engine_par import ENGINE_PAR_TW_TREBLE
-from bi_engine_par import ENGINE_PAR_TW_MID
-from bi_engine_par import ENGINE_PAR_TW_BASS
-from bi_engine_par import ENGINE_PAR_TW_BRIGHT
-from bi_engine_par import ENGINE_PAR_TW_MONO
-from bi_engine_par import ENGINE_PAR_CB_SIZE
-from bi_engine_par import ENGINE_PAR_CB_AIR
-from bi_engine_par import ENGINE_PAR_CB_TREBLE
-from bi_engine_par import ENGINE_PAR_CB_BASS
-from bi_engine_par import ENGINE_PAR_CABINET_TYPE
-from bi_engine_par import ENGINE_PAR_EXP_FILTER_MORPH
-from bi_engine_par import ENGINE_PAR_EXP_FILTER_AMOUNT
-from bi_engine_par import ENGINE_PAR_TP_GAIN
-from bi_engine_par import ENGINE_PAR_TP_WARMTH
-from bi_engine_par import ENGINE_PAR_TP_HF_ROLLOFF
-from bi_engine_par import ENGINE_PAR_TP_QUALITY
-from bi_engine_par import ENGINE_PAR_TR_INPUT
-from bi_engine_par import ENGINE_PAR_TR_ATTACK
-from bi_engine_par import ENGINE_PAR_TR_SUSTAIN
-from bi_engine_par import ENGINE_PAR_TR_SMOOTH
-from bi_engine_par import ENGINE_PAR_SCOMP_THRESHOLD
-from bi_engine_par import ENGINE_PAR_SCOMP_RATIO
-from bi_engine_par import ENGINE_PAR_SCOMP_ATTACK
-from bi_engine_par import ENGINE_PAR_SCOMP_RELEASE
-from bi_engine_par import ENGINE_PAR_SCOMP_MAKEUP
-from bi_engine_par import ENGINE_PAR_SCOMP_MIX
-from bi_engine_par import ENGINE_PAR_JMP_PREAMP
-from bi_engine_par import ENGINE_PAR_JMP_BASS
-from bi_engine_par import ENGINE_PAR_JMP_MID
-from bi_engine_par import ENGINE_PAR_JMP_TREBLE
-from bi_engine_par import ENGINE_PAR_JMP_MASTER
-from bi_engine_par import ENGINE_PAR_JMP_PRESENCE
-from bi_engine_par import ENGINE_PAR_JMP_HIGAIN
-from bi_engine_par import ENGINE_PAR_JMP_MONO
-from bi_engine_par import ENGINE_PAR_FCOMP_INPUT
-from bi_engine_par import ENGINE_PAR_FCOMP_RATIO
-from bi_engine_par import ENGINE_PAR_FCOMP_ATTACK
-from bi_engine_par import ENGINE_PAR_FCOMP_RELEASE
-from bi_engine_par import ENGINE_PAR_FCOMP_MAKEUP
-from bi_engine_par import ENGINE_PAR_FCOMP_MIX
-from bi_engine_par import ENGINE_PAR_FCOMP_HQ_MODE
-from bi_engine_par import ENGINE_PAR_FCOMP_LINK
-from bi_engine_par import ENGINE_PAR_AC_NORMALVOLUME
-from bi_engine_par import ENGINE_PAR_AC_BRILLIANTVOLUME
-from bi_engine_par import ENGINE_PAR_AC_BASS
-from bi_engine_par import ENGINE_PAR_AC_TREBLE
-from bi_engine_par import ENGINE_PAR_AC_TONECUT
-from bi_engine_par import ENGINE_PAR_AC_TREMOLOSPEED
-from bi_engine_par import ENGINE_PAR_AC_TREMOLODEPTH
-from bi_engine_par import ENGINE_PAR_AC_MONO
-from bi_engine_par import ENGINE_PAR_CT_VOLUME
-from bi_engine_par import ENGINE_PAR_CT_DISTORTION
-from bi_engine_par import ENGINE_PAR_CT_FILTER
-from bi_engine_par import ENGINE_PAR_CT_BASS
-from bi_engine_par import ENGINE_PAR_CT_BALLS
-from bi_engine_par import ENGINE_PAR_CT_TREBLE
-from bi_engine_par import ENGINE_PAR_CT_TONE
-from bi_engine_par import ENGINE_PAR_CT_MONO
-from bi_engine_par import ENGINE_PAR_DS_VOLUME
-from bi_engine_par import ENGINE_PAR_DS_TONE
-from bi_engine_par import ENGINE_PAR_DS_DRIVE
-from bi_engine_par import ENGINE_PAR_DS_BASS
-from bi_engine_par import ENGINE_PAR_DS_MID
-from bi_engine_par import ENGINE_PAR_DS_TREBLE
-from bi_engine_par import ENGINE_PAR_DS_MONO
-from bi_engine_par import ENGINE_PAR_HS_PRENORMAL
-from bi_engine_par import ENGINE_PAR_HS_PREOVERDRIVE
-from bi_engine_par import ENGINE_PAR_HS_BASS
-from bi_engine_par import ENGINE_PAR_HS_MID
-from bi_engine_par import ENGINE_PAR_HS_TREBLE
-from bi_engine_par import ENGINE_PAR_HS_MASTER
-from bi_engine_par import ENGINE_PAR_HS_PRESENCE
-from bi_engine_par import ENGINE_PAR_HS_DEPTH
-from bi_engine_par import ENGINE_PAR_HS_OVERDRIVE
-from bi_engine_par import ENGINE_PAR_HS_MONO
-from bi_engine_par import ENGINE_PAR_V5_PREGAINRHYTHM
-from bi_engine_par import ENGINE_PAR_V5_PREGAINLEAD
-from bi_engine_par import ENGINE_PAR_V5_BASS
-from bi_engine_par import ENGINE_PAR_V5_MID
-from bi_engine_par import ENGINE_PAR_V5_TREBLE
-from bi_engine_par import ENGINE_PAR_V5_POSTGAIN
-from bi_engine_par import ENGINE_PAR_V5_RESONANCE
-from bi_engine_par import ENGINE_PAR_V5_PRESENCE
-from bi_engine_par import ENGINE_PAR_V5_LEADCHANNEL
-from bi_engine_par import ENGINE_PAR_V5_HIGAIN
-from bi_engine_par import ENGINE_PAR_V5_BRIGHT
-from bi_engine_par import ENGINE_PAR_V5_CRUNCH
-from bi_engine_par import ENGINE_PAR_V5_MONO
-from bi_engine_par import ENGINE_PAR_CUTOFF
-from bi_engine_par import ENGINE_PAR_RESONANCE
-from bi_engine_par import ENGINE_PAR_EFFECT_BYPASS
-from bi_engine_par import ENGINE_PAR_GAIN
-from bi_engine_par import ENGINE_PAR_FILTER_LADDER_HQ
-from bi_engine_par import ENGINE_PAR_BANDWIDTH
-from bi_engine_par import ENGINE_PAR_FILTER_SHIFTB
-from bi_engine_par import ENGINE_PAR_FILTER_SHIFTC
-from bi_engine_par import ENGINE_PAR_FILTER_RESB
-from bi_engine_par import ENGINE_PAR_FILTER_RESC
-from bi_engine_par import ENGINE_PAR_FILTER_TYPEA
-from bi_engine_par import ENGINE_PAR_FILTER_TYPEB
-from bi_engine_par import ENGINE_PAR_FILTER_TYPEC
-from bi_engine_par import ENGINE_PAR_FILTER_BYPA
-from bi_engine_par import ENGINE_PAR_FILTER_BYPB
-from bi_engine_par import ENGINE_PAR_FILTER_BYPC
-from bi_engine_par import ENGINE_PAR_FILTER_GAIN
-from bi_engine_par import ENGINE_PAR_FORMANT_TALK
-from bi_engine_par import ENGINE_PAR_FORMANT_SHARP
-from bi_engine_par import ENGINE_PAR_FORMANT_SIZE
-from bi_engine_par import ENGINE_PAR_LP_CUTOFF
-from bi_engine_par import ENGINE_PAR_HP_CUTOFF
-from bi_engine_par import ENGINE_PAR_FREQ1
-from bi_engine_par import ENGINE_PAR_BW1
-from bi_engine_par import ENGINE_PAR_GAIN1
-from bi_engine_par import ENGINE_PAR_FREQ2
-from bi_engine_par import ENGINE_PAR_BW2
-from bi_engine_par import ENGINE_PAR_GAIN2
-from bi_engine_par import ENGINE_PAR_FREQ3
-from bi_engine_par import ENGINE_PAR_BW3
-from bi_engine_par import ENGINE_PAR_GAIN3
-from bi_engine_par import ENGINE_PAR_SEQ_LF_GAIN
-from bi_engine_par import ENGINE_PAR_SEQ_LF_FREQ
-from bi_engine_par import ENGINE_PAR_SEQ_LF_BELL
-from bi_engine_par import ENGINE_PAR_SEQ_LMF_GAIN
-from bi_engine_par import ENGINE_PAR_SEQ_LMF_FREQ
-from bi_engine_par import ENGINE_PAR_SEQ_LMF_Q
-from bi_engine_par import ENGINE_PAR_SEQ_HMF_GAIN
-from bi_engine_par import ENGINE_PAR_SEQ_HMF_FREQ
-from bi_engine_par import ENGINE_PAR_SEQ_HMF_Q
-from bi_engine_par import ENGINE_PAR_SEQ_HF_GAIN
-from bi_engine_par import ENGINE_PAR_SEQ_HF_FREQ
-from bi_engine_par import ENGINE_PAR_SEQ_HF_BELL
-from bi_engine_par import ENGINE_PAR_SEND_EFFECT_BYPASS
-from bi_engine_par import ENGINE_PAR_SEND_EFFECT_DRY_LEVEL
-from bi_engine_par import ENGINE_PAR_SEND_EFFECT_OUTPUT_GAIN
-from bi_engine_par import ENGINE_PAR_PH_DEPTH
-from bi_engine_par import ENGINE_PAR_PH_SPEED
-from bi_engine_par import ENGINE_PAR_PH_SPEED_UNIT
-from bi_engine_par import ENGINE_PAR_PH_PHASE
-from bi_engine_par import ENGINE_PAR_PH_FEEDBACK
-from bi_engine_par import ENGINE_PAR_FL_DEPTH
-from bi_engine_par import ENGINE_PAR_FL_SPEED
-from bi_engine_par import ENGINE_PAR_FL_SPEED_UNIT
-from bi_engine_par import ENGINE_PAR_FL_PHASE
-from bi_engine_par import ENGINE_PAR_FL_FEEDBACK
-from bi_engine_par import ENGINE_PAR_FL_COLOR
-from bi_engine_par import ENGINE_PAR_CH_DEPTH
-from bi_engine_par import ENGINE_PAR_CH_SPEED
-from bi_engine_par import ENGINE_PAR_CH_SPEED_UNIT
-from bi_engine_par import ENGINE_PAR_CH_PHASE
-from bi_engine_par import ENGINE_PAR_RV_PREDELAY
-from bi_engine_par import ENGINE_PAR_RV_SIZE
-from bi_engine_par import ENGINE_PAR_RV_COLOUR
-from bi_engine_par import ENGINE_PAR_RV_STEREO
-from bi_engine_par import ENGINE_PAR_RV_DAMPING
-from bi_engine_par import ENGINE_PAR_DL_TIME
-from bi_engine_par import ENGINE_PAR_DL_TIME_UNIT
-from bi_engine_par import ENGINE_PAR_DL_DAMPING
-from bi_engine_par import ENGINE_PAR_DL_PAN
-from bi_engine_par import ENGINE_PAR_DL_FEEDBACK
-from bi_engine_par import ENGINE_PAR_IRC_PREDELAY
-from bi_engine_par import ENGINE_PAR_IRC_LENGTH_RATIO_ER
-from bi_engine_par import ENGINE_PAR_IRC_FREQ_LOWPASS_ER
-from bi_engine_par import ENGINE_PAR_IRC_FREQ_HIGHPASS_ER
-from bi_engine_par import ENGINE_PAR_IRC_LENGTH_RATIO_LR
-from bi_engine_par import ENGINE_PAR_IRC_FREQ_LOWPASS_LR
-from bi_engine_par import ENGINE_PAR_IRC_FREQ_HIGHPASS_LR
-from bi_engine_par import ENGINE_PAR_GN_GAIN
-from bi_engine_par import ENGINE_PAR_MOD_TARGET_INTENSITY
-from bi_engine_par import MOD_TARGET_INVERT_SOURCE
-from bi_engine_par import ENGINE_PAR_INTMOD_BYPASS
-from bi_engine_par import ENGINE_PAR_ATK_CURVE
-from bi_engine_par import ENGINE_PAR_ATTACK
-from bi_engine_par import ENGINE_PAR_ATTACK_UNIT
-from bi_engine_par import ENGINE_PAR_HOLD
-from bi_engine_par import ENGINE_PAR_HOLD_UNIT
-from bi_engine_par import ENGINE_PAR_DECAY
-from bi_engine_par import ENGINE_PAR_DECAY_UNIT
-from bi_engine_par import ENGINE_PAR_SUSTAIN
-from bi_engine_par import ENGINE_PAR_RELEASE
-from bi_engine_par import ENGINE_PAR_RELEASE_UNIT
-from bi_engine_par import ENGINE_PAR_DECAY1
-from bi_engine_par import ENGINE_PAR_DECAY1_UNIT
-from bi_engine_par import ENGINE_PAR_BREAK
-from bi_engine_par import ENGINE_PAR_DECAY2
-from bi_engine_par import ENGINE_PAR_DECAY2_UNIT
-from bi_engine_par import ENGINE_PAR_INTMOD_FREQUENCY
-from bi_engine_par import ENGINE_PAR_INTMOD_FREQUENCY_UNIT
-from bi_engine_par import ENGINE_PAR_LFO_DELAY
-from bi_engine_par import ENGINE_PAR_LFO_DELAY_UNIT
-from bi_engine_par import ENGINE_PAR_INTMOD_PULSEWIDTH
-from bi_engine_par import ENGINE_PAR_LFO_SINE
-from bi_engine_par import ENGINE_PAR_LFO_RECT
-from bi_engine_par import ENGINE_PAR_LFO_TRI
-from bi_engine_par import ENGINE_PAR_LFO_SAW
-from bi_engine_par import ENGINE_PAR_LFO_RAND
-from bi_engine_par import ENGINE_PAR_GLIDE_COEF
-from bi_engine_par import ENGINE_PAR_GLIDE_COEF_UNIT
-from bi_engine_par import ENGINE_PAR_EFFECT_TYPE
-from bi_engine_par import ENGINE_PAR_SEND_EFFECT_TYPE
-from bi_engine_par import EFFECT_TYPE_FILTER
-from bi_engine_par import EFFECT_TYPE_COMPRESSOR
-from bi_engine_par import EFFECT_TYPE_LIMITER
-from bi_engine_par import EFFECT_TYPE_INVERTER
-from bi_engine_par import EFFECT_TYPE_SURROUND_PANNER
-from bi_engine_par import EFFECT_TYPE_SHAPER
-from bi_engine_par import EFFECT_TYPE_LOFI
-from bi_engine_par import EFFECT_TYPE_STEREO
-from bi_engine_par import EFFECT_TYPE_DISTORTION
-from bi_engine_par import EFFECT_TYPE_SEND_LEVELS
-from bi_engine_par import EFFECT_TYPE_PHASER
-from bi_engine_par import EFFECT_TYPE_CHORUS
-from bi_engine_par import EFFECT_TYPE_FLANGER
-from bi_engine_par import EFFECT_TYPE_REVERB
-from bi_engine_par import EFFECT_TYPE_DELAY
-from bi_engine_par import EFFECT_TYPE_IRC
-from bi_engine_par import EFFECT_TYPE_GAINER
-from bi_engine_par import EFFECT_TYPE_SKREAMER
-from bi_engine_par import EFFECT_TYPE_ROTATOR
-from bi_engine_par import EFFECT_TYPE_TWANG
-from bi_engine_par import EFFECT_TYPE_CABINET
-from bi_engine_par import EFFECT_TYPE_AET_FILTER
-from bi_engine_par import EFFECT_TYPE_TRANS_MASTER
-from bi_engine_par import EFFECT_TYPE_BUS_COMP
-from bi_engine_par import EFFECT_TYPE_TAPE_SAT
-from bi_engine_par import EFFECT_TYPE_SOLID_GEQ
-from bi_engine_par import EFFECT_TYPE_JUMP
-from bi_engine_par import EFFECT_TYPE_FB_COMP
-from bi_engine_par import EFFECT_TYPE_ACBOX
-from bi_engine_par import EFFECT_TYPE_CAT
-from bi_engine_par import EFFECT_TYPE_DSTORTION
-from bi_engine_par import EFFECT_TYPE_HOTSOLO
-from bi_engine_par import EFFECT_TYPE_VAN51
-from bi_engine_par import EFFECT_TYPE_NONE
-from bi_engine_par import EFFECT_TYPE_PHASER
-from bi_engine_par import EFFECT_TYPE_CHORUS
-from bi_engine_par import EFFECT_TYPE_FLANGER
-from bi_engine_par import EFFECT_TYPE_REVERB
-from bi_engine_par import EFFECT_TYPE_DELAY
-from bi_engine_par import EFFECT_TYPE_IRC
-from bi_engine_par import EFFECT_TYPE_GAINER
-from bi_engine_par import ENGINE_PAR_EFFECT_SUBTYPE
-from bi_engine_par import FILTER_TYPE_LP1POLE
-from bi_engine_par import FILTER_TYPE_HP1POLE
-from bi_engine_par import FILTER_TYPE_BP2POLE
-from bi_engine_par import FILTER_TYPE_LP2POLE
-from bi_engine_par import FILTER_TYPE_HP2POLE
-from bi_engine_par import FILTER_TYPE_LP4POLE
-from bi_engine_par import FILTER_TYPE_HP4POLE
-from bi_engine_par import FILTER_TYPE_BP4POLE
-from bi_engine_par import FILTER_TYPE_BR4POLE
-from bi_engine_par import FILTER_TYPE_LP6POLE
-from bi_engine_par import FILTER_TYPE_PHASER
-from bi_engine_par import FILTER_TYPE_VOWELA
-from bi_engine_par import FILTER_TYPE_VOWELB
-from bi_engine_par import FILTER_TYPE_PRO52
-from bi_engine_par import FILTER_TYPE_LADDER
-from bi_engine_par import FILTER_TYPE_VERSATILE
-from bi_engine_par import FILTER_TYPE_EQ1BAND
-from bi_engine_par import FILTER_TYPE_EQ2BAND
-from bi_engine_par import FILTER_TYPE_EQ3BAND
-from bi_engine_par import FILTER_TYPE_DAFT_LP
-from bi_engine_par import FILTER_TYPE_SV_LP1
-from bi_engine_par import FILTER_TYPE_SV_LP2
-from bi_engine_par import FILTER_TYPE_SV_LP4
-from bi_engine_par import FILTER_TYPE_LDR_LP1
-from bi_engine_par import FILTER_TYPE_LDR_LP2
-from bi_engine_par import FILTER_TYPE_LDR_LP3
-from bi_engine_par import FILTER_TYPE_LDR_LP4
-from bi_engine_par import FILTER_TYPE_AR_LP2
-from bi_engine_par import FILTER_TYPE_AR_LP4
-from bi_engine_par import FILTER_TYPE_AR_LP24
-from bi_engine_par import FILTER_TYPE_SV_HP1
-from bi_engine_par import FILTER_TYPE_SV_HP2
-from bi_engine_par import FILTER_TYPE_SV_HP4
-from bi_engine_par import FILTER_TYPE_LDR_HP1
-from bi_engine_par import FILTER_TYPE_LDR_HP2
-from bi_engine_par import FILTER_TYPE_LDR_HP3
-from bi_engine_par import FILTER_TYPE_LDR_HP4
-from bi_engine_par import FILTER_TYPE_AR_HP2
-from bi_engine_par import FILTER_TYPE_AR_HP4
-from bi_engine_par import FILTER_TYPE_AR_HP24
-from bi_engine_par import FILTER_TYPE_DAFT_HP
-from bi_engine_par import FILTER_TYPE_SV_BP2
-from bi_engine_par import FILTER_TYPE_SV_BP4
-from bi_engine_par import FILTER_TYPE_LDR_BP2
-from bi_engine_par import FILTER_TYPE_LDR_BP4
-from bi_engine_par import FILTER_TYPE_AR_BP2
-from bi_engine_par import FILTER_TYPE_AR_BP4
-from bi_engine_par import FILTER_TYPE_AR_BP24
-from bi_engine_par import FILTER_TYPE_SV_NOTCH4
-from bi_engine_par import FILTER_TYPE_LDR_PEAK
-from bi_engine_par import FILTER_TYPE_LDR_NOTCH
-from bi_engine_par import FILTER_TYPE_SV_PAR_LPHP
-from bi_engine_par import FILTER_TYPE_SV_PAR_BPBP
-from bi_engine_par import FILTER_TYPE_SV_SER_LPHP
-from bi_engine_par import FILTER_TYPE_FORMANT_1
-from bi_engine_par import FILTER_TYPE_FORMANT_2
-from bi_engine_par import FILTER_TYPE_SIMPLE_LPHP
-from bi_engine_par import ENGINE_PAR_INTMOD_TYPE
-from bi_engine_par import INTMOD_TYPE_NONE
-from bi_engine_par import INTMOD_TYPE_LFO
-from bi_engine_par import INTMOD_TYPE_ENVELOPE
-from bi_engine_par import INTMOD_TYPE_STEPMOD
-from bi_engine_par import INTMOD_TYPE_ENV_FOLLOW
-from bi_engine_par import INTMOD_TYPE_GLIDE
-from bi_engine_par import ENGINE_PAR_INTMOD_SUBTYPE
-from bi_engine_par import ENV_TYPE_AHDSR
-from bi_engine_par import ENV_TYPE_FLEX
-from bi_engine_par import ENV_TYPE_DBD
-from bi_engine_par import LFO_TYPE_RECTANGLE
-from bi_engine_par import LFO_TYPE_TRIANGLE
-from bi_engine_par import LFO_TYPE_SAWTOOTH
-from bi_engine_par import LFO_TYPE_RANDO
-from bi_engine_par import LFO_TYPE_MULTI
-from bi_engine_par import ENGINE_PAR_DISTORTION_TYPE
-from bi_engine_par import NI_DISTORTION_TYPE_TUBE
-from bi_engine_par import NI_DISTORTION_TYPE_TRANS
-from bi_engine_par import ENGINE_PAR_SHAPE_TYPE
-from bi_engine_par import NI_SHAPE_TYPE_CLASSIC
-from bi_engine_par import NI_SHAPE_TYPE_ENHANCED
-from bi_engine_par import NI_SHAPE_TYPE_DRUMS
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_MODE
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_KEY_MIN
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_KEY_MAX
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_CONTROLLER
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_CC_MIN
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_CC_MAX
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_CYCLE_CLASS
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_ZONE_IDX
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_SLICE_IDX
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_SEQ_ONLY
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_NEXT_CRIT
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_MODE
-from bi_engine_par import ENGINE_PAR_START_CRITERIA_NEXT_CRIT
-from bi_engine_par import START_CRITERIA_NONE
-from bi_engine_par import START_CRITERIA_ON_KEY
-from bi_engine_par import START_CRITERIA_ON_CONTROLLER
-from bi_engine_par import START_CRITERIA_CYCLE_ROUND_ROBIN
-from bi_engine_par import START_CRITERIA_CYCLE_RANDOM
-from bi_engine_par import START_CRITERIA_SLICE_TRIGGER
-from bi_engine_par import START_CRITERIA_AND_NEXT
-from bi_engine_par import START_CRITERIA_AND_NOT_NEXT
-from bi_engine_par import START_CRITERIA_OR_NEXT
-from bi_engine_par import find_mod
-from bi_engine_par import find_target
-from bi_engine_par import get_engine_par
-from bi_engine_par import get_engine_par_disp
-from bi_engine_par import get_voice_limit
-from bi_engine_par import set_voice_limit
-from bi_engine_par import output_channel_name
-from bi_engine_par import set_engine_par
-from bi_load_save import get_folder
-from bi_load_save import load_array
-from bi_load_save import load_array_str
-from bi_load_save import load_ir_sample
-from bi_load_save import save_array
-from bi_load_save import save_array_str
-from bi_load_save import save_midi_file
-from bi_midi import MIDI_COMMAND_NOTE_ON
-from bi_midi import MIDI_COMMAND_POLY_AT
-from bi_midi import MIDI_COMMAND_CC
-from bi_midi import MIDI_COMMAND_PROGRAM_CHANGE
-from bi_midi import MIDI_COMMAND_MONO_AT
-from bi_midi import MIDI_COMMAND_PITCH_BEND
-from bi_midi import MIDI_COMMAND_RPN
-from bi_midi import MIDI_COMMAND_NRPN
-from bi_midi import MIDI_BYTE_1
-from bi_midi import MIDI_BYTE_2
-from bi_midi import MIDI_COMMAND
-from bi_midi import mf_insert_file
-from bi_midi import mf_set_export_area
-from bi_midi import mf_set_buffer_size
-from bi_midi import mf_set_buffer_size
-from bi_midi import mf_get_buffer_size
-from bi_midi import mf_reset
-from bi_midi import mf_insert_event
-from bi_midi import mf_remove_event
-from bi_midi import mf_set_event_par
-from bi_midi import mf_get_event_par
-from bi_midi import mf_get_id
-from bi_midi import mf_set_mark
-from bi_midi import mf_get_mark
-from bi_midi import by_track
-from bi_midi import mf_get_first
-from bi_midi import mf_get_last
-from bi_midi import mf_get_next
-from bi_midi import mf_get_prev
-from bi_midi import mf_get_next_at
-from bi_midi import mf_get_prev_at
-from bi_midi import mf_get_num_tracks
-from bi_midi import set_midi
-from bi_misc import array_equal
-from bi_misc import num_elements
-from bi_misc import search
-from bi_misc import sort
-from bi_misc import allow_group
-from bi_misc import disallow_group
-from bi_misc import find_group
-from bi_misc import get_purge_state
-from bi_misc import group_name
-from bi_misc import purge_group
-from bi_misc import change_listener_par
-from bi_misc import ms_to_ticks
-from bi_misc import ticks_to_ms
-from bi_misc import set_listener
-from bi_misc import stop_wait
-from bi_misc import wait
-from bi_misc import wait_ticks
-from bi_misc import in_range
-from bi_misc import NI_KEY_TYPE_DEFAULT
-from bi_misc import NI_KEY_TYPE_CONTROL
-from bi_misc import NI_KEY_TYPE_NONE
-from bi_misc import KEY_COLOR_RED
-from bi_misc import KEY_COLOR_ORANGE
-from bi_misc import KEY_COLOR_LIGHT_ORANGE
-from bi_misc import KEY_COLOR_WARM_YELLOW
-from bi_misc import KEY_COLOR_YELLOW
-from bi_misc import KEY_COLOR_LIME
-from bi_misc import KEY_COLOR_GREEN
-from bi_misc import KEY_COLOR_MINT
-from bi_misc import KEY_COLOR_CYAN
-from bi_misc import KEY_COLOR_TURQUOISE
-from bi_misc import KEY_COLOR_BLUE
-from bi_misc import KEY_COLOR_PLUM
-from bi_misc import KEY_COLOR_VIOLET
-from bi_misc import KEY_COLOR_PURPLE
-from bi_misc import KEY_COLOR_MAGENTA
-from bi_misc import KEY_COLOR_FUCHSIA
-from bi_misc import KEY_COLOR_DEFAULT
-from bi_misc import KEY_COLOR_INACTIVE
-from bi_misc import KEY_COLOR_NONE
-from bi_misc import get_key_color
-from bi_misc import set_key_color
-from bi_misc import get_key_name
-from bi_misc import set_key_name
-from bi_misc import get_key_triggerstate
-from bi_misc import get_key_type
-from bi_misc import get_keyrange_min_note
-from bi_misc import get_keyrange_max_note
-from bi_misc import get_keyrange_name
-from bi_misc import set_key_pressed
-from bi_misc import set_key_pressed_support
-from bi_misc import set_key_type
-from bi_misc import set_keyrange
-from bi_misc import remove_keyrange
-from bi_misc import NO_SYS_SCRIPT_GROUP_START
-from bi_misc import NO_SYS_SCRIPT_PEDAL
-from bi_misc import NO_SYS_SCRIPT_RLS_TRIG
-from bi_misc import SET_CONDITION
-from bi_misc import RESET_CONDITION
-from bi_misc import find_zone
-from bi_misc import get_sample_length
-from bi_misc import num_slices_zone
-from bi_misc import zone_slice_length
-from bi_misc import zone_slice_start
-from bi_misc import zone_slice_idx_loop_start
-from bi_misc import zone_slice_idx_loop_end
-from bi_misc import zone_slice_loop_count
-from bi_misc import dont_use_machine_mode
-from bi_misc import pgs_create_key
-from bi_misc import pgs_create_str_key
-from bi_misc import pgs_key_exists
-from bi_misc import pgs_str_key_exists
-from bi_misc import pgs_set_key_val
-from bi_misc import pgs_set_str_key_val
-from bi_misc import pgs_get_key_val
-from bi_misc import pgs_get_str_key_val
-from bi_notes_events import MARK_1
-from bi_notes_events import MARK_2
-from bi_notes_events import MARK_3
-from bi_notes_events import MARK_4
-from bi_notes_events import MARK_5
-from bi_notes_events import MARK_6
-from bi_notes_events import MARK_7
-from bi_notes_events import MARK_8
-from bi_notes_events import MARK_9
-from bi_notes_events import MARK_10
-from bi_notes_events import MARK_11
-from bi_notes_events import MARK_12
-from bi_notes_events import MARK_13
-from bi_notes_events import MARK_14
-from bi_notes_events import MARK_15
-from bi_notes_events import MARK_16
-from bi_notes_events import MARK_17
-from bi_notes_events import MARK_18
-from bi_notes_events import MARK_19
-from bi_notes_events import MARK_20
-from bi_notes_events import MARK_21
-from bi_notes_events import MARK_22
-from bi_notes_events import MARK_23
-from bi_notes_events import MARK_24
-from bi_notes_events import MARK_25
-from bi_notes_events import MARK_26
-from bi_notes_events import MARK_27
-from bi_notes_events import MARK_28
-from bi_notes_events import CC
-from bi_notes_events import CC_TOUCHED
-from bi_notes_events import CC_NUM
-from bi_notes_events import EVENT_ID
-from bi_notes_events import EVENT_NOTE
-from bi_notes_events import EVENT_VELOCITY
-from bi_notes_events import CURRENT_EVENT
-from bi_notes_events import EVENT_PAR_0
-from bi_notes_events import EVENT_PAR_1
-from bi_notes_events import EVENT_PAR_2
-from bi_notes_events import EVENT_PAR_3
-from bi_notes_events import EVENT_PAR_VOLUME
-from bi_notes_events import EVENT_PAR_PAN
-from bi_notes_events import EVENT_PAR_TUNE
-from bi_notes_events import EVENT_PAR_NOTE
-from bi_notes_events import EVENT_PAR_VELOCITY
-from bi_notes_events import EVENT_PAR_ALLOW_GROUP
-from bi_notes_events import EVENT_PAR_SOURCE
-from bi_notes_events import EVENT_PAR_PLAY_POS
-from bi_notes_events import EVENT_PAR_ZONE_ID
-from bi_notes_events import EVENT_PAR_MIDI_CHANNEL
-from bi_notes_events import EVENT_PAR_MIDI_COMMAND
-from bi_notes_events import EVENT_PAR_MIDI_BYTE_1
-from bi_notes_events import EVENT_PAR_MIDI_BYTE_2
-from bi_notes_events import EVENT_PAR_POS
-from bi_notes_events import EVENT_PAR_NOTE_LENGTH
-from bi_notes_events import EVENT_PAR_ID
-from bi_notes_events import EVENT_PAR_TRACK_NR
-from bi_notes_events import EVENT_STATUS_INACTIVE
-from bi_notes_events import EVENT_STATUS_NOTE_QUEUE
-from bi_notes_events import EVENT_STATUS_MIDI_QUEUE
-from bi_notes_events import GROUPS_AFFECTED
-from bi_notes_events import NOTE_HELD
-from bi_notes_events import POLY_AT
-from bi_notes_events import POLY_AT_NUM
-from bi_notes_events import RPN_ADDRESS
-from bi_notes_events import RPN_VALUE
-from bi_notes_events import VCC_MONO_AT
-from bi_notes_events import VCC_PITCH_BEND
-from bi_notes_events import note_off
-from bi_notes_events import play_note
-from bi_notes_events import set_controller
-from bi_notes_events import set_rpn
-from bi_notes_events import set_nrpn
-from bi_notes_events import set_snapshot_type
-from bi_notes_events import by_marks
-from bi_notes_events import change_note
-from bi_notes_events import change_velo
-from bi_notes_events import change_pan
-from bi_notes_events import change_tune
-from bi_notes_events import change_vol
-from bi_notes_events import delete_event_mark
-from bi_notes_events import event_status
-from bi_notes_events import fade_in
-from bi_notes_events import fade_out
-from bi_notes_events import get_event_ids
-from bi_notes_events import get_event_par
-from bi_notes_events import get_event_par_arr
-from bi_notes_events import set_event_par
-from bi_notes_events import set_event_par_arr
-from bi_notes_events import ignore_event
-from bi_notes_events import set_event_mark
-from bi_notes_events import reset_rls_trig_counter
-from bi_notes_events import will_never_terminate
-from bi_ui_controls import KNOB_UNIT_NONE
-from bi_ui_controls import KNOB_UNIT_DB
-from bi_ui_controls import KNOB_UNIT_HZ
-from bi_ui_controls import KNOB_UNIT_PERCENT
-from bi_ui_controls import KNOB_UNIT_MS
-from bi_ui_controls import KNOB_UNIT_ST
-from bi_ui_controls import KNOB_UNIT_OCT
-from bi_ui_controls import CONTROL_PAR_NONE
-from bi_ui_controls import CONTROL_PAR_HELP
-from bi_ui_controls import CONTROL_PAR_POS_X
-from bi_ui_controls import CONTROL_PAR_POS_Y
-from bi_ui_controls import CONTROL_PAR_GRID_X
-from bi_ui_controls import CONTROL_PAR_GRID_Y
-from bi_ui_controls import CONTROL_PAR_WIDTH
-from bi_ui_controls import CONTROL_PAR_HEIGHT
-from bi_ui_controls import CONTROL_PAR_GRID_WIDTH
-from bi_ui_controls import CONTROL_PAR_GRID_HEIGHT
-from bi_ui_controls import CONTROL_PAR_HIDE
-from bi_ui_controls import CONTROL_PAR_BG_COLOR
-from bi_ui_controls import HIDE_PART_BG
-from bi_ui_controls import HIDE_PART_VALUE
-from bi_ui_controls import HIDE_PART_TITLE
-from bi_ui_controls import HIDE_PART_MOD_LIGHT
-from bi_ui_controls import HIDE_PART_NOTHING
-from bi_ui_controls import HIDE_WHOLE_CONTROL
-from bi_ui_controls import HIDE_PART_CURSOR
-from bi_ui_controls import HIDE_PART_BG
-from bi_ui_controls import HIDE_PART_VALUE
-from bi_ui_controls import HIDE_PART_TITLE
-from bi_ui_controls import HIDE_PART_MOD_LIGHT
-from bi_ui_controls import HIDE_PART_NOTHING
-from bi_ui_controls import HIDE_WHOLE_CONTROL
-from bi_ui_controls import HIDE_PART_CURSOR
-from bi_ui_controls import CONTROL_PAR_PICTURE
-from bi_ui_controls import CONTROL_PAR_PICTURE_STATE
-from bi_ui_controls import CONTROL_PAR_Z_LAYER
-from bi_ui_controls import CONTROL_PAR_VALUE
-from bi_ui_controls import CONTROL_PAR_DEFAULT_VALUE
-from bi_ui_controls import CONTROL_PAR_TEXT
-from bi_ui_controls import CONTROL_PAR_TEXTLINE
-from bi_ui_controls import CONTROL_PAR_LABEL
-from bi_ui_controls import CONTROL_PAR_UNIT
-from bi_ui_controls import CONTROL_PAR_FONT_TYPE
-from bi_ui_controls import font
-from bi_ui_controls import CONTROL_PAR_TEXTPOS_Y
-from bi_ui_controls import CONTROL_PAR_TEXT_ALIGNMENT
-from bi_ui_controls import text_alignment
-from bi_ui_controls import CONTROL_PAR_AUTOMATION_NAME
-from bi_ui_controls import CONTROL_PAR_ALLOW_AUTOMATION
-from bi_ui_controls import CONTROL_PAR_AUTOMATION_ID
-from bi_ui_controls import NI_CONTROL_PAR_IDX
-from bi_ui_controls import CONTROL_PAR_KEY_SHIFT
-from bi_ui_controls import CONTROL_PAR_KEY_ALT
-from bi_ui_controls import CONTROL_PAR_KEY_CONTROL
-from bi_ui_controls import CONTROL_PAR_BAR_COLOR
-from bi_ui_controls import CONTROL_PAR_ZERO_LINE_COLOR
-from bi_ui_controls import CONTROL_PAR_NUM_ITEMS
-from bi_ui_controls import CONTROL_PAR_SELECTED_ITEM_IDX
-from bi_ui_controls import CONTROL_PAR_DND_BEHAVIOUR
-from bi_ui_controls import CONTROL_PAR_SHOW_ARROWS
-from bi_ui_controls import CONTROL_PAR_OFF_COLOR
-from bi_ui_controls import CONTROL_PAR_ON_COLOR
-from bi_ui_controls import CONTROL_PAR_OVERLOAD_COLOR
-from bi_ui_controls import CONTROL_PAR_PEAK_COLOR
-from bi_ui_controls import CONTROL_PAR_VERTICAL
-from bi_ui_controls import CONTROL_PAR_BASEPATH
-from bi_ui_controls import CONTROL_PAR_FILEPATH
-from bi_ui_controls import CONTROL_PAR_COLUMN_WIDTH
-from bi_ui_controls import CONTROL_PAR_FILE_TYPE
-from bi_ui_controls import NI_FILE_TYPE_MIDI
-from bi_ui_controls import NI_FILE_TYPE_AUDIO
-from bi_ui_controls import NI_FILE_TYPE_ARRAY
-from bi_ui_controls import VALUE_EDIT_MODE_NOTE_NAMES
-from bi_ui_controls import UI_WAVEFORM_USE_SLICES
-from bi_ui_controls import UI_WAVEFORM_USE_TABLE
-from bi_ui_controls import UI_WAVEFORM_TABLE_IS_BIPOLAR
-from bi_ui_controls import UI_WAVEFORM_USE_MIDI_DRAG
-from bi_ui_controls import UI_WF_PROP_PLAY_CURSOR
-from bi_ui_controls import UI_WF_PROP_FLAGS
-from bi_ui_controls import UI_WF_PROP_TABLE_VAL
-from bi_ui_controls import UI_WF_PROP_TABLE_IDX_HIGHLIGHT
-from bi_ui_controls import UI_WF_PROP_MIDI_DRAG_START_NOTE
-from bi_ui_controls import CONTROL_PAR_WAVE_COLOR
-from bi_ui_controls import CONTROL_PAR_WAVE_CURSOR_COLOR
-from bi_ui_controls import CONTROL_PAR_SLICEMARKERS_COLOR
-from bi_ui_controls import CONTROL_PAR_BG_ALPHA
-from bi_ui_controls import CONTROL_PAR_MOUSE_BEHAVIOUR
-from bi_ui_controls import CONTROL_PAR_MOUSE_BEHAVIOUR_X
-from bi_ui_controls import CONTROL_PAR_MOUSE_BEHAVIOUR_Y
-from bi_ui_controls import CONTROL_PAR_MOUSE_MODE
-from bi_ui_controls import CONTROL_PAR_ACTIVE_INDEX
-from bi_ui_controls import CONTROL_PAR_CURSOR_PICTURE
-from bi_ui_controls import set_control_par
-from bi_ui_controls import get_control_par
-from bi_ui_controls import set_control_par_str
-from bi_ui_controls import get_control_par_str
-from bi_ui_controls import set_control_par_arr
-from bi_ui_controls import get_control_par_arr
-from bi_ui_controls import set_control_par_str_arr
-from bi_ui_controls import get_control_par_str_arr
-from bi_ui_controls import get_menu_item_str
-from bi_ui_controls import get_menu_item_value
-from bi_ui_controls import get_menu_item_visibility
-from bi_ui_controls import set_menu_item_str
-from bi_ui_controls import set_menu_item_value
-from bi_ui_controls import set_menu_item_visibility
-from bi_ui_controls import get_ui_wf_property
-from bi_ui_controls import set_ui_wf_property
-from bi_ui_controls import set_ui_color
+'''built-ins of KSP with their native names.
+
+from pyksp.compiler.classic_builtins import *
+
+Built-ins modules are imported on the first access to their names
+(PEP 562), so constants and functions of modules, which are not used
+by the script are not built. The star import binds every name, so
+it imports all built-ins modules; import names explicitly to keep
+the loading lazy:
+
+from pyksp.compiler.classic_builtins import message, set_control_par
+'''
+import importlib as _importlib
+
+
+_names = {
+    'k_built_ins': (
+        'message', 'exit', 'reset_ksp_timer', 'ignore_controller', 'exp',
+        'log', 'kpow', 'sqrt', 'ceil', 'floor', 'kround', 'cos', 'sin', 'tan',
+        'acos', 'asin', 'atan', 'NI_CALLBACK_ID', 'NI_CALLBACK_TYPE',
+        'NI_CB_TYPE_ASYNC_OUT', 'NI_CB_TYPE_CONTROLLER', 'NI_CB_TYPE_INIT',
+        'NI_CB_TYPE_LISTENER', 'NI_CB_TYPE_NOTE',
+        'NI_CB_TYPE_PERSISTENCE_CHANGED', 'NI_CB_TYPE_PGS',
+        'NI_CB_TYPE_POLY_AT', 'NI_CB_TYPE_RELEASE', 'NI_CB_TYPE_RPN',
+        'NI_CB_TYPE_NRPN', 'NI_CB_TYPE_UI_CONTROL', 'NI_CB_TYPE_UI_UPDATE',
+        'NI_CB_TYPE_MIDI_IN', 'CURRENT_SCRIPT_SLOT', 'GROUPS_SELECTED',
+        'NI_ASYNC_EXIT_STATUS', 'NI_ASYNC_ID', 'NI_BUS_OFFSET', 'NUM_GROUPS',
+        'NUM_OUTPUT_CHANNELS', 'NUM_ZONES', 'PLAYED_VOICES_INST',
+        'PLAYED_VOICES_TOTAL', 'GET_FOLDER_LIBRARY_DIR',
+        'GET_FOLDER_FACTORY_DIR', 'GET_FOLDER_PATCH_DIR',
+        'NI_VL_TMPRO_STANDARD', 'NI_VL_TMRPO_HQ', 'REF_GROUP_IDX',
+        'ALL_GROUPS', 'ALL_EVENTS', 'KEY_DOWN', 'KEY_DOWN_OCT',
+        'DISTANCE_BAR_START', 'DURATION_BAR', 'DURATION_QUARTER',
+        'DURATION_EIGHTH', 'DURATION_SIXTEENTH', 'DURATION_QUARTER_TRIPLET',
+        'DURATION_EIGHTH_TRIPLET', 'DURATION_SIXTEENTH_TRIPLET',
+        'ENGINE_UPTIME', 'KSP_TIMER', 'NI_SONG_POSITION',
+        'NI_TRANSPORT_RUNNING', 'SIGNATURE_NUM', 'SIGNATURE_DENOM',
+        'NI_SYNC_UNIT_ABS', 'NI_SYNC_UNIT_WHOLE', 'NI_SYNC_UNIT_WHOLE_TRIPLET',
+        'NI_SYNC_UNIT_HALF', 'NI_SYNC_UNIT_HALF_TRIPLET',
+        'NI_SYNC_UNIT_QUARTER', 'NI_SYNC_UNIT_QUARTER_TRIPLET',
+        'NI_SYNC_UNIT_8TH', 'NI_SYNC_UNIT_8TH_TRIPLET', 'NI_SYNC_UNIT_16TH',
+        'NI_SYNC_UNIT_16TH_TRIPLET', 'NI_SYNC_UNIT_32ND',
+        'NI_SYNC_UNIT_32ND_TRIPLET', 'NI_SYNC_UNIT_64TH',
+        'NI_SYNC_UNIT_64TH_TRIPLET', 'NI_SYNC_UNIT_256TH', 'NI_SYNC_UNIT_ZONE',
+        'NOTE_DURATION', 'NI_SIGNAL_TRANSP_STOP', 'NI_SIGNAL_TRANSP_START',
+        'NI_SIGNAL_TIMER_MS', 'NI_SIGNAL_TIMER_BEAT', 'NI_SIGNAL_TYPE',
+        'NI_MATH_PI', 'NI_MATH_E'),
+    'bi_engine_par': (
+        'ENGINE_PAR_VOLUME', 'ENGINE_PAR_PAN', 'ENGINE_PAR_TUNE',
+        'ENGINE_PAR_SMOOTH', 'ENGINE_PAR_FORMANT', 'ENGINE_PAR_SPEED',
+        'ENGINE_PAR_GRAIN_LENGTH', 'ENGINE_PAR_SLICE_ATTACK',
+        'ENGINE_PAR_SLICE_RELEASE', 'ENGINE_PAR_TRANSIENT_SIZE',
+        'ENGINE_PAR_ENVELOPE_ORDER', 'ENGINE_PAR_FORMANT_SHIFT',
+        'ENGINE_PAR_SPEED_UNIT', 'ENGINE_PAR_OUTPUT_CHANNEL', 'NI_BUS_OFFSET',
+        'ENGINE_PAR_EFFECT_BYPASS', 'ENGINE_PAR_INSERT_EFFECT_OUTPUT_GAIN',
+        'ENGINE_PAR_RELEASE_TRIGGER', 'ENGINE_PAR_THRESHOLD',
+        'ENGINE_PAR_RATIO', 'ENGINE_PAR_COMP_ATTACK', 'ENGINE_PAR_COMP_DECAY',
+        'ENGINE_PAR_LIM_IN_GAIN', 'ENGINE_PAR_LIM_RELEASE',
+        'ENGINE_PAR_SP_OFFSET_DISTANCE', 'ENGINE_PAR_SP_OFFSET_AZIMUTH',
+        'ENGINE_PAR_SP_OFFSET_X', 'ENGINE_PAR_SP_OFFSET_Y',
+        'ENGINE_PAR_SP_LFE_VOLUME', 'ENGINE_PAR_SP_SIZE',
+        'ENGINE_PAR_SP_DIVERGENCE', 'ENGINE_PAR_SHAPE', 'ENGINE_PAR_BITS',
+        'ENGINE_PAR_FREQUENCY', 'ENGINE_PAR_NOISELEVEL',
+        'ENGINE_PAR_NOISECOLOR', 'ENGINE_PAR_STEREO', 'ENGINE_PAR_STEREO_PAN',
+        'ENGINE_PAR_DRIVE', 'ENGINE_PAR_DAMPING', 'ENGINE_PAR_SENDLEVEL_0',
+        'ENGINE_PAR_SENDLEVEL_1', 'ENGINE_PAR_SENDLEVEL_2',
+        'ENGINE_PAR_SENDLEVEL_3', 'ENGINE_PAR_SENDLEVEL_4',
+        'ENGINE_PAR_SENDLEVEL_5', 'ENGINE_PAR_SENDLEVEL_6',
+        'ENGINE_PAR_SENDLEVEL_7', 'ENGINE_PAR_SK_TONE', 'ENGINE_PAR_SK_DRIVE',
+        'ENGINE_PAR_SK_BASS', 'ENGINE_PAR_SK_BRIGHT', 'ENGINE_PAR_SK_MIX',
+        'ENGINE_PAR_RT_SPEED', 'ENGINE_PAR_RT_BALANCE',
+        'ENGINE_PAR_RT_ACCEL_HI', 'ENGINE_PAR_RT_ACCEL_LO',
+        'ENGINE_PAR_RT_DISTANCE', 'ENGINE_PAR_RT_MIX', 'ENGINE_PAR_TW_VOLUME',
+        'ENGINE_PAR_TW_TREBLE', 'ENGINE_PAR_TW_MID', 'ENGINE_PAR_TW_BASS',
+        'ENGINE_PAR_TW_BRIGHT', 'ENGINE_PAR_TW_MONO', 'ENGINE_PAR_CB_SIZE',
+        'ENGINE_PAR_CB_AIR', 'ENGINE_PAR_CB_TREBLE', 'ENGINE_PAR_CB_BASS',
+        'ENGINE_PAR_CABINET_TYPE', 'ENGINE_PAR_EXP_FILTER_MORPH',
+        'ENGINE_PAR_EXP_FILTER_AMOUNT', 'ENGINE_PAR_TP_GAIN',
+        'ENGINE_PAR_TP_WARMTH', 'ENGINE_PAR_TP_HF_ROLLOFF',
+        'ENGINE_PAR_TP_QUALITY', 'ENGINE_PAR_TR_INPUT', 'ENGINE_PAR_TR_ATTACK',
+        'ENGINE_PAR_TR_SUSTAIN', 'ENGINE_PAR_TR_SMOOTH',
+        'ENGINE_PAR_SCOMP_THRESHOLD', 'ENGINE_PAR_SCOMP_RATIO',
+        'ENGINE_PAR_SCOMP_ATTACK', 'ENGINE_PAR_SCOMP_RELEASE',
+        'ENGINE_PAR_SCOMP_MAKEUP', 'ENGINE_PAR_SCOMP_MIX',
+        'ENGINE_PAR_JMP_PREAMP', 'ENGINE_PAR_JMP_BASS', 'ENGINE_PAR_JMP_MID',
+        'ENGINE_PAR_JMP_TREBLE', 'ENGINE_PAR_JMP_MASTER',
+        'ENGINE_PAR_JMP_PRESENCE', 'ENGINE_PAR_JMP_HIGAIN',
+        'ENGINE_PAR_JMP_MONO', 'ENGINE_PAR_FCOMP_INPUT',
+        'ENGINE_PAR_FCOMP_RATIO', 'ENGINE_PAR_FCOMP_ATTACK',
+        'ENGINE_PAR_FCOMP_RELEASE', 'ENGINE_PAR_FCOMP_MAKEUP',
+        'ENGINE_PAR_FCOMP_MIX', 'ENGINE_PAR_FCOMP_HQ_MODE',
+        'ENGINE_PAR_FCOMP_LINK', 'ENGINE_PAR_AC_NORMALVOLUME',
+        'ENGINE_PAR_AC_BRILLIANTVOLUME', 'ENGINE_PAR_AC_BASS',
+        'ENGINE_PAR_AC_TREBLE', 'ENGINE_PAR_AC_TONECUT',
+        'ENGINE_PAR_AC_TREMOLOSPEED', 'ENGINE_PAR_AC_TREMOLODEPTH',
+        'ENGINE_PAR_AC_MONO', 'ENGINE_PAR_CT_VOLUME',
+        'ENGINE_PAR_CT_DISTORTION', 'ENGINE_PAR_CT_FILTER',
+        'ENGINE_PAR_CT_BASS', 'ENGINE_PAR_CT_BALLS', 'ENGINE_PAR_CT_TREBLE',
+        'ENGINE_PAR_CT_TONE', 'ENGINE_PAR_CT_MONO', 'ENGINE_PAR_DS_VOLUME',
+        'ENGINE_PAR_DS_TONE', 'ENGINE_PAR_DS_DRIVE', 'ENGINE_PAR_DS_BASS',
+        'ENGINE_PAR_DS_MID', 'ENGINE_PAR_DS_TREBLE', 'ENGINE_PAR_DS_MONO',
+        'ENGINE_PAR_HS_PRENORMAL', 'ENGINE_PAR_HS_PREOVERDRIVE',
+        'ENGINE_PAR_HS_BASS', 'ENGINE_PAR_HS_MID', 'ENGINE_PAR_HS_TREBLE',
+        'ENGINE_PAR_HS_MASTER', 'ENGINE_PAR_HS_PRESENCE',
+        'ENGINE_PAR_HS_DEPTH', 'ENGINE_PAR_HS_OVERDRIVE', 'ENGINE_PAR_HS_MONO',
+        'ENGINE_PAR_V5_PREGAINRHYTHM', 'ENGINE_PAR_V5_PREGAINLEAD',
+        'ENGINE_PAR_V5_BASS', 'ENGINE_PAR_V5_MID', 'ENGINE_PAR_V5_TREBLE',
+        'ENGINE_PAR_V5_POSTGAIN', 'ENGINE_PAR_V5_RESONANCE',
+        'ENGINE_PAR_V5_PRESENCE', 'ENGINE_PAR_V5_LEADCHANNEL',
+        'ENGINE_PAR_V5_HIGAIN', 'ENGINE_PAR_V5_BRIGHT', 'ENGINE_PAR_V5_CRUNCH',
+        'ENGINE_PAR_V5_MONO', 'ENGINE_PAR_CUTOFF', 'ENGINE_PAR_RESONANCE',
+        'ENGINE_PAR_GAIN', 'ENGINE_PAR_FILTER_LADDER_HQ',
+        'ENGINE_PAR_BANDWIDTH', 'ENGINE_PAR_FILTER_SHIFTB',
+        'ENGINE_PAR_FILTER_SHIFTC', 'ENGINE_PAR_FILTER_RESB',
+        'ENGINE_PAR_FILTER_RESC', 'ENGINE_PAR_FILTER_TYPEA',
+        'ENGINE_PAR_FILTER_TYPEB', 'ENGINE_PAR_FILTER_TYPEC',
+        'ENGINE_PAR_FILTER_BYPA', 'ENGINE_PAR_FILTER_BYPB',
+        'ENGINE_PAR_FILTER_BYPC', 'ENGINE_PAR_FILTER_GAIN',
+        'ENGINE_PAR_FORMANT_TALK', 'ENGINE_PAR_FORMANT_SHARP',
+        'ENGINE_PAR_FORMANT_SIZE', 'ENGINE_PAR_LP_CUTOFF',
+        'ENGINE_PAR_HP_CUTOFF', 'ENGINE_PAR_FREQ1', 'ENGINE_PAR_BW1',
+        'ENGINE_PAR_GAIN1', 'ENGINE_PAR_FREQ2', 'ENGINE_PAR_BW2',
+        'ENGINE_PAR_GAIN2', 'ENGINE_PAR_FREQ3', 'ENGINE_PAR_BW3',
+        'ENGINE_PAR_GAIN3', 'ENGINE_PAR_SEQ_LF_GAIN', 'ENGINE_PAR_SEQ_LF_FREQ',
+        'ENGINE_PAR_SEQ_LF_BELL', 'ENGINE_PAR_SEQ_LMF_GAIN',
+        'ENGINE_PAR_SEQ_LMF_FREQ', 'ENGINE_PAR_SEQ_LMF_Q',
+        'ENGINE_PAR_SEQ_HMF_GAIN', 'ENGINE_PAR_SEQ_HMF_FREQ',
+        'ENGINE_PAR_SEQ_HMF_Q', 'ENGINE_PAR_SEQ_HF_GAIN',
+        'ENGINE_PAR_SEQ_HF_FREQ', 'ENGINE_PAR_SEQ_HF_BELL',
+        'ENGINE_PAR_SEND_EFFECT_BYPASS', 'ENGINE_PAR_SEND_EFFECT_DRY_LEVEL',
+        'ENGINE_PAR_SEND_EFFECT_OUTPUT_GAIN', 'ENGINE_PAR_PH_DEPTH',
+        'ENGINE_PAR_PH_SPEED', 'ENGINE_PAR_PH_SPEED_UNIT',
+        'ENGINE_PAR_PH_PHASE', 'ENGINE_PAR_PH_FEEDBACK', 'ENGINE_PAR_FL_DEPTH',
+        'ENGINE_PAR_FL_SPEED', 'ENGINE_PAR_FL_SPEED_UNIT',
+        'ENGINE_PAR_FL_PHASE', 'ENGINE_PAR_FL_FEEDBACK', 'ENGINE_PAR_FL_COLOR',
+        'ENGINE_PAR_CH_DEPTH', 'ENGINE_PAR_CH_SPEED',
+        'ENGINE_PAR_CH_SPEED_UNIT', 'ENGINE_PAR_CH_PHASE',
+        'ENGINE_PAR_RV_PREDELAY', 'ENGINE_PAR_RV_SIZE', 'ENGINE_PAR_RV_COLOUR',
+        'ENGINE_PAR_RV_STEREO', 'ENGINE_PAR_RV_DAMPING', 'ENGINE_PAR_DL_TIME',
+        'ENGINE_PAR_DL_TIME_UNIT', 'ENGINE_PAR_DL_DAMPING',
+        'ENGINE_PAR_DL_PAN', 'ENGINE_PAR_DL_FEEDBACK',
+        'ENGINE_PAR_IRC_PREDELAY', 'ENGINE_PAR_IRC_LENGTH_RATIO_ER',
+        'ENGINE_PAR_IRC_FREQ_LOWPASS_ER', 'ENGINE_PAR_IRC_FREQ_HIGHPASS_ER',
+        'ENGINE_PAR_IRC_LENGTH_RATIO_LR', 'ENGINE_PAR_IRC_FREQ_LOWPASS_LR',
+        'ENGINE_PAR_IRC_FREQ_HIGHPASS_LR', 'ENGINE_PAR_GN_GAIN',
+        'ENGINE_PAR_MOD_TARGET_INTENSITY', 'MOD_TARGET_INVERT_SOURCE',
+        'ENGINE_PAR_INTMOD_BYPASS', 'ENGINE_PAR_ATK_CURVE',
+        'ENGINE_PAR_ATTACK', 'ENGINE_PAR_ATTACK_UNIT', 'ENGINE_PAR_HOLD',
+        'ENGINE_PAR_HOLD_UNIT', 'ENGINE_PAR_DECAY', 'ENGINE_PAR_DECAY_UNIT',
+        'ENGINE_PAR_SUSTAIN', 'ENGINE_PAR_RELEASE', 'ENGINE_PAR_RELEASE_UNIT',
+        'ENGINE_PAR_DECAY1', 'ENGINE_PAR_DECAY1_UNIT', 'ENGINE_PAR_BREAK',
+        'ENGINE_PAR_DECAY2', 'ENGINE_PAR_DECAY2_UNIT',
+        'ENGINE_PAR_INTMOD_FREQUENCY', 'ENGINE_PAR_INTMOD_FREQUENCY_UNIT',
+        'ENGINE_PAR_LFO_DELAY', 'ENGINE_PAR_LFO_DELAY_UNIT',
+        'ENGINE_PAR_INTMOD_PULSEWIDTH', 'ENGINE_PAR_LFO_SINE',
+        'ENGINE_PAR_LFO_RECT', 'ENGINE_PAR_LFO_TRI', 'ENGINE_PAR_LFO_SAW',
+        'ENGINE_PAR_LFO_RAND', 'ENGINE_PAR_GLIDE_COEF',
+        'ENGINE_PAR_GLIDE_COEF_UNIT', 'ENGINE_PAR_EFFECT_TYPE',
+        'ENGINE_PAR_SEND_EFFECT_TYPE', 'EFFECT_TYPE_FILTER',
+        'EFFECT_TYPE_COMPRESSOR', 'EFFECT_TYPE_LIMITER',
+        'EFFECT_TYPE_INVERTER', 'EFFECT_TYPE_SURROUND_PANNER',
+        'EFFECT_TYPE_SHAPER', 'EFFECT_TYPE_LOFI', 'EFFECT_TYPE_STEREO',
+        'EFFECT_TYPE_DISTORTION', 'EFFECT_TYPE_SEND_LEVELS',
+        'EFFECT_TYPE_PHASER', 'EFFECT_TYPE_CHORUS', 'EFFECT_TYPE_FLANGER',
+        'EFFECT_TYPE_REVERB', 'EFFECT_TYPE_DELAY', 'EFFECT_TYPE_IRC',
+        'EFFECT_TYPE_GAINER', 'EFFECT_TYPE_SKREAMER', 'EFFECT_TYPE_ROTATOR',
+        'EFFECT_TYPE_TWANG', 'EFFECT_TYPE_CABINET', 'EFFECT_TYPE_AET_FILTER',
+        'EFFECT_TYPE_TRANS_MASTER', 'EFFECT_TYPE_BUS_COMP',
+        'EFFECT_TYPE_TAPE_SAT', 'EFFECT_TYPE_SOLID_GEQ', 'EFFECT_TYPE_JUMP',
+        'EFFECT_TYPE_FB_COMP', 'EFFECT_TYPE_ACBOX', 'EFFECT_TYPE_CAT',
+        'EFFECT_TYPE_DSTORTION', 'EFFECT_TYPE_HOTSOLO', 'EFFECT_TYPE_VAN51',
+        'EFFECT_TYPE_NONE', 'ENGINE_PAR_EFFECT_SUBTYPE', 'FILTER_TYPE_LP1POLE',
+        'FILTER_TYPE_HP1POLE', 'FILTER_TYPE_BP2POLE', 'FILTER_TYPE_LP2POLE',
+        'FILTER_TYPE_HP2POLE', 'FILTER_TYPE_LP4POLE', 'FILTER_TYPE_HP4POLE',
+        'FILTER_TYPE_BP4POLE', 'FILTER_TYPE_BR4POLE', 'FILTER_TYPE_LP6POLE',
+        'FILTER_TYPE_PHASER', 'FILTER_TYPE_VOWELA', 'FILTER_TYPE_VOWELB',
+        'FILTER_TYPE_PRO52', 'FILTER_TYPE_LADDER', 'FILTER_TYPE_VERSATILE',
+        'FILTER_TYPE_EQ1BAND', 'FILTER_TYPE_EQ2BAND', 'FILTER_TYPE_EQ3BAND',
+        'FILTER_TYPE_DAFT_LP', 'FILTER_TYPE_SV_LP1', 'FILTER_TYPE_SV_LP2',
+        'FILTER_TYPE_SV_LP4', 'FILTER_TYPE_LDR_LP1', 'FILTER_TYPE_LDR_LP2',
+        'FILTER_TYPE_LDR_LP3', 'FILTER_TYPE_LDR_LP4', 'FILTER_TYPE_AR_LP2',
+        'FILTER_TYPE_AR_LP4', 'FILTER_TYPE_AR_LP24', 'FILTER_TYPE_SV_HP1',
+        'FILTER_TYPE_SV_HP2', 'FILTER_TYPE_SV_HP4', 'FILTER_TYPE_LDR_HP1',
+        'FILTER_TYPE_LDR_HP2', 'FILTER_TYPE_LDR_HP3', 'FILTER_TYPE_LDR_HP4',
+        'FILTER_TYPE_AR_HP2', 'FILTER_TYPE_AR_HP4', 'FILTER_TYPE_AR_HP24',
+        'FILTER_TYPE_DAFT_HP', 'FILTER_TYPE_SV_BP2', 'FILTER_TYPE_SV_BP4',
+        'FILTER_TYPE_LDR_BP2', 'FILTER_TYPE_LDR_BP4', 'FILTER_TYPE_AR_BP2',
+        'FILTER_TYPE_AR_BP4', 'FILTER_TYPE_AR_BP24', 'FILTER_TYPE_SV_NOTCH4',
+        'FILTER_TYPE_LDR_PEAK', 'FILTER_TYPE_LDR_NOTCH',
+        'FILTER_TYPE_SV_PAR_LPHP', 'FILTER_TYPE_SV_PAR_BPBP',
+        'FILTER_TYPE_SV_SER_LPHP', 'FILTER_TYPE_FORMANT_1',
+        'FILTER_TYPE_FORMANT_2', 'FILTER_TYPE_SIMPLE_LPHP',
+        'ENGINE_PAR_INTMOD_TYPE', 'INTMOD_TYPE_NONE', 'INTMOD_TYPE_LFO',
+        'INTMOD_TYPE_ENVELOPE', 'INTMOD_TYPE_STEPMOD',
+        'INTMOD_TYPE_ENV_FOLLOW', 'INTMOD_TYPE_GLIDE',
+        'ENGINE_PAR_INTMOD_SUBTYPE', 'ENV_TYPE_AHDSR', 'ENV_TYPE_FLEX',
+        'ENV_TYPE_DBD', 'LFO_TYPE_RECTANGLE', 'LFO_TYPE_TRIANGLE',
+        'LFO_TYPE_SAWTOOTH', 'LFO_TYPE_RANDO', 'LFO_TYPE_MULTI',
+        'ENGINE_PAR_DISTORTION_TYPE', 'NI_DISTORTION_TYPE_TUBE',
+        'NI_DISTORTION_TYPE_TRANS', 'ENGINE_PAR_SHAPE_TYPE',
+        'NI_SHAPE_TYPE_CLASSIC', 'NI_SHAPE_TYPE_ENHANCED',
+        'NI_SHAPE_TYPE_DRUMS', 'ENGINE_PAR_START_CRITERIA_MODE',
+        'ENGINE_PAR_START_CRITERIA_KEY_MIN',
+        'ENGINE_PAR_START_CRITERIA_KEY_MAX',
+        'ENGINE_PAR_START_CRITERIA_CONTROLLER',
+        'ENGINE_PAR_START_CRITERIA_CC_MIN', 'ENGINE_PAR_START_CRITERIA_CC_MAX',
+        'ENGINE_PAR_START_CRITERIA_CYCLE_CLASS',
+        'ENGINE_PAR_START_CRITERIA_ZONE_IDX',
+        'ENGINE_PAR_START_CRITERIA_SLICE_IDX',
+        'ENGINE_PAR_START_CRITERIA_SEQ_ONLY',
+        'ENGINE_PAR_START_CRITERIA_NEXT_CRIT', 'START_CRITERIA_NONE',
+        'START_CRITERIA_ON_KEY', 'START_CRITERIA_ON_CONTROLLER',
+        'START_CRITERIA_CYCLE_ROUND_ROBIN', 'START_CRITERIA_CYCLE_RANDOM',
+        'START_CRITERIA_SLICE_TRIGGER', 'START_CRITERIA_AND_NEXT',
+        'START_CRITERIA_AND_NOT_NEXT', 'START_CRITERIA_OR_NEXT', 'find_mod',
+        'find_target', 'get_engine_par', 'get_engine_par_disp',
+        'get_voice_limit', 'set_voice_limit', 'output_channel_name',
+        'set_engine_par'),
+    'bi_load_save': (
+        'get_folder', 'load_array', 'load_array_str', 'load_ir_sample',
+        'save_array', 'save_array_str', 'save_midi_file'),
+    'bi_midi': (
+        'MIDI_COMMAND_NOTE_ON', 'MIDI_COMMAND_POLY_AT', 'MIDI_COMMAND_CC',
+        'MIDI_COMMAND_PROGRAM_CHANGE', 'MIDI_COMMAND_MONO_AT',
+        'MIDI_COMMAND_PITCH_BEND', 'MIDI_COMMAND_RPN', 'MIDI_COMMAND_NRPN',
+        'MIDI_BYTE_1', 'MIDI_BYTE_2', 'MIDI_COMMAND', 'mf_insert_file',
+        'mf_set_export_area', 'mf_set_buffer_size', 'mf_get_buffer_size',
+        'mf_reset', 'mf_insert_event', 'mf_remove_event', 'mf_set_event_par',
+        'mf_get_event_par', 'mf_get_id', 'mf_set_mark', 'mf_get_mark',
+        'by_track', 'mf_get_first', 'mf_get_last', 'mf_get_next',
+        'mf_get_prev', 'mf_get_next_at', 'mf_get_prev_at', 'mf_get_num_tracks',
+        'set_midi'),
+    'bi_misc': (
+        'array_equal', 'num_elements', 'search', 'sort', 'allow_group',
+        'disallow_group', 'find_group', 'get_purge_state', 'group_name',
+        'purge_group', 'change_listener_par', 'ms_to_ticks', 'ticks_to_ms',
+        'set_listener', 'stop_wait', 'wait', 'wait_ticks', 'in_range',
+        'NI_KEY_TYPE_DEFAULT', 'NI_KEY_TYPE_CONTROL', 'NI_KEY_TYPE_NONE',
+        'KEY_COLOR_RED', 'KEY_COLOR_ORANGE', 'KEY_COLOR_LIGHT_ORANGE',
+        'KEY_COLOR_WARM_YELLOW', 'KEY_COLOR_YELLOW', 'KEY_COLOR_LIME',
+        'KEY_COLOR_GREEN', 'KEY_COLOR_MINT', 'KEY_COLOR_CYAN',
+        'KEY_COLOR_TURQUOISE', 'KEY_COLOR_BLUE', 'KEY_COLOR_PLUM',
+        'KEY_COLOR_VIOLET', 'KEY_COLOR_PURPLE', 'KEY_COLOR_MAGENTA',
+        'KEY_COLOR_FUCHSIA', 'KEY_COLOR_DEFAULT', 'KEY_COLOR_INACTIVE',
+        'KEY_COLOR_NONE', 'get_key_color', 'set_key_color', 'get_key_name',
+        'set_key_name', 'get_key_triggerstate', 'get_key_type',
+        'get_keyrange_min_note', 'get_keyrange_max_note', 'get_keyrange_name',
+        'set_key_pressed', 'set_key_pressed_support', 'set_key_type',
+        'set_keyrange', 'remove_keyrange', 'NO_SYS_SCRIPT_GROUP_START',
+        'NO_SYS_SCRIPT_PEDAL', 'NO_SYS_SCRIPT_RLS_TRIG', 'SET_CONDITION',
+        'RESET_CONDITION', 'find_zone', 'get_sample_length', 'num_slices_zone',
+        'zone_slice_length', 'zone_slice_start', 'zone_slice_idx_loop_start',
+        'zone_slice_idx_loop_end', 'zone_slice_loop_count',
+        'dont_use_machine_mode', 'pgs_create_key', 'pgs_create_str_key',
+        'pgs_key_exists', 'pgs_str_key_exists', 'pgs_set_key_val',
+        'pgs_set_str_key_val', 'pgs_get_key_val', 'pgs_get_str_key_val'),
+    'bi_notes_events': (
+        'MARK_1', 'MARK_2', 'MARK_3', 'MARK_4', 'MARK_5', 'MARK_6', 'MARK_7',
+        'MARK_8', 'MARK_9', 'MARK_10', 'MARK_11', 'MARK_12', 'MARK_13',
+        'MARK_14', 'MARK_15', 'MARK_16', 'MARK_17', 'MARK_18', 'MARK_19',
+        'MARK_20', 'MARK_21', 'MARK_22', 'MARK_23', 'MARK_24', 'MARK_25',
+        'MARK_26', 'MARK_27', 'MARK_28', 'CC', 'CC_TOUCHED', 'CC_NUM',
+        'EVENT_ID', 'EVENT_NOTE', 'EVENT_VELOCITY', 'CURRENT_EVENT',
+        'EVENT_PAR_0', 'EVENT_PAR_1', 'EVENT_PAR_2', 'EVENT_PAR_3',
+        'EVENT_PAR_VOLUME', 'EVENT_PAR_PAN', 'EVENT_PAR_TUNE',
+        'EVENT_PAR_NOTE', 'EVENT_PAR_VELOCITY', 'EVENT_PAR_ALLOW_GROUP',
+        'EVENT_PAR_SOURCE', 'EVENT_PAR_PLAY_POS', 'EVENT_PAR_ZONE_ID',
+        'EVENT_PAR_MIDI_CHANNEL', 'EVENT_PAR_MIDI_COMMAND',
+        'EVENT_PAR_MIDI_BYTE_1', 'EVENT_PAR_MIDI_BYTE_2', 'EVENT_PAR_POS',
+        'EVENT_PAR_NOTE_LENGTH', 'EVENT_PAR_ID', 'EVENT_PAR_TRACK_NR',
+        'EVENT_STATUS_INACTIVE', 'EVENT_STATUS_NOTE_QUEUE',
+        'EVENT_STATUS_MIDI_QUEUE', 'GROUPS_AFFECTED', 'NOTE_HELD', 'POLY_AT',
+        'POLY_AT_NUM', 'RPN_ADDRESS', 'RPN_VALUE', 'VCC_MONO_AT',
+        'VCC_PITCH_BEND', 'note_off', 'play_note', 'set_controller', 'set_rpn',
+        'set_nrpn', 'set_snapshot_type', 'by_marks', 'change_note',
+        'change_velo', 'change_pan', 'change_tune', 'change_vol',
+        'delete_event_mark', 'event_status', 'fade_in', 'fade_out',
+        'get_event_ids', 'get_event_par', 'get_event_par_arr', 'set_event_par',
+        'set_event_par_arr', 'ignore_event', 'set_event_mark',
+        'reset_rls_trig_counter', 'will_never_terminate'),
+    'bi_ui_controls': (
+        'KNOB_UNIT_NONE', 'KNOB_UNIT_DB', 'KNOB_UNIT_HZ', 'KNOB_UNIT_PERCENT',
+        'KNOB_UNIT_MS', 'KNOB_UNIT_ST', 'KNOB_UNIT_OCT', 'CONTROL_PAR_NONE',
+        'CONTROL_PAR_HELP', 'CONTROL_PAR_POS_X', 'CONTROL_PAR_POS_Y',
+        'CONTROL_PAR_GRID_X', 'CONTROL_PAR_GRID_Y', 'CONTROL_PAR_WIDTH',
+        'CONTROL_PAR_HEIGHT', 'CONTROL_PAR_GRID_WIDTH',
+        'CONTROL_PAR_GRID_HEIGHT', 'CONTROL_PAR_HIDE', 'CONTROL_PAR_BG_COLOR',
+        'HIDE_PART_BG', 'HIDE_PART_VALUE', 'HIDE_PART_TITLE',
+        'HIDE_PART_MOD_LIGHT', 'HIDE_PART_NOTHING', 'HIDE_WHOLE_CONTROL',
+        'HIDE_PART_CURSOR', 'CONTROL_PAR_PICTURE', 'CONTROL_PAR_PICTURE_STATE',
+        'CONTROL_PAR_Z_LAYER', 'CONTROL_PAR_VALUE',
+        'CONTROL_PAR_DEFAULT_VALUE', 'CONTROL_PAR_TEXT',
+        'CONTROL_PAR_TEXTLINE', 'CONTROL_PAR_LABEL', 'CONTROL_PAR_UNIT',
+        'CONTROL_PAR_FONT_TYPE', 'font', 'CONTROL_PAR_TEXTPOS_Y',
+        'CONTROL_PAR_TEXT_ALIGNMENT', 'text_alignment',
+        'CONTROL_PAR_AUTOMATION_NAME', 'CONTROL_PAR_ALLOW_AUTOMATION',
+        'CONTROL_PAR_AUTOMATION_ID', 'NI_CONTROL_PAR_IDX',
+        'CONTROL_PAR_KEY_SHIFT', 'CONTROL_PAR_KEY_ALT',
+        'CONTROL_PAR_KEY_CONTROL', 'CONTROL_PAR_BAR_COLOR',
+        'CONTROL_PAR_ZERO_LINE_COLOR', 'CONTROL_PAR_NUM_ITEMS',
+        'CONTROL_PAR_SELECTED_ITEM_IDX', 'CONTROL_PAR_DND_BEHAVIOUR',
+        'CONTROL_PAR_SHOW_ARROWS', 'CONTROL_PAR_OFF_COLOR',
+        'CONTROL_PAR_ON_COLOR', 'CONTROL_PAR_OVERLOAD_COLOR',
+        'CONTROL_PAR_PEAK_COLOR', 'CONTROL_PAR_VERTICAL',
+        'CONTROL_PAR_BASEPATH', 'CONTROL_PAR_FILEPATH',
+        'CONTROL_PAR_COLUMN_WIDTH', 'CONTROL_PAR_FILE_TYPE',
+        'NI_FILE_TYPE_MIDI', 'NI_FILE_TYPE_AUDIO', 'NI_FILE_TYPE_ARRAY',
+        'VALUE_EDIT_MODE_NOTE_NAMES', 'UI_WAVEFORM_USE_SLICES',
+        'UI_WAVEFORM_USE_TABLE', 'UI_WAVEFORM_TABLE_IS_BIPOLAR',
+        'UI_WAVEFORM_USE_MIDI_DRAG', 'UI_WF_PROP_PLAY_CURSOR',
+        'UI_WF_PROP_FLAGS', 'UI_WF_PROP_TABLE_VAL',
+        'UI_WF_PROP_TABLE_IDX_HIGHLIGHT', 'UI_WF_PROP_MIDI_DRAG_START_NOTE',
+        'CONTROL_PAR_WAVE_COLOR', 'CONTROL_PAR_WAVE_CURSOR_COLOR',
+        'CONTROL_PAR_SLICEMARKERS_COLOR', 'CONTROL_PAR_BG_ALPHA',
+        'CONTROL_PAR_MOUSE_BEHAVIOUR', 'CONTROL_PAR_MOUSE_BEHAVIOUR_X',
+        'CONTROL_PAR_MOUSE_BEHAVIOUR_Y', 'CONTROL_PAR_MOUSE_MODE',
+        'CONTROL_PAR_ACTIVE_INDEX', 'CONTROL_PAR_CURSOR_PICTURE',
+        'set_control_par', 'get_control_par', 'set_control_par_str',
+        'get_control_par_str', 'set_control_par_arr', 'get_control_par_arr',
+        'set_control_par_str_arr', 'get_control_par_str_arr',
+        'get_menu_item_str', 'get_menu_item_value', 'get_menu_item_visibility',
+        'set_menu_item_str', 'set_menu_item_value', 'set_menu_item_visibility',
+        'get_ui_wf_property', 'set_ui_wf_property', 'set_ui_color')}
+_lazy = {name: module for module, names in _names.items()
+         for name in names}
+
+__all__ = list(_lazy)
+
+
+def import_modules():
+    '''imports all built-ins modules'''
+    for module in _names:
+        _importlib.import_module(module)
+
+
+def __getattr__(name):
+    try:
+        module = _lazy[name]
+    except KeyError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(_importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
@@ -0,0 +1,352 @@
+'''command line interface of pyksp.
+
+pyksp build [paths ...] [-j JOBS] [--force] [--state FILE]
+    finds python files, which define and compile kScript, and
+    compiles each of them in separate process. Targets, which inputs
+    (script, imported local modules and pyksp sources) are not changed
+    since the last build are skipped.
+
+pyksp watch script [-i INTERVAL]
+    compiles the script and recompiles it on every change of
+    the script or its local imports (see watch.Watcher).
+'''
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import runpy
+import site
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+
+from compile_cache import sources_hash
+from context import CompileContext
+
+
+STATE_FILE = '.pyksp_build.json'
+_markers = ('kScript(', '.compile(')
+_package_dir = os.path.abspath(os.path.dirname(__file__))
+
+
+def _is_script(path):
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return False
+    return all(marker in text for marker in _markers)
+
+
+def discover(paths):
+    '''returns sorted absolute paths of python files, which define
+    and compile kScript. Directories are walked recursively, hidden
+    directories, tests and pyksp sources are ignored. Explicitly passed
+    files are always returned.'''
+    found = set()
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            found.add(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs if not d.startswith(('.', '__'))
+                       and os.path.join(root, d) != _package_dir]
+            for file in files:
+                if not file.endswith('.py') or file.startswith('test_') \
+                        or file == 'setup.py':
+                    continue
+                full = os.path.join(root, file)
+                if _is_script(full):
+                    found.add(full)
+    return sorted(found)
+
+
+def _file_hash(path):
+    h = hashlib.new('sha1')
+    try:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _installed_dirs():
+    '''returns directories of standard library and installed
+    packages (user site-packages including)'''
+    dirs = {sys.prefix, sys.base_prefix, sys.exec_prefix}
+    # site module of old virtualenv has no getsitepackages()
+    with contextlib.suppress(AttributeError):
+        dirs.update(site.getsitepackages())
+    with contextlib.suppress(AttributeError):
+        dirs.add(site.getusersitepackages())
+    return {os.path.abspath(path) for path in dirs}
+
+
+_installed = _installed_dirs()
+
+
+def _is_local(path):
+    '''False for standard library and installed packages'''
+    return not any(path.startswith(p + os.sep) for p in _installed)
+
+
+def imported_modules(before):
+    '''returns dict of name: file of local modules, imported after
+    the "before" snapshot of sys.modules'''
+    modules = dict()
+    for name, module in list(sys.modules.items()):
+        if name in before:
+            continue
+        file = getattr(module, '__file__', None)
+        if not file:
+            continue
+        file = os.path.abspath(file)
+        if file.startswith(_package_dir + os.sep) or not _is_local(file):
+            continue
+        modules[name] = file
+    return modules
+
+
+def unload_modules(names):
+    '''removes modules from sys.modules, so they are imported again.
+    __main__ and pyksp modules are kept'''
+    for name in names:
+        if name == '__main__' or name == 'pyksp' or \
+                name.startswith('pyksp.'):
+            continue
+        sys.modules.pop(name, None)
+
+
+def build_target(path, clipboard_file=None, watching=False):
+    '''compiles the script at path inside the new CompileContext.
+
+    if watching is True, kScript.watch() of the script only compiles
+    it, and local modules, imported by the script are unloaded after
+    the build, so the next build imports their current sources.
+
+    returns dict with keys:
+    target, status ('built' or 'failed'), time, outputs,
+    inputs (dict of file: hash), log (stdout and stderr of the script)
+    and error (traceback or None).'''
+    path = os.path.abspath(path)
+    argv = sys.argv
+    sys.argv = [path]
+    sys.path.insert(0, os.path.dirname(path))
+    before = set(sys.modules)
+    log = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    try:
+        with CompileContext() as context, \
+                contextlib.redirect_stdout(log), \
+                contextlib.redirect_stderr(log):
+            context.clipboard_file = clipboard_file
+            context.watching = watching
+            runpy.run_path(path, run_name='__main__')
+    except BaseException:
+        error = traceback.format_exc()
+    finally:
+        sys.argv = argv
+        sys.path.remove(os.path.dirname(path))
+    elapsed = time.perf_counter() - start
+    modules = imported_modules(before)
+    if watching:
+        unload_modules(modules)
+    inputs = {path}
+    inputs.update(modules.values())
+    return {'target': path,
+            'status': 'failed' if error else 'built',
+            'time': elapsed,
+            'outputs': context.outputs,
+            'inputs': {file: _file_hash(file) for file in sorted(inputs)},
+            'log': log.getvalue(),
+            'error': error}
+
+
+def load_state(path):
+    '''returns state of the previous build or empty dict'''
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict()
+
+
+def save_state(path, state):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_up_to_date(record, sources):
+    '''True if the target was built with the same pyksp sources, its
+    outputs exist and none of its inputs are changed'''
+    if not record or record.get('sources') != sources:
+        return False
+    if not all(os.path.isfile(out) for out in record['outputs']):
+        return False
+    return all(_file_hash(file) == digest
+               for file, digest in record['inputs'].items())
+
+
+def _clipboard_file(path):
+    return os.path.splitext(path)[0] + '.txt'
+
+
+def _run_child(conn, func, args):
+    try:
+        conn.send((True, func(*args)))
+    except BaseException as e:
+        conn.send((False, e))
+    finally:
+        conn.close()
+
+
+def _isolated(func, *args):
+    '''returns func(*args), called in the new process'''
+    context = multiprocessing.get_context()
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_run_child, args=(child, func, args))
+    process.start()
+    child.close()
+    try:
+        ok, value = parent.recv()
+    except EOFError:
+        process.join()
+        raise RuntimeError(f'worker process exited with code '
+                           f'{process.exitcode}') from None
+    finally:
+        parent.close()
+    process.join()
+    if not ok:
+        raise value
+    return value
+
+
+class _IsolatedPool(ThreadPoolExecutor):
+    '''runs every task in the new process. Used instead of
+    ProcessPoolExecutor(max_tasks_per_child=1) before python 3.11'''
+
+    def __init__(self, jobs=None):
+        super().__init__(jobs or os.cpu_count() or 1)
+
+    def submit(self, func, *args):
+        return super().submit(_isolated, func, *args)
+
+
+def _new_pool(jobs):
+    '''every target is compiled in the fresh process, so global
+    state of scripts and modules can not collide'''
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(jobs, max_tasks_per_child=1)
+    return _IsolatedPool(jobs)
+
+
+def build(paths, jobs=None, force=False, state_file=STATE_FILE,
+          output=sys.stdout):
+    '''builds all scripts found at paths and prints timing table
+    to output. returns list of results (see build_target)'''
+    targets = discover(paths)
+    state = load_state(state_file)
+    sources = sources_hash()
+    results = dict()
+    dirty = list()
+    for target in targets:
+        if not force and is_up_to_date(state.get(target), sources):
+            results[target] = {'target': target, 'status': 'skipped',
+                               'time': 0.0, 'error': None}
+        else:
+            dirty.append(target)
+
+    start = time.perf_counter()
+    if dirty:
+        with _new_pool(jobs) as pool:
+            futures = [pool.submit(build_target, target,
+                                   _clipboard_file(target))
+                       for target in dirty]
+            for future in futures:
+                result = future.result()
+                results[result['target']] = result
+                if result['status'] == 'built':
+                    state[result['target']] = {
+                        'sources': sources,
+                        'outputs': result['outputs'],
+                        'inputs': result['inputs']}
+                else:
+                    state.pop(result['target'], None)
+    elapsed = time.perf_counter() - start
+    save_state(state_file, state)
+
+    results = [results[target] for target in targets]
+    print_table(results, elapsed, output)
+    return results
+
+
+def print_table(results, elapsed, output=sys.stdout):
+    '''prints per-target status and compile time, and
+    tracebacks of failed targets'''
+    names = [os.path.relpath(r['target']) for r in results]
+    width = max([len(name) for name in names] + [len('target')])
+    print(f'{"target":<{width}}  {"status":<7}  {"time":>8}', file=output)
+    for name, result in zip(names, results):
+        print(f'{name:<{width}}  {result["status"]:<7}  '
+              f'{result["time"]:>7.2f}s', file=output)
+    count = {status: sum(r['status'] == status for r in results)
+             for status in ('built', 'skipped', 'failed')}
+    print(f'{len(results)} targets: {count["built"]} built, '
+          f'{count["skipped"]} skipped, {count["failed"]} failed '
+          f'in {elapsed:.2f}s', file=output)
+    for name, result in zip(names, results):
+        if result['error']:
+            print(f'\n{name}:\n{result["error"]}', file=output)
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='pyksp', description='builds KSP scripts written with pyksp')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    b_parser = commands.add_parser(
+        'build', help='compile all scripts found at paths in parallel')
+    b_parser.add_argument(
+        'paths', nargs='*', default=['.'],
+        help='script files or directories to search for scripts')
+    b_parser.add_argument(
+        '-j', '--jobs', type=int, default=None,
+        help='number of processes (default: number of cores)')
+    b_parser.add_argument(
+        '-f', '--force', action='store_true',
+        help='rebuild targets, which inputs are not changed')
+    b_parser.add_argument(
+        '--state', default=STATE_FILE,
+        help=f'file with state of the last build (default: {STATE_FILE})')
+    w_parser = commands.add_parser(
+        'watch', help='recompile the script on every change of sources')
+    w_parser.add_argument('script', help='script file')
+    w_parser.add_argument(
+        '-i', '--interval', type=float, default=0.5,
+        help='polling interval in seconds (default: 0.5)')
+    return parser
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    if args.command == 'build':
+        results = build(args.paths, args.jobs, args.force, args.state)
+        return int(any(r['status'] == 'failed' for r in results))
+    if args.command == 'watch':
+        from watch import Watcher
+        Watcher(args.script, args.interval).run()
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
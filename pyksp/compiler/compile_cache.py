@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+from types import CodeType
+from types import FunctionType
+from types import MethodType
+from types import ModuleType
+
+from abstract import IName
+from functions import Function
+
+
+_primitives = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _code_hash(code, h):
+    '''updates hash object with bytecode, constants and names
+    of code object and all nested code objects'''
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    h.update(repr(code.co_varnames).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _code_hash(const, h)
+            continue
+        h.update(repr(const).encode())
+
+
+def _global_names(code):
+    '''yields names of code object and all nested code objects'''
+    yield from code.co_names
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _global_names(const)
+
+
+def _value_hash(value, h, seen, depth=1):
+    '''updates hash object with representation of value.
+    functions are hashed by their code and referenced globals,
+    named KSP objects by their full name, other objects by type
+    and primitive attributes'''
+    if isinstance(value, _primitives):
+        h.update(repr(value).encode())
+        return
+    if isinstance(value, (list, dict, set)):
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+    if isinstance(value, (tuple, list, set, frozenset)):
+        h.update(type(value).__name__.encode())
+        items = value
+        if isinstance(value, (set, frozenset)):
+            items = sorted(value, key=repr)
+        for item in items:
+            _value_hash(item, h, seen, depth)
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            h.update(repr(key).encode())
+            _value_hash(item, h, seen, depth)
+        return
+    if isinstance(value, MethodType):
+        _value_hash(value.__self__, h, seen, depth)
+        value = value.__func__
+    if isinstance(value, FunctionType):
+        _function_hash(value, h, seen)
+        return
+    if isinstance(value, type):
+        h.update(f'{value.__module__}.{value.__qualname__}'.encode())
+        return
+    if isinstance(value, ModuleType):
+        h.update(value.__name__.encode())
+        return
+    h.update(type(value).__qualname__.encode())
+    name = getattr(value, 'name', None)
+    if isinstance(name, IName):
+        h.update(name.full.encode())
+    if depth <= 0 or not hasattr(value, '__dict__'):
+        return
+    for key, item in vars(value).items():
+        if isinstance(item, (FunctionType, MethodType)):
+            continue
+        h.update(key.encode())
+        _value_hash(item, h, seen, depth - 1)
+
+
+def _function_hash(func, h, seen):
+    '''updates hash object with code of function, its defaults,
+    annotations, closure and referenced globals'''
+    func = getattr(func, '__wrapped__', func)
+    if id(func) in seen:
+        h.update(func.__qualname__.encode())
+        return
+    seen.add(id(func))
+    code = func.__code__
+    h.update(func.__qualname__.encode())
+    _code_hash(code, h)
+    _value_hash(func.__defaults__, h, seen)
+    _value_hash(func.__kwdefaults__, h, seen)
+    _value_hash(func.__annotations__, h, seen)
+    for cell in func.__closure__ or ():
+        try:
+            _value_hash(cell.cell_contents, h, seen)
+        except ValueError:
+            pass
+    f_globals = func.__globals__
+    for name in sorted(set(_global_names(code))):
+        if name in f_globals:
+            h.update(name.encode())
+            _value_hash(f_globals[name], h, seen)
+
+
+def code_hash(*objects):
+    '''returns hex digest of callables or other objects
+    with all referenced globals'''
+    h = hashlib.new('sha1')
+    seen = set()
+    for obj in objects:
+        _value_hash(obj, h, seen)
+    return h.hexdigest()
+
+
+def sources_hash():
+    '''returns hex digest of the compiler sources, so cache is
+    invalidated by the package update'''
+    h = hashlib.new('sha1')
+    path = os.path.abspath(os.path.dirname(__file__))
+    for file in sorted(os.listdir(path)):
+        if not file.endswith('.py'):
+            continue
+        with open(os.path.join(path, file), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class CompileCache:
+    '''on-disk storage of the generated bodies of callbacks and
+    functions.
+
+    Every unit is keyed by hash of its code object with referenced
+    globals, hash of the init section lines (context) and hash of the
+    compiler sources. Unchanged units are taken from the cache, dirty
+    ones are regenerated and stored. Units, which invoke @func
+    functions are always regenerated, as their invocations are needed
+    for functions generation.
+
+    Example:
+    cache = CompileCache('.pyksp_cache')
+    cache.update_context('on init')
+    lines = cache.callback_body(NoteCallback)
+    '''
+
+    __sources = None
+
+    def __init__(self, directory: str) -> None:
+        self._dir = directory
+        if CompileCache.__sources is None:
+            CompileCache.__sources = sources_hash()
+        self._context = hashlib.new('sha1')
+        self._context.update(CompileCache.__sources.encode())
+        self.hits = 0
+        self.misses = 0
+
+    def update_context(self, line: str):
+        '''adds line of init section to the context of units'''
+        self._context.update(line.encode('utf-8'))
+        self._context.update(b'\n')
+
+    def key(self, kind: str, *objects):
+        '''returns key of unit'''
+        h = hashlib.new('sha1')
+        h.update(self._context.digest())
+        h.update(kind.encode())
+        h.update(code_hash(*objects).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._dir, key + '.json')
+
+    def load(self, key: str):
+        '''returns list of lines or None if key is not cached'''
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, lines: list):
+        '''writes lines of unit to the cache'''
+        os.makedirs(self._dir, exist_ok=True)
+        tmp = self._path(key) + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(lines, f)
+        os.replace(tmp, self._path(key))
+
+    def clear(self):
+        '''removes all cached units'''
+        if not os.path.isdir(self._dir):
+            return
+        for file in os.listdir(self._dir):
+            if file.endswith('.json'):
+                os.remove(os.path.join(self._dir, file))
+
+    def _get(self, key, generate):
+        lines = self.load(key)
+        if lines is not None:
+            self.hits += 1
+            return lines
+        self.misses += 1
+        invoked = Function.invocations()
+        lines = generate()
+        if Function.invocations() == invoked:
+            self.store(key, lines)
+        return lines
+
+    def callback_body(self, cb):
+        '''returns lines of callback body'''
+        functions = cb.functions
+        if not functions:
+            return cb.generate_body()
+        key = self.key('callback', cb._header, functions)
+        return self._get(key, cb.generate_body)
+
+    def function_body(self, function):
+        '''returns lines of Function body'''
+        if not function.called:
+            return []
+        f_self = function._cashed_args[1].get('self')
+        key = self.key('function', function.name.full, function._func,
+                       f_self)
+        return self._get(key, function._generate_ex_proxy)
@@ -7,6 +7,7 @@ from base_types import get_runtime, get_string_repr
 from abstract import Output
 from abstract import KSP
 # from abstract import SingletonMeta
+from context import ContextAttr
 
 from native_types import kInt
 from native_types import kArrInt
@@ -29,7 +30,11 @@ class KspCondFalse(Exception):
     pass
 
 
-__condition = True
+class _Conditions(KSP):
+    """State of check() and If-Else chains,
+    owned by the current CompileContext"""
+    condition = ContextAttr(True)
+    can_be_else = ContextAttr(factory=list)
 
 
 def Break():
@@ -49,18 +54,13 @@ def check(condition=None):
     """Function for proper work of conditions under tests.
     Has to be on the first line of every context block.
     """
-    global __condition
-
     if condition is None:
-        if __condition is False:
-            __condition = True
+        if _Conditions.condition is False:
+            _Conditions.condition = True
             CondFalse()
 
         return True
-    __condition = condition
-
-
-can_be_else = list()
+    _Conditions.condition = condition
 
 
 class If(KSP):
@@ -92,7 +92,7 @@ class If(KSP):
         y += 1
     """
 
-    __condition = True
+    __condition = ContextAttr(True)
 
     @property
     def _condition(self):
@@ -115,7 +115,7 @@ class If(KSP):
     def __enter__(self):
         """Checks if condition is True, appends it to new item of
         can_be_else and build if(condition) line"""
-        can_be_else.append([self.__condition])
+        _Conditions.can_be_else.append([self.__condition])
         if not self.is_compiled():
             if not self.__condition:
                 check(False)
@@ -143,8 +143,7 @@ class If(KSP):
     @staticmethod
     def refresh():
         """static method to get the last If stack from can_be_else"""
-        global can_be_else
-        can_be_else.pop()
+        _Conditions.can_be_else.pop()
 
 
 class Else(KSP):
@@ -186,7 +185,7 @@ class Else(KSP):
         """Checks amount of statements and raises exception if
         can_be_else is empty (pure KSP code before Else())"""
         try:
-            if_result = can_be_else.pop()
+            if_result = _Conditions.can_be_else.pop()
         except IndexError:
             raise KspCondError('has to be right after If()')
         for item in if_result:
@@ -223,7 +222,7 @@ class Else(KSP):
             result.append(False)
         result.append(cond)
         self.__if_count += 1
-        can_be_else.append(result)
+        _Conditions.can_be_else.append(result)
         if self.is_compiled():
             Output().put('else')
             self.set_bool(True)
@@ -300,7 +299,7 @@ class Select(KSP):
     If()
     """
 
-    _vars = list()
+    _vars = ContextAttr(factory=list)
 
     def __init__(self, expression: int):
         if self.is_compiled():
@@ -368,6 +367,16 @@ class Case(KSP):
         return True
 
 
+def _trace():
+    '''turns off simulation of runtime values for tracing body of
+    the loop under compilation: the body is executed once with
+    symbolic index, whatever the trip count is.
+    returns the previous state for KSP.set_simulated()'''
+    simulated = KSP.is_simulated()
+    KSP.set_simulated(False)
+    return simulated
+
+
 for_wrong_syntax_msg = '''Wrong syntax.
 Syntax for for-each loops
 -------------------------
@@ -393,6 +402,10 @@ class For(KSP):
 
     As While, If, Else, Select and Case, it's context manager.
 
+    Under compilation the body is traced once, whatever the trip
+    count is. Index is symbolic: runtime values are not simulated
+    inside the body and are kept as before the loop.
+
     Returns
     -------
     iteration generator
@@ -413,14 +426,19 @@ class For(KSP):
         for val in seq:
             # code
 
+    With unroll=True loop with int arguments (or over array) is
+    generated without while: the body is repeated for every index,
+    which is int, so items of arrays are accessed at constant indices.
+    Unrolled loop can not be breaked.
+
     See Also
     --------
     Break()
     """
 
     __maxlen = 20
-    idx = None
-    arr = None
+    idx = ContextAttr(None)
+    arr = ContextAttr(None)
 
     def maxlen(self, val):
         For.__maxlen = val
@@ -437,27 +455,38 @@ class For(KSP):
         return out
 
     def __init__(self, start: int=None, stop: int=None,
-                 step: int=None, arr: KspArray=None):
+                 step: int=None, arr: KspArray=None, unroll: bool=False):
         self.init_arrays()
-        self._out_touched = False
+        self._simulated = None
+        if not self.__is_foreach(arr, start, stop, step):
+            # if enumerate:
+            #     raise AttributeError(
+            #         'enumerate par accesible only in for_each loop')
+            self.__duck_typing(start, stop, step)
+            self.__func = self.__range_handler
+            args = list()
+            args.append(start)
+            if stop:
+                args.append(stop)
+            if step:
+                args.append(step)
+            self.__args = self.__parse_args(*args)
+            self.__start, self.__stop, self.__step = self.__args
+        self.__unroll = unroll and self.is_compiled()
+        if self.__unroll:
+            self.__check_unroll()
+            return
         For.idx.inc()
         self.__idx = For.arr[For.idx]
-        if self.__is_foreach(arr, start, stop, step):
-            # self.enumerate = enumerate
+
+    def __check_unroll(self):
+        '''Raises exception if trip count is not constant'''
+        if self.__func == self.__foreach_handler:
             return
-        # if enumerate:
-        #     raise AttributeError(
-        #         'enumerate par accesible only in for_each loop')
-        self.__duck_typing(start, stop, step)
-        self.__func = self.__range_handler
-        args = list()
-        args.append(start)
-        if stop:
-            args.append(stop)
-        if step:
-            args.append(step)
-        self.__args = self.__parse_args(*args)
-        self.__start, self.__stop, self.__step = self.__args
+        for arg in self.__args:
+            if not isinstance(arg, int):
+                raise KspCondError(
+                    'only loops with int arguments can be unrolled')
 
     def __is_foreach(self, arr, start, stop, step):
         '''Returns True if arr is only argument'''
@@ -497,24 +526,36 @@ class For(KSP):
         self.__check_duck_arg(step, 'step', stop)
 
     def __enter__(self):
-        '''Returns generator, depends on loop-type'''
+        '''Returns generator, depends on loop-type.
+        Under compilation the body is traced once with symbolic
+        index (see _trace())'''
+        if self.__unroll:
+            return self.__unrolled_handler()
+        if self.is_compiled():
+            # runtime value of the first iteration
+            if self.__func == self.__range_handler:
+                self.__idx._set_runtime(get_runtime(self.__start))
+            else:
+                self.__idx._set_runtime(0)
+            self._simulated = _trace()
         return self.__func()
 
     def __exit__(self, exc, value, trace):
         '''Supresses Brake exceptions and generates
         postfix (end) code'''
+        if self._simulated is not None:
+            KSP.set_simulated(self._simulated)
+            self._simulated = None
         if exc is not None and exc is not KspCondBrake:
-            if self._out_touched:
-                Output().blocked = False
-                self._out_touched = False
             return
+        if self.__unroll:
+            if exc is not None:
+                raise KspCondError('unrolled loop can not be breaked')
+            return True
         if isinstance(value, KspCondBrake):
             self.__idx <<= len(self.__seq)
             Output().put(f'{value}')
         self.__generate_exit_code()
-        if self._out_touched:
-            Output().blocked = False
-            self._out_touched = False
         return True
 
     def __generate_exit_code(self):
@@ -533,20 +574,22 @@ class For(KSP):
         self.__idx <<= 0
         if self.is_compiled():
             Output().put(f'while({self.__idx.val} < {len(self.__seq)})')
+            yield self.__seq[self.__idx]
+            return
         for idx in range(len(self.__seq)):
-            if idx > 0 and self.is_compiled() and not Output().blocked:
-                self._out_touched = True
-                Output().blocked = True
             self.__idx._set_runtime(idx)
             item = self.__seq[self.__idx]
             yield item
-        if self._out_touched:
-            Output().blocked = False
-            self._out_touched = False
-        return
-        # yield out
 
-        return True
+    def __unrolled_handler(self):
+        '''Under compilation returns generator over constant indices
+        (or items at them), so the body is generated for every
+        iteration without while loop'''
+        if self.__func == self.__foreach_handler:
+            for idx in range(len(self.__seq)):
+                yield self.__seq[idx]
+            return
+        yield from range(*self.__args)
 
     def __parse_args(self, *args):
         '''Prepares arguments for range() function'''
@@ -563,17 +606,11 @@ class For(KSP):
         if self.is_compiled():
             Output().put(
                 f'while({self.__idx.val} < {get_string_repr(self.__stop)})')
+            yield self.__idx
+            return
         for i in range(*get_runtime(*self.__args)):
             self.__idx._set_runtime(i)
-            if i > get_runtime(self.__start) and \
-                    self.is_compiled()and not Output().blocked:
-                self._out_touched = True
-                Output().blocked = True
             yield self.__idx
-        if self._out_touched:
-            self._out_touched = False
-            Output().blocked = False
-        return
 
     @staticmethod
     def refresh():
@@ -586,7 +623,8 @@ class While(KSP):
     Instead of For() can not handle Break() function yet.
 
     As For(), If(), Else(), Select() and Case() is context
-    manager.
+    manager. Under compilation the body is traced once, as the
+    body of For().
 
     Returns
     -------
@@ -608,12 +646,12 @@ class While(KSP):
 
     def __init__(self):
         self.__count = 0
-        self._blocked = False
+        self._simulated = None
 
     def __call__(self, condition: bool):
-        if self.__count and not Output().blocked:
-            self._blocked = True
-            Output().blocked = True
+        if self.__count and self.is_compiled():
+            # the body is traced once
+            raise KspCondBrake()
         if callable(condition):
             condition = condition()
         self.__condition = condition
@@ -621,24 +659,21 @@ class While(KSP):
             if self.__condition:
                 return True
             raise KspCondBrake()
-        if self.__condition.get_value():
-            self.set_bool(True)
-            Output().put(f'while({self.__condition.expand()})')
-            self.set_bool(False)
-            self.__count += 1
-            return True
-        if self._blocked:
-            self._blocked = False
-            Output().blocked = False
-        raise KspCondBrake()
+        self.set_bool(True)
+        Output().put(f'while({self.__condition.expand()})')
+        self.set_bool(False)
+        self.__count += 1
+        return True
 
     def __enter__(self):
+        if self.is_compiled():
+            self._simulated = _trace()
         return self
 
     def __exit__(self, exc, value, trace):
-        if self._blocked:
-            self._blocked = False
-            Output().blocked = False
+        if self._simulated is not None:
+            KSP.set_simulated(self._simulated)
+            self._simulated = None
         if exc is not None:
             if exc is not KspCondBrake:
                 return
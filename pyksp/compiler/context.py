@@ -0,0 +1,166 @@
+from abc import ABCMeta
+from contextvars import ContextVar
+from functools import partial
+import weakref
+
+
+class CompileContext:
+    '''owns the state of one compilation: KSP flags, names registry,
+    Output and other singletons, declared objects, built-ins,
+    functions, loops, callbacks and controls.
+
+    The current context is kept in the context variable, so every
+    thread (or asyncio task) can compile its own script. Without
+    explicitly entered context the global one is used.
+
+    Example:
+    def build(script):
+        with CompileContext():
+            script.compile()
+    with ThreadPoolExecutor() as pool:
+        pool.map(build, scripts)
+    '''
+
+    def __init__(self) -> None:
+        self._values = dict()
+        # {id(obj): (weak reference to obj, attrs of obj)}
+        self._objects = dict()
+        self._tokens = list()
+        self.singletons = dict()
+        # files, written by kScript.compile() inside the context
+        self.outputs = list()
+        # if set, scripts with kScript.clipboard output are written
+        # to this file instead of the exchange buffer
+        self.clipboard_file = None
+        # True if script is executed by the watcher, so kScript.watch()
+        # only compiles it
+        self.watching = False
+
+    @staticmethod
+    def current() -> 'CompileContext':
+        '''returns context of the current thread or task'''
+        return _current.get()
+
+    def get(self, key, factory):
+        '''returns value, stored by key. If there is no value yet,
+        stores and returns result of factory()'''
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = factory()
+            return value
+
+    def set(self, key, value):
+        '''stores value by key'''
+        self._values[key] = value
+
+    def get_local(self, attr, obj, factory):
+        '''returns value of attr, owned by obj. If there is no value
+        yet, stores and returns result of factory(obj)'''
+        key = (attr, id(obj))
+        try:
+            return self._values[key]
+        except KeyError:
+            self._own(attr, obj)
+            value = self._values[key] = factory(obj)
+            return value
+
+    def set_local(self, attr, obj, value):
+        '''stores value of attr, owned by obj'''
+        self._own(attr, obj)
+        self._values[(attr, id(obj))] = value
+
+    def _own(self, attr, obj):
+        '''values of obj are removed, when obj is deleted, so its id
+        can be reused. obj without weak references support is kept
+        alive'''
+        entry = self._objects.get(id(obj))
+        if entry is None:
+            try:
+                ref = weakref.ref(obj, partial(self._forget, id(obj)))
+            except TypeError:
+                ref = obj
+            entry = self._objects[id(obj)] = (ref, set())
+        entry[1].add(attr)
+
+    def _forget(self, key, ref):
+        _, attrs = self._objects.pop(key)
+        for attr in attrs:
+            self._values.pop((attr, key), None)
+
+    def __enter__(self):
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, exc_type, value, trace):
+        _current.reset(self._tokens.pop())
+
+
+_global_context = CompileContext()
+_current = ContextVar('pyksp_compile_context', default=_global_context)
+
+
+def current_context() -> CompileContext:
+    '''returns context of the current thread or task'''
+    return _current.get()
+
+
+class ContextAttr:
+    '''class attribute, which value is owned by the current
+    CompileContext. default is used for every new context, factory
+    (if passed) is called instead for mutable defaults.
+    Assignment to class attribute requires ContextMeta metaclass.'''
+
+    def __init__(self, default=None, factory=None):
+        self._default = default
+        self._factory = factory or self._get_default
+
+    def _get_default(self):
+        return self._default
+
+    def __get__(self, obj, cls):
+        values = _current.get()._values
+        try:
+            return values[self]
+        except KeyError:
+            value = values[self] = self._factory()
+            return value
+
+    def __set__(self, obj, val):
+        _current.get()._values[self] = val
+
+
+class ContextInstanceAttr:
+    '''instance attribute, which value is owned by the current
+    CompileContext. factory is called with instance for every
+    new context'''
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        try:
+            return _current.get()._values[(self, id(obj))]
+        except KeyError:
+            return _current.get().get_local(self, obj, self._factory)
+
+    def __set__(self, obj, val):
+        _current.get().set_local(self, obj, val)
+
+
+class ContextMeta(ABCMeta):
+    '''passes assignment of ContextAttr class attributes to
+    the current CompileContext'''
+
+    def __setattr__(cls, name, value):
+        for klass in cls.__mro__:
+            if name not in klass.__dict__:
+                continue
+            attr = klass.__dict__[name]
+            if isinstance(attr, ContextAttr):
+                attr.__set__(None, value)
+                return
+            break
+        super().__setattr__(name, value)
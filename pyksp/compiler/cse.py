@@ -0,0 +1,309 @@
+'''common subexpression elimination pass.
+
+Pure expressions, which are computed several times in the straight
+code of callback or function, are computed once to the compiler
+generated temporary variable, and its value is used instead.
+Temporaries ($_cse0, ~_cse0, @_cse0, ...) are declared in "on init"
+and are shared by all callbacks and functions.
+
+Expression is pure if all functions inside it are pure built-ins
+(see BuiltInFunc.pure). Its value is available until any of its
+variables is assigned. Calls of user functions, not pure built-ins
+(wait() including) and unknown lines make all values unavailable,
+so a temporary never lives across them. Nested bodies of if, while
+and select are optimized separately.
+
+Expressions, which are cheaper to compute again than to store and to
+load (variables, literals, "literal +/- variable" and array items
+with such index) are not hoisted. Self-assignments
+("%arr[$i + 1] := %arr[$i + 1]") do not compute anything, so their
+expressions are not counted.
+
+Example:
+script = kScript('out.txt', passes=[CommonSubexpressions()])
+'''
+from ir import Assign
+from ir import BinOp
+from ir import Call
+from ir import Declare
+from ir import FuncCall
+from ir import If
+from ir import Index
+from ir import Name
+from ir import Num
+from ir import Raw
+from ir import Select
+from ir import Str
+from ir import UnaryOp
+from ir import walk
+
+from k_built_ins import BuiltInFunc
+
+
+# prefixes of variables, which can hold values of expressions
+_types = {'$': '$', '%': '$', '~': '~', '?': '~', '@': '@', '!': '@'}
+_arithmetic = ('+', '-', '*', '/')
+_bitwise = ('mod', '.and.', '.or.', '.xor.')
+# built-in variables, which are changed by the engine during callback
+_volatile = frozenset((
+    '$KSP_TIMER', '$ENGINE_UPTIME', '$NI_SONG_POSITION',
+    '$NI_TRANSPORT_RUNNING', '$PLAYED_VOICES_INST',
+    '$PLAYED_VOICES_TOTAL', '$DISTANCE_BAR_START', '%NOTE_DURATION'))
+
+
+def value_type(expr):
+    '''returns prefix of variable ("$", "~" or "@"), which can hold
+    value of expression, or None (for conditions, arrays and unknown
+    functions)'''
+    if isinstance(expr, Name):
+        return expr.name[0] if expr.name[0] in '$~@' else None
+    if isinstance(expr, Index):
+        return _types.get(expr.name[0])
+    if isinstance(expr, Num):
+        text = expr.text.lower()
+        return '~' if '.' in text else '$'
+    if isinstance(expr, Str):
+        return '@'
+    if isinstance(expr, FuncCall):
+        return BuiltInFunc.result_prefix(expr.name)
+    if isinstance(expr, UnaryOp):
+        operand = value_type(expr.operand)
+        if expr.op == '-' and operand in ('$', '~'):
+            return operand
+        if expr.op == '.not.' and operand == '$':
+            return '$'
+        return None
+    if isinstance(expr, BinOp):
+        if expr.op == '&':
+            return '@'
+        left = value_type(expr.left)
+        if left != value_type(expr.right):
+            return None
+        if expr.op in _arithmetic and left in ('$', '~'):
+            return left
+        if expr.op in _bitwise and left == '$':
+            return left
+    return None
+
+
+def is_pure(expr):
+    '''True if expression calls only pure built-in functions'''
+    return all(BuiltInFunc.is_pure(node.name) for node in expr.walk()
+               if isinstance(node, FuncCall))
+
+
+def names(expr):
+    '''returns set of variables and arrays, used by expression'''
+    return {node.name for node in expr.walk()
+            if isinstance(node, (Name, Index))}
+
+
+def is_stable(expr):
+    '''True if expression is pure and does not use volatile
+    variables, so it has the same value until any of its variables
+    is assigned'''
+    return is_pure(expr) and not names(expr) & _volatile
+
+
+def _is_literal(expr):
+    if isinstance(expr, UnaryOp) and expr.op == '-':
+        # negative literal
+        expr = expr.operand
+    return isinstance(expr, (Num, Str))
+
+
+def _is_offset(expr, is_variable):
+    '''True for "literal +/- variable" and "variable +/- literal"'''
+    if not isinstance(expr, BinOp) or expr.op not in ('+', '-'):
+        return False
+    return _is_literal(expr.left) and is_variable(expr.right) or \
+        is_variable(expr.left) and _is_literal(expr.right)
+
+
+def _is_variable(expr):
+    '''True for variable and array item, which index is variable,
+    literal or "variable +/- literal"'''
+    if not isinstance(expr, Index):
+        return isinstance(expr, Name)
+    index = expr.index
+    return isinstance(index, Name) or _is_literal(index) or \
+        _is_offset(index, lambda node: isinstance(node, Name))
+
+
+def _is_cheap(expr):
+    '''True if expression is not worth storing to the temporary'''
+    return _is_literal(expr) or _is_variable(expr) or \
+        _is_offset(expr, _is_variable)
+
+
+def _is_candidate(expr):
+    if _is_cheap(expr):
+        return False
+    if value_type(expr) is None:
+        return False
+    return is_stable(expr)
+
+
+def _evaluated(expr):
+    '''yields nodes of expression, which are always evaluated.
+    Right operands of "and" and "or" are skipped, as they may be
+    not evaluated'''
+    yield expr
+    if isinstance(expr, BinOp) and expr.op in ('and', 'or'):
+        yield from _evaluated(expr.left)
+        return
+    for child in expr.children():
+        yield from _evaluated(child)
+
+
+def _size(expr):
+    return sum(1 for _ in expr.walk())
+
+
+class CommonSubexpressions:
+    '''optimization pass (see module doc).
+    After the run hoisted is the count of replaced computations,
+    temporaries is the list of declared temporary variables'''
+
+    name = 'cse'
+    prefix = '_cse'
+
+    def __init__(self) -> None:
+        self.hoisted = 0
+        self.temporaries = list()
+
+    def __call__(self, program):
+        init = program.block('on init')
+        if init is None:
+            return
+        self.hoisted = 0
+        self._declared = {stmt.name for block in program.blocks
+                          for stmt in block.statements()
+                          if isinstance(stmt, Declare)}
+        # {type prefix: names of temporaries}
+        self._pool = {'$': list(), '~': list(), '@': list()}
+        for block in program.blocks:
+            self._used = {prefix: 0 for prefix in self._pool}
+            self._optimize(block.body)
+        self.temporaries = [name for pool in self._pool.values()
+                            for name in pool]
+        init.body[:0] = [Declare(f'declare {name}')
+                         for name in self.temporaries]
+
+    def _temporary(self, prefix):
+        '''returns the next temporary of the block'''
+        pool = self._pool[prefix]
+        idx = self._used[prefix]
+        self._used[prefix] += 1
+        if idx == len(pool):
+            number = len(pool)
+            while f'{prefix}{self.prefix}{number}' in self._declared:
+                number += 1
+            pool.append(f'{prefix}{self.prefix}{number}')
+        return Name(pool[idx])
+
+    def _optimize(self, body):
+        for stmt in body:
+            for nested in stmt.bodies():
+                self._optimize(nested)
+        while self._hoist(body):
+            pass
+
+    def _hoist(self, body):
+        '''hoists the largest expression, computed several times.
+        returns False if there is nothing to hoist'''
+        groups = [group for group in self._groups(body)
+                  if len(group[1]) > 1]
+        if not groups:
+            return False
+        expr, positions = max(groups, key=lambda group: _size(group[0]))
+        temporary = self._temporary(value_type(expr))
+
+        def replace(node):
+            return temporary if node == expr else node
+        for pos in sorted(set(positions)):
+            self._replace(body[pos], replace)
+        body.insert(positions[0], Assign(temporary, expr))
+        self.hoisted += len(positions) - 1
+        return True
+
+    @staticmethod
+    def _replace(stmt, replace):
+        if isinstance(stmt, Assign):
+            if isinstance(stmt.target, Index):
+                stmt.target = stmt.target.map(replace)
+            stmt.value = stmt.value.map(replace)
+        elif isinstance(stmt, Call):
+            stmt.expr = stmt.expr.map(replace)
+        elif isinstance(stmt, If):
+            stmt.cond = stmt.cond.map(replace)
+        elif isinstance(stmt, Select):
+            stmt.expr = stmt.expr.map(replace)
+
+    def _groups(self, body):
+        '''returns list of (expression, positions of statements), where
+        value of expression is computed and stays available'''
+        groups = list()
+        current = dict()
+        for pos, stmt in enumerate(body):
+            for expr in self._computed(stmt):
+                if expr not in current:
+                    current[expr] = (expr, list())
+                    groups.append(current[expr])
+                current[expr][1].append(pos)
+            killed = self._killed(stmt)
+            for expr in list(current):
+                if killed is None or names(expr) & killed:
+                    del current[expr]
+        return groups
+
+    @staticmethod
+    def _computed(stmt):
+        '''returns list of candidate expressions, computed by stmt
+        before its side effects'''
+        if isinstance(stmt, Assign):
+            if stmt.target == stmt.value:
+                return []
+            exprs = [stmt.value]
+            if isinstance(stmt.target, Index):
+                exprs.append(stmt.target.index)
+        elif isinstance(stmt, Call) and isinstance(stmt.expr, FuncCall):
+            exprs = list(stmt.expr.args)
+        elif isinstance(stmt, If):
+            exprs = [stmt.cond]
+        elif isinstance(stmt, Select):
+            exprs = [stmt.expr]
+        else:
+            return []
+        if not all(is_pure(expr) for expr in exprs):
+            return []
+        return [node for expr in exprs for node in _evaluated(expr)
+                if _is_candidate(node)]
+
+    def _killed(self, stmt):
+        '''returns set of variables, assigned by stmt with its
+        nested statements, or None if it can change anything'''
+        killed = set()
+        for nested in walk([stmt]):
+            if isinstance(nested, Assign):
+                target = nested.target
+                if not isinstance(target, (Name, Index)):
+                    return None
+                killed.add(target.name)
+            elif isinstance(nested, Declare):
+                killed.add(nested.name)
+            elif isinstance(nested, Raw):
+                if nested.line().strip() and \
+                        not nested.line().startswith('{'):
+                    return None
+            elif isinstance(nested, Call):
+                if not isinstance(nested.expr, FuncCall) or \
+                        not BuiltInFunc.is_pure(nested.expr.name):
+                    return None
+            elif not isinstance(nested, (If, Select)) and \
+                    not nested.bodies():
+                # call of user function
+                return None
+            if not all(is_pure(expr) for expr in nested.exprs()):
+                return None
+        return killed
@@ -0,0 +1,217 @@
+'''dead code and declarations elimination passes.
+
+kScript declares every object, which was created, e.g. stack arrays
+of functions, _for_loop_idx or arrays of ui ids, even if the script
+never uses them. DeadCode finds functions, reachable from callbacks,
+and removes:
+- functions, which are never called from callbacks (or from called
+    functions)
+- declarations of variables and arrays, which are not referenced by
+    any other statement (including make_persistent() and
+    read_persistent_var() calls). Names, used only by removed
+    declarations (e.g. "declare %arr[$size]") are removed too
+
+Assignments are never removed, so every variable, which is assigned,
+is kept. Declarations of ui controls are never removed.
+
+DeadStores is not used by optimization levels and has to be added
+explicitly. In addition to unreachable functions it removes variables,
+which are never read, with all assignments to them with values of pure
+expressions (see BuiltInFunc.pure). Variable is read if it is used by
+any statement, except the assignments to it and its declaration.
+make_persistent() and read_persistent_var() are reads, as the value of
+persistent variable is saved. Assignments with impure values (e.g.
+"$id := play_note(...)") are kept with the declarations of their
+variables.
+
+Example:
+script = kScript('out.txt', passes=[DeadCode()])
+script = kScript('out.txt', passes=[DeadStores()])
+'''
+import re
+from collections import Counter
+
+from ir import Assign
+from ir import Call
+from ir import CallFunction
+from ir import Declare
+from ir import FuncCall
+from ir import Index
+from ir import Name
+from ir import Raw
+
+from cse import is_pure
+
+
+_name_re = re.compile(r'[$%!?~@][\w\x00]+')
+_word_re = re.compile(r'[A-Za-z_][\w\x00]*')
+
+
+def _pure(expr):
+    '''True if expression does not have side effects'''
+    return all(node.name == 'get_ui_id' for node in expr.walk()
+               if isinstance(node, FuncCall) and not is_pure(node))
+
+
+class DeadCode:
+    '''optimization pass (see module doc).
+    After the run declarations is the list of removed variables,
+    functions is the list of removed functions and removed is the
+    count of all removed statements'''
+
+    name = 'dce'
+
+    def __init__(self) -> None:
+        self.declarations = list()
+        self.functions = list()
+        self.removed = 0
+
+    def __call__(self, program):
+        self._functions = {block.name: block
+                           for block in program.functions()}
+        called = set()
+        pending = list(program.callbacks())
+        while pending:
+            block = pending.pop()
+            for stmt in block.statements():
+                for name in self._called(stmt):
+                    if name not in called:
+                        called.add(name)
+                        pending.append(self._functions[name])
+        self.functions = [name for name in self._functions
+                          if name not in called]
+        program.items[:] = [
+            item for item in program.items
+            if getattr(item, 'kind', None) != 'function' or
+            item.name in called]
+        self.removed = 0
+        dead = self._dead(program)
+        self.declarations = [stmt.name for stmt in program.statements()
+                             if isinstance(stmt, Declare) and
+                             stmt.name in dead]
+        for block in program.blocks:
+            self._sweep(block.body, dead)
+
+    def _dead(self, program):
+        '''returns set of declared names, which are not referenced'''
+        # {name: count of references outside of its declarations}
+        refs = Counter()
+        declarations = dict()
+        for block in program.callbacks():
+            refs.update(_name_re.findall(block.name))
+        for stmt in program.statements():
+            used = self._used(stmt)
+            if isinstance(stmt, Declare):
+                declarations.setdefault(stmt.name, list()).append(stmt)
+                used = [name for name in used if name != stmt.name]
+            refs.update(used)
+        kept = {name for name, stmts in declarations.items()
+                if any(self._is_control(stmt) for stmt in stmts)}
+        pending = [name for name in declarations
+                   if not refs[name] and name not in kept]
+        dead = set()
+        while pending:
+            name = pending.pop()
+            dead.add(name)
+            for stmt in declarations[name]:
+                for used in self._used(stmt):
+                    if used == name:
+                        continue
+                    refs[used] -= 1
+                    if not refs[used] and used in declarations \
+                            and used not in kept and used not in dead:
+                        pending.append(used)
+        return dead
+
+    def _removed(self, stmt, dead):
+        '''True if statement has to be removed'''
+        return isinstance(stmt, Declare) and stmt.name in dead
+
+    @staticmethod
+    def _is_control(stmt):
+        return stmt.line().split()[1].startswith('ui_')
+
+    def _called(self, stmt):
+        '''returns names of functions, called by stmt'''
+        if isinstance(stmt, CallFunction):
+            names = stmt.name.split()[:1]
+        elif isinstance(stmt, Call) and isinstance(stmt.expr, Name):
+            names = [stmt.expr.name]
+        elif isinstance(stmt, Raw):
+            names = _word_re.findall(stmt.line())
+        else:
+            return []
+        return [name for name in names if name in self._functions]
+
+    @staticmethod
+    def _used(stmt):
+        '''returns names of variables, used by stmt'''
+        if isinstance(stmt, (Raw, Declare)):
+            line = stmt.line()
+            if line.startswith('{'):
+                return []
+            return _name_re.findall(line)
+        return [node.name for expr in stmt.exprs() for node in expr.walk()
+                if isinstance(node, (Name, Index))]
+
+    def _sweep(self, body, dead):
+        out = list()
+        for stmt in body:
+            if self._removed(stmt, dead):
+                self.removed += 1
+                continue
+            for nested in stmt.bodies():
+                self._sweep(nested, dead)
+            out.append(stmt)
+        body[:] = out
+
+
+class DeadStores(DeadCode):
+    '''optimization pass, which removes variables, which are
+    never read, with assignments to them (see module doc)'''
+
+    name = 'dse'
+
+    def _dead(self, program):
+        self._declared = {stmt.name for stmt in program.statements()
+                          if isinstance(stmt, Declare)}
+        self._live = set()
+        # {variable: list of sets of names, used by its definitions}
+        self._deferred = dict()
+        for block in program.callbacks():
+            self._mark(_name_re.findall(block.name))
+        for stmt in program.statements():
+            used = self._used(stmt)
+            target = self._defined(stmt)
+            if target is None or target in self._live:
+                self._mark(used)
+            else:
+                self._deferred.setdefault(target, list()).append(used)
+        return self._declared - self._live
+
+    def _removed(self, stmt, dead):
+        return self._defined(stmt) in dead
+
+    def _mark(self, names):
+        stack = [names]
+        while stack:
+            for name in stack.pop():
+                if name in self._live:
+                    continue
+                self._live.add(name)
+                stack.extend(self._deferred.pop(name, ()))
+
+    def _defined(self, stmt):
+        '''returns variable, if stmt is only its definition, or None'''
+        if isinstance(stmt, Declare):
+            if self._is_control(stmt):
+                return None
+            return stmt.name
+        if not isinstance(stmt, Assign):
+            return None
+        target = stmt.target
+        if not isinstance(target, (Name, Index)) or \
+                not all(_pure(expr) for expr in stmt.exprs()):
+            return None
+        name = target.name
+        return name if name in self._declared else None
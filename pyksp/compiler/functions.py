@@ -12,6 +12,9 @@ from abstract import KSP
 from abstract import Output
 from abstract import SingletonMeta
 from abstract import KspObject
+from context import ContextAttr
+from context import ContextInstanceAttr
+from report import measure
 
 from base_types import KspIntVar
 from base_types import KspStrVar
@@ -307,29 +310,77 @@ class FuncArgs(KSP):
         return f_self, maped, outs
 
 
+class KspRecursionError(Exception):
+    '''raised on recursive call of functions.
+    path is the list of functions from the first call of the function
+    to its recursive call'''
+
+    def __init__(self, path: list):
+        self.path = path
+        super().__init__('recursive call detected: ' +
+                         ' -> '.join(func.name() for func in path))
+
+
 class FuncCallsStack:
-    '''used for sorting functions during generating their executables'''
-    stack = list()
+    '''stack of functions, which bodies are executed.
+    used for collecting calls between functions, which are sorted
+    during generating their executables'''
+    stack = ContextAttr(factory=list)
 
     @staticmethod
-    def append(seq: set):
-        '''puts set to stack.
-        later usage of put method will put functions
-        to every set of stack items'''
-        FuncCallsStack.stack.append(seq)
+    def append(func):
+        '''puts function to stack.
+        raises KspRecursionError if it is already there'''
+        stack = FuncCallsStack.stack
+        if func in stack:
+            raise KspRecursionError(stack[stack.index(func):] + [func])
+        stack.append(func)
 
     @staticmethod
     def put(func):
-        '''puts function to every stack item'''
-        for item in FuncCallsStack.stack:
-            item.add(func)
+        '''adds func to the callees of the last function in stack'''
+        if FuncCallsStack.stack:
+            FuncCallsStack.stack[-1]._calls[func] = None
 
     @staticmethod
     def pop():
-        '''returns last item in stack and removes it'''
+        '''removes the last function from stack'''
         FuncCallsStack.stack.pop()
 
 
+def sort_functions(functions: list) -> list:
+    '''returns functions with their callees, sorted, so every
+    function is placed after the functions, it calls.
+    Functions are visited in the passed order by depth-first search,
+    so it takes O(functions + calls).
+    raises KspRecursionError with the path of the first found cycle'''
+    out = list()
+    # function: False while it is in the path, True when sorted
+    visited = dict()
+    for root in functions:
+        if root in visited:
+            continue
+        visited[root] = False
+        path = [root]
+        callees = [iter(root._calls)]
+        while callees:
+            for callee in callees[-1]:
+                if callee not in visited:
+                    visited[callee] = False
+                    path.append(callee)
+                    callees.append(iter(callee._calls))
+                    break
+                if visited[callee] is False:
+                    raise KspRecursionError(
+                        path[path.index(callee):] + [callee])
+            else:
+                callees.pop()
+                func = path.pop()
+                visited[func] = True
+                out.append(func)
+    return out
+
+
 class FuncStack(metaclass=SingletonMeta):
     '''declares MultiStack object with name "functions" if not declared
     yet. can be used as descriptor'''
@@ -347,9 +398,16 @@ class FuncStack(metaclass=SingletonMeta):
 
 
 class Function(KspObject):
-    '''keeps function, passed as argument of @foo decorator'''
-    _functions = dict()
-    _sored = False
+    '''keeps function, passed as argument of @foo decorator.
+    Functions are registered in the current CompileContext when
+    they are decorated and when they are called, so every rebuild
+    of the script in new context starts with the empty registry'''
+    _functions = ContextAttr(factory=dict)
+    _sored = ContextAttr(False)
+    _invocations = ContextAttr(0)
+    _cashed_args = ContextInstanceAttr(lambda self: None)
+    _called = ContextInstanceAttr(lambda self: False)
+    _calls = ContextInstanceAttr(lambda self: dict())
 
     def __init__(self, func):
         check = self._check_func(func)
@@ -361,7 +419,7 @@ class Function(KspObject):
         self.__args = FuncArgs(self._func)
         self._cashed_args = None
         self._called = False
-        self._call_stack = set()
+        self._calls = dict()
 
     @property
     def called(self):
@@ -417,14 +475,25 @@ class Function(KspObject):
         name = re.sub(r'\.', '__', name)
         return name
 
+    def register(self):
+        '''adds function to the registry of the current context'''
+        self._functions.setdefault(self._get_key(self._func), self)
+
     def _generate_init(self):
         '''raises RuntimeError'''
         raise RuntimeError('can not generate init')
 
-    def _generate_executable(self):
+    @staticmethod
+    def invocations():
+        '''returns count of not inline calls of all functions'''
+        return Function._invocations
+
+    def _generate_executable(self, cache=None):
         '''invocates once per all Function objects
         returns list of lines with sorted bodies of all
-        functions, that were invocated without inline arg'''
+        functions, that were invocated without inline arg
+        if cache (CompileCache) is passed, unchanged bodies are
+        taken from it'''
         if not self.called:
             return []
         cls = self.__class__
@@ -434,26 +503,19 @@ class Function(KspObject):
         # with the same keys as in Function._function
         inits = dict()
         for key, func in cls._functions.items():
-            inits[key] = func._generate_ex_proxy()
-
-        # sorting of functions
-        cls._sored = list()
-        for key in Function._functions.keys():
-            instance = Function._functions[key]
-            if not instance.called:
-                continue
-            if len(instance._call_stack) == 0:
-                cls._sored.append(instance)
+            if not func.called:
+                inits[key] = []
                 continue
-            if instance in instance._call_stack:
-                raise Exception('recursion detected inside' +
-                                f'{instance.name()}')
-            for func in instance._call_stack:
-                if func not in cls._sored:
-                    cls._sored.append(func)
-                    Function._functions[key]
-                continue
-            cls._sored.append(instance)
+            with measure('function', func._func.__qualname__) as stats:
+                if cache is None:
+                    inits[key] = func._generate_ex_proxy()
+                else:
+                    inits[key] = cache.function_body(func)
+                stats.add_lines(len(inits[key]))
+
+        # callees are placed before callers
+        cls._sored = sort_functions(
+            [func for func in cls._functions.values() if func.called])
 
         # generating executable block
         out = list()
@@ -480,6 +542,7 @@ class Function(KspObject):
         otpt.blocked = False
 
         FunctionCallback.open()
+        FuncCallsStack.append(self)
         otpt.set(out)
         otpt.put(f'function {self.name()}')
 
@@ -487,6 +550,7 @@ class Function(KspObject):
 
         otpt.put('end function')
         Output().release()
+        FuncCallsStack.pop()
         FunctionCallback.close()
 
         otpt.blocked = True
@@ -553,7 +617,7 @@ def func(f):
     or want to call them without placing to the code entirely.
     '''
 
-    _func_stack = FuncStack()
+    FuncStack()
     _f_obj = Function(f)
 
     fargs = _f_obj.args
@@ -565,7 +629,7 @@ def func(f):
         args = list()
         for arg, val in odict.items():
             args.append(val)
-        args = _func_stack.push(*args)
+        args = FuncStack().push(*args)
 
         passed = dict()
         for arg, name in zip(args, odict):
@@ -575,9 +639,11 @@ def func(f):
             passed['self'] = f_self
         blocked = None
         if not inline and not KSP.in_init():
+            _f_obj.register()
             FuncCallsStack.put(_f_obj)
-            FuncCallsStack.append(_f_obj._call_stack)
+            FuncCallsStack.append(_f_obj)
             _f_obj.called = True
+            Function._invocations += 1
             Output().put(f'call {_f_obj.name()}')
             FunctionCallback.open()
             if not Output().blocked:
@@ -585,8 +651,6 @@ def func(f):
                 blocked = True
         out = f(**passed)
         if not inline and not KSP.in_init():
-            if _f_obj in _f_obj._call_stack:
-                raise Exception(f'recursive call of {_f_obj} detected')
             FuncCallsStack.pop()
             FunctionCallback.close()
         if blocked:
@@ -594,6 +658,6 @@ def func(f):
         if outs:
             for name, val in outs.items():
                 maped[name] <<= passed[name]
-        _func_stack.pop()
+        FuncStack().pop()
         return out
     return wrapper
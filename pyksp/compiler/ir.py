@@ -0,0 +1,785 @@
+'''intermediate representation of the generated KSP code.
+
+Lines, generated by kScript are lifted to the tree of statements and
+expressions, collected per callback and function, so optimization
+passes can analyze and rewrite the code before the final rendering.
+
+Statements keep the source line they were built from and are rendered
+back to it, until any of their fields is reassigned, so the code,
+untouched by passes, is emitted as is. Expressions are immutable and
+compared by structure: passes build new expressions instead of
+changing existing ones.
+
+Example of pass:
+def drop_messages(program):
+    for block in program.blocks:
+        block.body[:] = [s for s in block.body if not (
+            isinstance(s, Call) and s.expr.name == 'message')]
+
+script = kScript('out.txt', passes=[drop_messages])
+'''
+import re
+
+from report import measure
+
+
+class KspIRError(Exception):
+    '''raised on the code, which can not be lifted to IR'''
+    pass
+
+
+_token_re = re.compile(r'''\s*(?:
+    (?P<str>"[^"]*")
+    |(?P<num>\d[\w.]*)
+    |(?P<op>\.(?:and|or|xor|not)\.|<=|>=|[-+*/&=#<>(),\[\]])
+    |(?P<name>[$%!?~@]?[A-Za-z_\x00][\w\x00]*)
+    )''', re.X)
+
+# lower priority binds tighter, as AstOperator.priority of base_types:
+# comparisons, then "and", then "or"
+_binary = {'*': 3, '/': 3, 'mod': 3,
+           '+': 4, '-': 4, '&': 4,
+           '.and.': 6, '.or.': 6, '.xor.': 6,
+           '=': 7, '#': 7, '<': 7, '>': 7, '<=': 7, '>=': 7,
+           'and': 8, 'or': 9, 'xor': 9}
+_unary = {'-': 2, '.not.': 2, 'not': 7.5}
+
+
+class Expr:
+    '''base of immutable expression nodes.
+    Nodes are equal if they have the same type and fields.'''
+
+    __slots__ = ()
+    _fields = ()
+    priority = 0
+
+    def __init__(self, *args):
+        for field, arg in zip(self._fields, args):
+            object.__setattr__(self, field, arg)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def _key(self):
+        return (type(self),) + tuple(getattr(self, f) for f in self._fields)
+
+    def __eq__(self, other):
+        return isinstance(other, Expr) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        args = ', '.join(repr(getattr(self, f)) for f in self._fields)
+        return f'{type(self).__name__}({args})'
+
+    def __str__(self):
+        return self.render()
+
+    def children(self):
+        '''returns tuple of nested expressions'''
+        return ()
+
+    def rebuild(self, children):
+        '''returns copy of node with children replaced'''
+        return self
+
+    def walk(self):
+        '''yields node and all nested nodes'''
+        yield self
+        for child in self.children():
+            yield from child.walk()
+
+    def map(self, func):
+        '''returns expression, where every node (from leaves to the
+        root) is replaced by result of func(node)'''
+        children = self.children()
+        if children:
+            new = tuple(child.map(func) for child in children)
+            if any(a is not b for a, b in zip(new, children)):
+                return func(self.rebuild(new))
+        return func(self)
+
+    def render(self):
+        raise NotImplementedError
+
+
+class Name(Expr):
+    '''variable or constant name with its prefix'''
+    __slots__ = _fields = ('name',)
+
+    def render(self):
+        return self.name
+
+
+class Num(Expr):
+    '''number literal. text is the literal as it appears in the code'''
+    __slots__ = _fields = ('text',)
+
+    @property
+    def priority(self):
+        return 2 if self.text.startswith('-') else 0
+
+    @property
+    def value(self):
+        text = self.text
+        if text.lower().endswith('h'):
+            return int(text[:-1], 16)
+        if '.' in text or 'e' in text.lower():
+            return float(text)
+        return int(text)
+
+    @classmethod
+    def of(cls, value):
+        return cls(str(value))
+
+    def render(self):
+        return self.text
+
+
+class Str(Expr):
+    '''string literal in quotes'''
+    __slots__ = _fields = ('text',)
+
+    def render(self):
+        return self.text
+
+
+class Index(Expr):
+    '''item of array: name[index]'''
+    __slots__ = _fields = ('name', 'index')
+
+    def children(self):
+        return (self.index,)
+
+    def rebuild(self, children):
+        return Index(self.name, children[0])
+
+    def render(self):
+        return f'{self.name}[{self.index.render()}]'
+
+
+class FuncCall(Expr):
+    '''call of built-in function: name(args)'''
+    __slots__ = _fields = ('name', 'args')
+
+    def children(self):
+        return self.args
+
+    def rebuild(self, children):
+        return FuncCall(self.name, tuple(children))
+
+    def render(self):
+        args = ', '.join(arg.render() for arg in self.args)
+        return f'{self.name}({args})'
+
+
+class UnaryOp(Expr):
+    __slots__ = _fields = ('op', 'operand')
+
+    @property
+    def priority(self):
+        return _unary[self.op]
+
+    def children(self):
+        return (self.operand,)
+
+    def rebuild(self, children):
+        return UnaryOp(self.op, children[0])
+
+    def render(self):
+        operand = self.operand.render()
+        if self.operand.priority >= self.priority:
+            operand = f'({operand})'
+        if self.op == 'not':
+            return f'not {operand}'
+        return f'{self.op}{operand}'
+
+
+class BinOp(Expr):
+    __slots__ = _fields = ('op', 'left', 'right')
+
+    @property
+    def priority(self):
+        return _binary[self.op]
+
+    def children(self):
+        return (self.left, self.right)
+
+    def rebuild(self, children):
+        return BinOp(self.op, *children)
+
+    def render(self):
+        left = self.left.render()
+        right = self.right.render()
+        if self.left.priority > self.priority:
+            left = f'({left})'
+        if self.right.priority >= self.priority:
+            right = f'({right})'
+        return f'{left} {self.op} {right}'
+
+
+def _tokenize(text):
+    tokens = list()
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _token_re.match(text, pos)
+        if not match or match.end() == pos:
+            raise KspIRError(f'can not parse "{text}" at {pos}')
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'name' and value in _binary or value == 'not':
+            kind = 'op'
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return (None, None)
+
+    def next(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        if self.next()[1] != value:
+            raise KspIRError(f'"{value}" expected in "{self.text}"')
+
+    def parse(self):
+        expr = self.expr(max(_binary.values()))
+        if self.pos != len(self.tokens):
+            raise KspIRError(f'can not parse "{self.text}"')
+        return expr
+
+    def expr(self, limit):
+        left = self.unary()
+        while True:
+            kind, value = self.peek()
+            if kind != 'op' or value not in _binary \
+                    or _binary[value] > limit:
+                return left
+            self.next()
+            right = self.expr(_binary[value] - 1)
+            left = BinOp(value, left, right)
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == 'op' and value in _unary:
+            self.next()
+            if value == 'not':
+                return UnaryOp(value, self.expr(7))
+            return UnaryOp(value, self.unary())
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.next()
+        if kind == 'num':
+            return Num(value)
+        if kind == 'str':
+            return Str(value)
+        if value == '(':
+            expr = self.expr(max(_binary.values()))
+            self.expect(')')
+            return expr
+        if kind != 'name':
+            raise KspIRError(f'unexpected "{value}" in "{self.text}"')
+        following = self.peek()[1]
+        if following == '(':
+            self.next()
+            args = list()
+            if self.peek()[1] != ')':
+                args.append(self.expr(max(_binary.values())))
+                while self.peek()[1] == ',':
+                    self.next()
+                    args.append(self.expr(max(_binary.values())))
+            self.expect(')')
+            return FuncCall(value, tuple(args))
+        if following == '[':
+            self.next()
+            index = self.expr(max(_binary.values()))
+            self.expect(']')
+            return Index(value, index)
+        return Name(value)
+
+
+def parse_expr(text: str) -> Expr:
+    '''returns expression, parsed from KSP text.
+    raises KspIRError if text is not an expression'''
+    return _Parser(text).parse()
+
+
+class Stmt:
+    '''base of statements.
+
+    text is the source line, the statement is rendered to. It is
+    reset by reassigning of any other attribute, so the statement is
+    rendered from its fields after it is changed by a pass.'''
+
+    text = None
+
+    def __setattr__(self, name, value):
+        if name != 'text':
+            object.__setattr__(self, 'text', None)
+        object.__setattr__(self, name, value)
+
+    def line(self):
+        '''returns the first (or the only) line of statement'''
+        if self.text is not None:
+            return self.text
+        return self._line()
+
+    def _line(self):
+        raise NotImplementedError
+
+    def bodies(self):
+        '''returns lists of nested statements'''
+        return []
+
+    def exprs(self):
+        '''returns expressions of the statement (not nested ones)'''
+        return ()
+
+    def render(self):
+        '''yields lines of the statement'''
+        yield self.line()
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.line()!r})'
+
+
+class Raw(Stmt):
+    '''line, which is not recognized as other statement'''
+
+    def __init__(self, text):
+        self.text = text
+
+    def _line(self):
+        return ''
+
+
+class Declare(Stmt):
+    '''declaration of variable, array or control.
+    name is the declared name with its prefix, the rest of
+    declaration is kept as text'''
+    _name_re = re.compile(r'declare\s+(?:\w+\s+)*?([$%!?~@][\w\x00]+)')
+
+    def __init__(self, text):
+        match = self._name_re.match(text)
+        if not match:
+            raise KspIRError(f'can not parse "{text}"')
+        self.name = match.group(1)
+        self._source = text
+        self._span = match.span(1)
+        self.text = text
+
+    def _line(self):
+        start, end = self._span
+        return self._source[:start] + self.name + self._source[end:]
+
+
+class Assign(Stmt):
+    '''target := value'''
+
+    def __init__(self, target, value, text=None):
+        self.target = target
+        self.value = value
+        self.text = text
+
+    def exprs(self):
+        return (self.target, self.value)
+
+    def _line(self):
+        return f'{self.target.render()} := {self.value.render()}'
+
+
+class Call(Stmt):
+    '''call of built-in function as statement (without return value
+    used). expr is FuncCall or Name (for functions without args)'''
+
+    def __init__(self, expr, text=None):
+        self.expr = expr
+        self.text = text
+
+    def exprs(self):
+        return (self.expr,)
+
+    def _line(self):
+        return self.expr.render()
+
+
+class CallFunction(Stmt):
+    '''call of user function: call name'''
+
+    def __init__(self, name, text=None):
+        self.name = name
+        self.text = text
+
+    def _line(self):
+        return f'call {self.name}'
+
+
+class If(Stmt):
+    '''if(cond) body [else orelse] end if.
+    orelse is None if there is no else branch'''
+
+    def __init__(self, cond, body=None, orelse=None, text=None):
+        self.cond = cond
+        self.body = body if body is not None else list()
+        self.orelse = orelse
+        self.text = text
+
+    def bodies(self):
+        if self.orelse is None:
+            return [self.body]
+        return [self.body, self.orelse]
+
+    def exprs(self):
+        return (self.cond,)
+
+    def _line(self):
+        return f'if({self.cond.render()})'
+
+    def render(self):
+        yield self.line()
+        yield from render_block(self.body)
+        if self.orelse is not None:
+            yield 'else'
+            yield from render_block(self.orelse)
+        yield 'end if'
+
+
+class While(Stmt):
+    '''while(cond) body end while'''
+
+    def __init__(self, cond, body=None, text=None):
+        self.cond = cond
+        self.body = body if body is not None else list()
+        self.text = text
+
+    def bodies(self):
+        return [self.body]
+
+    def exprs(self):
+        return (self.cond,)
+
+    def _line(self):
+        return f'while({self.cond.render()})'
+
+    def render(self):
+        yield self.line()
+        yield from render_block(self.body)
+        yield 'end while'
+
+
+class Case(Stmt):
+    '''case(value) body. value is None if case is not parsed
+    (e.g. "case 1 to 5"), then only text can be used'''
+
+    def __init__(self, value, body=None, text=None):
+        self.value = value
+        self.body = body if body is not None else list()
+        self.text = text
+
+    def bodies(self):
+        return [self.body]
+
+    def exprs(self):
+        return (self.value,) if self.value is not None else ()
+
+    def _line(self):
+        return f'case({self.value.render()})'
+
+    def render(self):
+        yield self.line()
+        yield from render_block(self.body)
+
+
+class Select(Stmt):
+    '''select(expr) cases end select'''
+
+    def __init__(self, expr, cases=None, text=None):
+        self.expr = expr
+        self.cases = cases if cases is not None else list()
+        self.text = text
+
+    def bodies(self):
+        return [case.body for case in self.cases]
+
+    def exprs(self):
+        return (self.expr,)
+
+    def _line(self):
+        return f'select({self.expr.render()})'
+
+    def render(self):
+        yield self.line()
+        for case in self.cases:
+            yield from case.render()
+        yield 'end select'
+
+
+class Block:
+    '''callback or function with its body.
+    kind is "callback" or "function", name is the header without
+    "on " or "function " (e.g. "init", "ui_control($control0)")'''
+
+    _footers = {'callback': 'end on', 'function': 'end function'}
+    _prefixes = {'callback': 'on ', 'function': 'function '}
+
+    def __init__(self, kind, name, body=None):
+        self.kind = kind
+        self.name = name
+        self.body = body if body is not None else list()
+
+    @property
+    def header(self):
+        return self._prefixes[self.kind] + self.name
+
+    def render(self):
+        yield self.header
+        yield from render_block(self.body)
+        yield self._footers[self.kind]
+
+    def statements(self):
+        '''yields all statements of the block with nested ones'''
+        return walk(self.body)
+
+    def __repr__(self):
+        return f'Block({self.header!r}, {len(self.body)} statements)'
+
+
+class Program:
+    '''the whole script: list of blocks and top-level raw lines
+    (e.g. comments)'''
+
+    def __init__(self, items=None):
+        self.items = items if items is not None else list()
+
+    @property
+    def blocks(self):
+        return [item for item in self.items if isinstance(item, Block)]
+
+    def callbacks(self):
+        return [b for b in self.blocks if b.kind == 'callback']
+
+    def functions(self):
+        return [b for b in self.blocks if b.kind == 'function']
+
+    def block(self, header):
+        '''returns block by its header ("on init", "function foo")
+        or None'''
+        for block in self.blocks:
+            if block.header == header:
+                return block
+        return None
+
+    def statements(self):
+        '''yields all statements of all blocks'''
+        for block in self.blocks:
+            yield from block.statements()
+
+    def render(self):
+        '''yields lines of the code'''
+        for item in self.items:
+            yield from item.render()
+
+
+def walk(stmts):
+    '''yields statements of list with all nested ones (parents first)'''
+    for stmt in stmts:
+        yield stmt
+        for body in stmt.bodies():
+            yield from walk(body)
+
+
+def render_block(stmts):
+    for stmt in stmts:
+        yield from stmt.render()
+
+
+_assign_re = re.compile(r'([^":]+?)\s*:=\s*(.*)$')
+_statements_re = re.compile(r'(if|while|select|case)\s*\((.*)\)$')
+
+
+def build_statement(line: str) -> Stmt:
+    '''returns simple statement of line.
+    Lines, which can not be parsed, are returned as Raw'''
+    try:
+        if line.startswith('declare '):
+            return Declare(line)
+        if line.startswith('call '):
+            return CallFunction(line[5:].strip(), line)
+        match = _assign_re.match(line)
+        if match:
+            return Assign(parse_expr(match.group(1)),
+                          parse_expr(match.group(2)), line)
+        expr = parse_expr(line)
+        if isinstance(expr, (FuncCall, Name)):
+            return Call(expr, line)
+    except KspIRError:
+        pass
+    return Raw(line)
+
+
+def _parse_or_none(text):
+    try:
+        return parse_expr(text)
+    except KspIRError:
+        return None
+
+
+def build(lines) -> Program:
+    '''lifts lines of the code to Program.
+    raises KspIRError on unbalanced blocks'''
+    program = Program()
+    # stack of (owner, list the next statement is appended to)
+    stack = [(program, program.items)]
+    for line in lines:
+        line = line.strip()
+        owner, current = stack[-1]
+        if not line:
+            if owner is program:
+                current.append(Raw(line))
+            continue
+        keyword = line.split(None, 1)[0]
+        compound = _statements_re.match(line)
+        if line.startswith('on ') and owner is program:
+            block = Block('callback', line[3:].strip())
+            current.append(block)
+            stack.append((block, block.body))
+        elif line.startswith('function ') and owner is program:
+            block = Block('function', line[9:].strip())
+            current.append(block)
+            stack.append((block, block.body))
+        elif keyword == 'end':
+            _close(stack, line)
+        elif line == 'else':
+            if not isinstance(owner, If) or owner.orelse is not None:
+                raise KspIRError(f'unexpected "{line}"')
+            text = owner.text
+            owner.orelse = list()
+            owner.text = text
+            stack[-1] = (owner, owner.orelse)
+        elif compound and compound.group(1) == 'case' or \
+                keyword == 'case':
+            if isinstance(owner, Case):
+                stack.pop()
+                owner = stack[-1][0]
+            if not isinstance(owner, Select):
+                raise KspIRError(f'unexpected "{line}"')
+            value = _parse_or_none(compound.group(2)) if compound \
+                else None
+            case = Case(value, text=line)
+            owner.cases.append(case)
+            stack.append((case, case.body))
+        elif compound and owner is not program:
+            keyword, inner = compound.groups()
+            cond = _parse_or_none(inner)
+            if cond is None:
+                raise KspIRError(f'can not parse "{line}"')
+            if keyword == 'if':
+                stmt = If(cond, text=line)
+            elif keyword == 'while':
+                stmt = While(cond, text=line)
+            else:
+                stmt = Select(cond, text=line)
+            current.append(stmt)
+            stack.append((stmt, stmt.body if keyword != 'select'
+                          else stmt.cases))
+        elif owner is program:
+            current.append(Raw(line))
+        else:
+            current.append(build_statement(line))
+    if len(stack) > 1:
+        raise KspIRError(f'"{stack[-1][0]!r}" is not closed')
+    return program
+
+
+_closing = {'end on': Block, 'end function': Block, 'end if': If,
+            'end while': While, 'end select': Select}
+
+
+def _close(stack, line):
+    line = ' '.join(line.split())
+    if line not in _closing:
+        raise KspIRError(f'unexpected "{line}"')
+    if line == 'end select' and isinstance(stack[-1][0], Case):
+        stack.pop()
+    owner = stack[-1][0]
+    if not isinstance(owner, _closing[line]) or isinstance(owner, Block) \
+            and owner._footers[owner.kind] != line:
+        raise KspIRError(f'unexpected "{line}"')
+    stack.pop()
+
+
+class PassManager:
+    '''ordered pipeline of optimization passes over Program.
+
+    Pass is callable, which takes Program and changes it in place
+    (or returns the new Program). Every pass is measured as phase
+    "pass <name>" of the active CompileReport.
+
+    Without passes the code is not lifted to IR at all.'''
+
+    def __init__(self, passes=None) -> None:
+        self._passes = list()
+        for p in passes or ():
+            self.add(p)
+
+    def add(self, p, name: str=None):
+        '''appends pass to the pipeline. name is the name of pass
+        (p.name or p.__name__ by default)'''
+        if name is None:
+            name = getattr(p, 'name', None) or p.__name__
+        self._passes.append((name, p))
+
+    def remove(self, name: str):
+        '''removes pass by name'''
+        self._passes = [(n, p) for n, p in self._passes if n != name]
+
+    def names(self):
+        return [name for name, _ in self._passes]
+
+    def extended(self, passes):
+        '''returns new PassManager with own passes and passes
+        appended'''
+        manager = PassManager(passes)
+        manager._passes[:0] = self._passes
+        return manager
+
+    def __len__(self):
+        return len(self._passes)
+
+    def run(self, program: Program) -> Program:
+        '''runs all passes over program, returns the result'''
+        for name, p in self._passes:
+            with measure(f'pass {name}'):
+                result = p(program)
+            if result is not None:
+                program = result
+        return program
+
+    def process(self, lines):
+        '''lifts lines to IR, runs passes and yields rendered lines.
+        Without passes returns lines untouched'''
+        if not self._passes:
+            return lines
+        return self._process(lines)
+
+    def _process(self, lines):
+        with measure('building IR'):
+            program = build(lines)
+        program = self.run(program)
+        yield from program.render()
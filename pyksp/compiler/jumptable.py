@@ -0,0 +1,173 @@
+'''jump table lowering of select statements.
+
+select, which every case assigns int constant to the same variable,
+e.g. note to articulation map:
+
+select($EVENT_NOTE)
+case(36)
+$art := 2
+case(37)
+$art := 0
+case(38)
+$art := 5
+...
+end select
+
+is replaced by one read of int array, declared in "on init" with
+results of cases ("%_jt0", "%_jt1", ...):
+
+if($EVENT_NOTE >= 36 and $EVENT_NOTE <= 39)
+$art := %_jt0[$EVENT_NOTE - 36]
+end if
+
+Select is lowered if it has at least min_cases cases and the cases
+fill at least density of the range of values. Values, which are not
+in cases (and cases without statements) are filled by the value,
+which is not the result of any case, and assignment is made only if
+the read value is not the filler. Selects with other statements in
+cases (calls, several assignments, nested code), not parsed cases
+(e.g. "case 1 to 5"), repeated values or not stable expression
+(see cse.is_stable) are left as is. Equal tables are shared.
+
+Example:
+script = kScript('out.txt', passes=[JumpTable(min_cases=8)])
+'''
+from ir import Assign
+from ir import BinOp
+from ir import Declare
+from ir import If
+from ir import Index
+from ir import Name
+from ir import Num
+from ir import Select
+from ir import UnaryOp
+
+from cse import is_stable
+
+
+def int_literal(expr):
+    '''returns value of int literal (negative including) or None'''
+    if isinstance(expr, UnaryOp) and expr.op == '-':
+        value = int_literal(expr.operand)
+        return None if value is None else -value
+    if isinstance(expr, Num) and isinstance(expr.value, int):
+        return expr.value
+    return None
+
+
+class JumpTable:
+    '''optimization pass (see module doc).
+    tables is the dict of {name of declared array: its values}
+    of the last run, lowered is the count of replaced selects'''
+
+    name = 'jumptable'
+    prefix = '_jt'
+
+    def __init__(self, min_cases: int=4, density: float=0.5) -> None:
+        self.min_cases = min_cases
+        self.density = density
+        self.tables = dict()
+        self.lowered = 0
+
+    def __call__(self, program):
+        init = program.block('on init')
+        if init is None:
+            return
+        self.tables = dict()
+        self.lowered = 0
+        self._declared = {stmt.name for block in program.blocks
+                          for stmt in block.statements()
+                          if isinstance(stmt, Declare)}
+        # {values: name of table}
+        self._names = dict()
+        for block in program.blocks:
+            self._lower(block.body)
+        init.body[:0] = [Declare(
+            f'declare {name}[{len(table)}] := '
+            f'({", ".join(map(str, table))})')
+            for name, table in self.tables.items()]
+
+    def _lower(self, body):
+        for stmt in body:
+            for nested in stmt.bodies():
+                self._lower(nested)
+        for pos, stmt in enumerate(body):
+            if isinstance(stmt, Select):
+                replacement = self._match(stmt)
+                if replacement is not None:
+                    body[pos] = replacement
+                    self.lowered += 1
+
+    def _match(self, select):
+        '''returns statement to put instead of select or None'''
+        expr = select.expr
+        if not is_stable(expr):
+            return None
+        target = None
+        results = dict()
+        for case in select.cases:
+            value = int_literal(case.value) if case.value else None
+            if value is None or value in results:
+                return None
+            if not case.body:
+                results[value] = None
+                continue
+            if len(case.body) != 1 or \
+                    not isinstance(case.body[0], Assign):
+                return None
+            assign = case.body[0]
+            result = int_literal(assign.value)
+            if result is None or \
+                    (target is not None and assign.target != target):
+                return None
+            target = assign.target
+            results[value] = result
+        if target is None or not self._is_int(target):
+            return None
+        low, high = min(results), max(results)
+        if len(results) < self.min_cases or \
+                len(results) < (high - low + 1) * self.density:
+            return None
+        return self._build(expr, target, results, low, high)
+
+    @staticmethod
+    def _is_int(target):
+        return isinstance(target, (Name, Index)) and \
+            target.name[0] in '$%' and is_stable(target)
+
+    def _build(self, expr, target, results, low, high):
+        filled = [v for v in results.values() if v is not None]
+        filler = None
+        if len(filled) < high - low + 1:
+            filler = min(filled) - 1
+            if filler < -2 ** 31:
+                filler = max(filled) + 1
+        table = tuple(filler if results.get(value) is None
+                      else results[value]
+                      for value in range(low, high + 1))
+        name = self._table(table)
+        idx = expr
+        if low > 0:
+            idx = BinOp('-', expr, Num.of(low))
+        elif low < 0:
+            idx = BinOp('+', expr, Num.of(-low))
+        read = Index(name, idx)
+        stmt = Assign(target, read)
+        if filler is not None:
+            stmt = If(BinOp('#', read, Num.of(filler)), [stmt])
+        cond = BinOp('and', BinOp('>=', expr, Num.of(low)),
+                     BinOp('<=', expr, Num.of(high)))
+        return If(cond, [stmt])
+
+    def _table(self, values):
+        '''returns name of array with values'''
+        if values in self._names:
+            return self._names[values]
+        number = len(self._names)
+        while f'%{self.prefix}{number}' in self._declared:
+            number += 1
+        name = f'%{self.prefix}{number}'
+        self._declared.add(name)
+        self._names[values] = name
+        self.tables[name] = values
+        return name
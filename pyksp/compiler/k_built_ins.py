@@ -4,6 +4,7 @@ from functools import partialmethod
 import functools
 from inspect import signature
 from collections import OrderedDict
+from copy import copy
 # import re
 
 from typing import Tuple
@@ -14,7 +15,12 @@ import math
 # from abstract import KspObject
 from abstract import Output
 from abstract import KSP
+from abstract import reserve
 # from abstract import SingletonMeta
+from context import current_context
+from context import ContextAttr
+from context import ContextInstanceAttr
+from report import measure
 
 from base_types import KspVar
 from base_types import KspArray
@@ -52,7 +58,9 @@ class Callback(KSP):
 
     __callbacks = list()
     __current = None
-    __id = int()
+    __id = ContextAttr(0)
+    __lines = ContextInstanceAttr(lambda self: list())
+    __functions = ContextInstanceAttr(lambda self: list())
 
     def __init__(self, header: str, cb_type: 'bCallbackVar',
                  built_in_vars: Tuple[str]):
@@ -68,6 +76,11 @@ class Callback(KSP):
     def add_function(self, function):
         self.__functions.append(function)
 
+    @property
+    def functions(self):
+        '''returns tuple of functions, added to callback'''
+        return tuple(self.__functions)
+
     def open(self):
         Callback.__id += 1
         NI_CALLBACK_ID.set_value(Callback.__id)
@@ -110,12 +123,21 @@ class Callback(KSP):
         return out
 
     @staticmethod
-    def get_all_bodies():
+    def get_all_bodies(cache=None):
+        '''returns lines of all callbacks except of init.
+        if cache (CompileCache) is passed, unchanged bodies are
+        taken from it'''
         out = list()
         for cb in Callback.__callbacks:
             if cb is InitCallback:
                 continue
-            out.extend(cb.generate_body())
+            with measure('callback', cb._header) as stats:
+                if cache is None:
+                    lines = cb.generate_body()
+                else:
+                    lines = cache.callback_body(cb)
+                stats.add_lines(len(lines))
+            out.extend(lines)
         return out
 
     @staticmethod
@@ -146,6 +168,8 @@ class Control(KSP):
 
 
 class UiControlCallbackCl(Callback):
+    __controls = ContextInstanceAttr(lambda self: dict())
+    _last_control = ContextInstanceAttr(lambda self: None)
 
     def __init__(self, cb_type):
         super().__init__('ui_control', cb_type, ('control',))
@@ -176,6 +200,8 @@ class UiControlCallbackCl(Callback):
 
 
 class FunctionCallbackCl(Callback):
+    __root = ContextInstanceAttr(lambda self: None)
+    __levels = ContextInstanceAttr(lambda self: 0)
 
     def __init__(self):
         super().__init__('function', -1, tuple())
@@ -191,6 +217,7 @@ class FunctionCallbackCl(Callback):
             return
         self.__root = self.callback()
         self.__root.close(keep_type=True)
+        self.__levels = 1
         self.set_callback(self)
 
     def close(self):
@@ -214,8 +241,8 @@ class FunctionCallbackCl(Callback):
 
 class BuiltIn(KSP):
 
-    _id_count = int()
-    _instances = list()
+    _id_count = ContextAttr(0)
+    _instances = ContextAttr(factory=list)
 
     def __init__(self, callbacks=all_callbacks):
         self._id = BuiltIn._id_count
@@ -332,11 +359,26 @@ class BuiltInArrayReal(BuiltInArray, kArrReal):
 
 
 class BuiltInFunc(BuiltIn):
+    '''built-in function of KSP.
+
+    pure functions have no side effects, and their result depends
+    only on args and state of the engine, so repeated calls can be
+    replaced by the single one (see cse.py). They are marked with
+    class attribute pure = True'''
+
+    pure = False
+    # prefix of variable, which can hold the result
+    _result_prefix = None
+    # {name: result prefix} of all pure functions
+    _pure = dict()
 
     def __init__(self, name: str, callbacks=all_callbacks,
                  args: OrderedDict=None, def_ret=None,
                  no_parentesis=False):
         self._name = name
+        reserve(name)
+        if self.pure:
+            BuiltInFunc._pure[name] = self._result_prefix
         self._args = args
         self._def_ret = def_ret
         self._no_parentesis = no_parentesis
@@ -348,6 +390,8 @@ class BuiltInFunc(BuiltIn):
         native_val = val
         arg = self._args[key]
         if hasattr(val, 'get_value'):
+            if not self.is_simulated():
+                return native_val
             val = val.get_value()
         if arg is int:
             ref = (int, KspIntVar)
@@ -397,11 +441,12 @@ class BuiltInFunc(BuiltIn):
         return line
 
     def _build(self, line=None, args=None):
-        if not self._def_ret:
-            val = self.calculate(*args)
-        else:
-            val = self.calculate()
-        self._var._set_runtime(val)
+        if self.is_simulated():
+            if not self._def_ret:
+                val = self.calculate(*args)
+            else:
+                val = self.calculate()
+            self._var._set_runtime(val)
         if not line:
             line = f'{self._name}()'
         self._var._get_compiled = lambda self=self:\
@@ -411,12 +456,40 @@ class BuiltInFunc(BuiltIn):
             Output().put(line)
         return self._var
 
+    def _copy_var(self):
+        return copy(self._origin_var)
+
+    @property
+    def _var(self):
+        '''variable, returned by the function. Every CompileContext
+        gets its own copy'''
+        return BuiltInFunc.__var.__get__(self, None)
+
+    @_var.setter
+    def _var(self, var):
+        self._origin_var = var
+        BuiltInFunc.__var.__set__(self, var)
+
+    __var = ContextInstanceAttr(_copy_var)
+
     # @abstractmethod
     def calculate(self):
         return self._def_ret
 
+    @staticmethod
+    def is_pure(name: str) -> bool:
+        '''True if built-in function with name has no side effects'''
+        return name in BuiltInFunc._pure
+
+    @staticmethod
+    def result_prefix(name: str):
+        '''returns prefix of variable ("$", "~" or "@"), which can
+        hold result of pure function, or None'''
+        return BuiltInFunc._pure.get(name)
+
 
 class BuiltInFuncInt(BuiltInFunc):
+    _result_prefix = '$'
 
     def __init__(self, name: str, callbacks=all_callbacks,
                  args: OrderedDict=None, def_ret=None,
@@ -432,6 +505,7 @@ class BuiltInFuncInt(BuiltInFunc):
 
 
 class BuiltInFuncStr(BuiltInFunc):
+    _result_prefix = '@'
 
     def __init__(self, name: str, callbacks=all_callbacks,
                  args: OrderedDict=None, def_ret=None,
@@ -447,6 +521,7 @@ class BuiltInFuncStr(BuiltInFunc):
 
 
 class BuiltInFuncReal(BuiltInFunc):
+    _result_prefix = '~'
 
     def __init__(self, name: str, callbacks=all_callbacks,
                  args: OrderedDict=None, def_ret=None,
@@ -461,6 +536,12 @@ class BuiltInFuncReal(BuiltInFunc):
                           persist=False)
 
 
+# functions of KSP without BuiltInFunc objects
+for _name in ('abs', 'dec', 'inc', 'int', 'int_to_real', 'lsb', 'max',
+              'min', 'msb', 'random', 'real', 'real_to_int', 'sh_left',
+              'sh_right'):
+    reserve(_name)
+
 exit = BuiltInFuncInt('exit', no_parentesis=True,
                       def_ret=kNone()).__call__
 reset_ksp_timer = BuiltInFuncInt('reset_ksp_timer', no_parentesis=True,
@@ -670,6 +751,7 @@ NI_MATH_E.set_value(math.e)
 
 
 class Exp(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='exp',
@@ -688,6 +770,7 @@ exp = Exp().__call__
 
 
 class Log(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='log',
@@ -706,6 +789,7 @@ log = Log().__call__
 
 
 class Pow(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='pow',
@@ -727,6 +811,7 @@ kpow = Pow().__call__
 
 
 class Sqrt(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='sqrt',
@@ -745,6 +830,7 @@ sqrt = Sqrt().__call__
 
 
 class Ceil(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='ceil',
@@ -764,6 +850,7 @@ ceil = Ceil().__call__
 
 
 class Floor(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='floor',
@@ -783,6 +870,7 @@ floor = Floor().__call__
 
 
 class Round(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='round',
@@ -803,6 +891,7 @@ kround = Round().__call__
 
 
 class Cos(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='cos',
@@ -821,6 +910,7 @@ cos = Cos().__call__
 
 
 class Sin(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='sin',
@@ -839,6 +929,7 @@ sin = Sin().__call__
 
 
 class Tan(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='tan',
@@ -857,6 +948,7 @@ tan = Tan().__call__
 
 
 class Acos(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='acos',
@@ -875,6 +967,7 @@ acos = Acos().__call__
 
 
 class Asin(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='asin',
@@ -893,6 +986,7 @@ asin = Asin().__call__
 
 
 class Atan(BuiltInFuncReal):
+    pure = True
 
     def __init__(self):
         super().__init__(name='atan',
@@ -0,0 +1,83 @@
+'''wrapping of long KSP lines.
+
+Lines are split only between tokens outside of "string literals"
+and {comments}, and continued with "..." marker on the next line.
+Every line is tokenized by one regular expression in a single pass.
+'''
+import re
+from bisect import bisect_right
+
+
+# word is a run of string literals, comments and non-space characters.
+# KSP strings have no escape sequences, so backslash is a usual char
+_word_re = re.compile(r'(?:"[^"]*"?|\{[^}]*\}?|[^\s"{])+')
+# pieces of too long word end after comma or opening bracket
+_piece_re = re.compile(
+    r'(?:"[^"]*"?|\{[^}]*\}?|[^"{,(\[])*[,(\[]?')
+
+marker = '...'
+
+
+def _pieces(word):
+    '''splits word at commas and opening brackets outside of
+    strings and comments'''
+    return [piece for piece in _piece_re.findall(word) if piece]
+
+
+def wrap(line: str, width: int, indent: str='    ') -> list:
+    '''returns list of lines, which length does not exceed width
+    (without continuation marker, if possible).
+    The first line is not indented, continuation lines are indented
+    with indent. Lines are split at whitespace, words which can not
+    fit the line are split after commas and opening brackets.
+    String literals and comments are never split.'''
+    if len(line) <= width:
+        return [line]
+    starts = list()
+    ends = list()
+    for match in _word_re.finditer(line):
+        starts.append(match.start())
+        ends.append(match.end())
+    out = list()
+    # text of the current line before the word at idx
+    prefix = ''
+    idx = 0
+    count = len(starts)
+    while idx < count:
+        start = starts[idx]
+        if prefix.strip():
+            # tail of the split word: keep separator
+            start = ends[idx - 1]
+        # the last word, which fits the line
+        last = bisect_right(ends, start + width - len(prefix)) - 1
+        if last >= idx:
+            out.append(prefix + line[start:ends[last]])
+            idx = last + 1
+            prefix = indent
+        elif prefix.strip():
+            out.append(prefix)
+            prefix = indent
+        else:
+            lines = _split_word(line[start:ends[idx]], width,
+                                prefix, indent)
+            out.extend(lines[:-1])
+            prefix = lines[-1]
+            idx += 1
+    if prefix.strip():
+        out.append(prefix)
+    for idx in range(len(out) - 1):
+        out[idx] += marker
+    return out
+
+
+def _split_word(word, width, prefix, indent):
+    '''returns lines of the word, which does not fit the line'''
+    out = list()
+    current = prefix
+    for piece in _pieces(word):
+        if current.strip() and len(current) + len(piece) > width:
+            out.append(current)
+            current = indent
+        current += piece
+    out.append(current)
+    return out
@@ -47,12 +47,13 @@ from base_types import AstAddString
 
 from abstract import Output
 from abstract import SingletonMeta
+from context import ContextAttr
 
 
 class kInt(KspIntVar):
     '''See module doc'''
     warning_types = (KspStrVar, KspRealVar, str, float)
-    names_count = 0
+    names_count = ContextAttr(0)
 
     def __init__(self, value=0, name=None, preserve=False,
                  is_local=False, persist=False):
@@ -105,7 +106,7 @@ class kInt(KspIntVar):
 class kReal(KspRealVar):
     '''See module doc'''
     warning_types = (KspStrVar, KspIntVar, str, int)
-    names_count = 0
+    names_count = ContextAttr(0)
 
     def __init__(self, value=0.0, name=None, preserve=False,
                  is_local=False, persist=False):
@@ -149,7 +150,7 @@ class kReal(KspRealVar):
 class kStr(KspStrVar):
     '''See module doc'''
     warning_types = (KspIntVar, KspRealVar, int, float)
-    names_count = 0
+    names_count = ContextAttr(0)
 
     def __init__(self, value='', name=None, preserve=False,
                  is_local=False, persist=False):
@@ -194,7 +195,8 @@ class kStr(KspStrVar):
 
 class kArrInt(KspArray):
     '''See module doc'''
-    names_count = 0
+    names_count = ContextAttr(0)
+    _typecode = 'i'
 
     def __init__(self, sequence=None,
                  name=None,
@@ -224,7 +226,7 @@ class kArrInt(KspArray):
         return self.name()
 
     def _get_runtime(self):
-        return self._seq
+        return self._seq.tolist()
 
     def _generate_init(self):
         out = super()._generate_init()
@@ -235,7 +237,8 @@ class kArrInt(KspArray):
 
 class kArrReal(KspArray):
     '''See module doc'''
-    names_count = 0
+    names_count = ContextAttr(0)
+    _typecode = 'd'
 
     def __init__(self, sequence=None,
                  name=None,
@@ -265,7 +268,7 @@ class kArrReal(KspArray):
         return self.name()
 
     def _get_runtime(self):
-        return self._seq
+        return self._seq.tolist()
 
     def _generate_init(self):
         out = super()._generate_init()
@@ -276,7 +279,7 @@ class kArrReal(KspArray):
 
 class kArrStr(KspArray):
     '''See module doc'''
-    names_count = 0
+    names_count = ContextAttr(0)
 
     def __init__(self, sequence=None,
                  name=None,
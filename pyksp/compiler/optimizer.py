@@ -0,0 +1,34 @@
+'''optimization levels of kScript(optimize=level).
+
+Level is the list of passes, which are run after passes of the user
+(kScript.passes), and are created for every compilation:
+- 0: the code is emitted as generated
+- 1: peephole optimizations (see peephole.py)
+- 2: unrolling of short loops (see unroll.py), level 1, jump tables
+    instead of dense selects (see jumptable.py), common subexpression
+    elimination (see cse.py) and dead code elimination
+    (see deadcode.py).
+    Peephole runs before cse, so statements, which are removed by it
+    (e.g. "$x := $x") do not leave temporaries without reads. Dead
+    code elimination runs after all rewriting passes
+'''
+from cse import CommonSubexpressions
+from deadcode import DeadCode
+from jumptable import JumpTable
+from peephole import Peephole
+from unroll import Unroll
+
+
+levels = {0: (),
+          1: (Peephole,),
+          2: (Unroll, Peephole, JumpTable, CommonSubexpressions,
+              DeadCode)}
+
+
+def level_passes(level: int) -> list:
+    '''returns list of new passes of optimization level.
+    raises ValueError on unknown level'''
+    if level not in levels:
+        raise ValueError(f'optimization level has to be one of '
+                         f'{sorted(levels)}, got {level}')
+    return [p() for p in levels[level]]
@@ -0,0 +1,226 @@
+'''peephole optimization pass.
+
+Every statement of callbacks and functions is matched against the
+table of rules. Rule takes the statement and returns None, if it does
+not match, or the list of statements to put instead. Rules are applied
+to nested bodies first, and to every body until none of them matches.
+
+rules:
+- self_assignment: "$x := $x" is removed
+- increment: "$x := $x + 1" becomes "inc($x)", "$x := $x - 1" -
+    "dec($x)". The same for elements of integer arrays
+- constant_condition: "if(1 = 1)" is replaced by its body,
+    "if(1 = 2)" by its else branch, "while(1 = 2)" is removed
+- empty_if: "if" without statements is removed, "if" with only
+    else branch gets inverted condition, empty else is removed
+- unused_result: call of pure built-in function (see BuiltInFunc.pure)
+    as statement is removed. Such lines are left by built-ins,
+    which result is not used
+- elif_chain: "if($x = 1) ... else if($x = 2) ... end if end if",
+    generated by Else(condition), becomes "select($x) case(1) ...
+    case(2) ... end select", if every condition compares the same
+    stable expression (see cse.is_stable) with different int
+    constants and the chain has no final else. As nested bodies are
+    processed first, chain of any length is flattened, and the end of
+    chain with other conditions is flattened inside the last else
+
+Example:
+script = kScript('out.txt', optimize=1)
+'''
+from ir import Assign
+from ir import BinOp
+from ir import Call
+from ir import Case
+from ir import FuncCall
+from ir import If
+from ir import Index
+from ir import Name
+from ir import Num
+from ir import Select
+from ir import UnaryOp
+from ir import While
+
+from cse import is_pure
+from cse import is_stable
+from jumptable import int_literal
+from k_built_ins import BuiltInFunc
+
+
+_comparisons = {'=': lambda a, b: a == b, '#': lambda a, b: a != b,
+                '<': lambda a, b: a < b, '>': lambda a, b: a > b,
+                '<=': lambda a, b: a <= b, '>=': lambda a, b: a >= b}
+
+
+def constant(cond):
+    '''returns True or False if condition does not depend on
+    variables, otherwise None'''
+    if isinstance(cond, UnaryOp) and cond.op == 'not':
+        value = constant(cond.operand)
+        return None if value is None else not value
+    if not isinstance(cond, BinOp):
+        return None
+    if cond.op in _comparisons:
+        if isinstance(cond.left, Num) and isinstance(cond.right, Num):
+            return _comparisons[cond.op](cond.left.value, cond.right.value)
+        return None
+    if cond.op not in ('and', 'or'):
+        return None
+    values = (constant(cond.left), constant(cond.right))
+    if cond.op == 'and':
+        if False in values:
+            return False
+        return True if values == (True, True) else None
+    if True in values:
+        return True
+    return False if values == (False, False) else None
+
+
+def self_assignment(stmt):
+    if isinstance(stmt, Assign) and stmt.target == stmt.value \
+            and is_pure(stmt.target):
+        return []
+
+
+def increment(stmt):
+    if not isinstance(stmt, Assign) \
+            or not isinstance(stmt.target, (Name, Index)) \
+            or stmt.target.name[0] not in '$%' \
+            or not is_pure(stmt.target):
+        return None
+    value = stmt.value
+    if not isinstance(value, BinOp) or value.op not in ('+', '-'):
+        return None
+    one = Num('1')
+    target = stmt.target
+    if value.left == target and value.right == one:
+        func = 'inc' if value.op == '+' else 'dec'
+    elif value.op == '+' and value.left == one and value.right == target:
+        func = 'inc'
+    else:
+        return None
+    return [Call(FuncCall(func, (target,)))]
+
+
+def constant_condition(stmt):
+    if isinstance(stmt, If):
+        value = constant(stmt.cond)
+        if value is None:
+            return None
+        if value:
+            return stmt.body
+        return stmt.orelse or []
+    if isinstance(stmt, While) and constant(stmt.cond) is False:
+        return []
+
+
+def empty_if(stmt):
+    if not isinstance(stmt, If):
+        return None
+    if stmt.body and stmt.orelse == []:
+        return [If(stmt.cond, stmt.body)]
+    if stmt.body or not is_pure(stmt.cond):
+        return None
+    if not stmt.orelse:
+        return []
+    return [If(UnaryOp('not', stmt.cond), stmt.orelse)]
+
+
+def unused_result(stmt):
+    if isinstance(stmt, Call) and isinstance(stmt.expr, FuncCall) \
+            and BuiltInFunc.is_pure(stmt.expr.name) \
+            and is_pure(stmt.expr):
+        return []
+
+
+def _selected(cond):
+    '''returns (expression, int constant) if condition is their
+    equality, otherwise None'''
+    if not isinstance(cond, BinOp) or cond.op != '=':
+        return None
+    expr, value = cond.left, cond.right
+    if int_literal(value) is None:
+        expr, value = value, expr
+    if int_literal(value) is None or int_literal(expr) is not None \
+            or not is_stable(expr):
+        return None
+    return expr, value
+
+
+def elif_chain(stmt):
+    if not isinstance(stmt, If) or stmt.orelse is None \
+            or len(stmt.orelse) != 1:
+        return None
+    head = _selected(stmt.cond)
+    if head is None:
+        return None
+    expr, value = head
+    inner = stmt.orelse[0]
+    if isinstance(inner, If) and inner.orelse is None:
+        tail = _selected(inner.cond)
+        if tail is None or tail[0] != expr:
+            return None
+        cases = [Case(tail[1], inner.body)]
+    elif isinstance(inner, Select) and inner.expr == expr:
+        cases = inner.cases
+    else:
+        return None
+    values = [int_literal(case.value) for case in cases
+              if case.value is not None]
+    if len(values) != len(cases) or int_literal(value) in values:
+        return None
+    return [Select(expr, [Case(value, stmt.body)] + cases)]
+
+
+class Peephole:
+    '''optimization pass (see module doc).
+    rules is the list of names of rules to apply (all by default).
+    fired is the dict of {rule name: count of replacements}
+    of the last run'''
+
+    name = 'peephole'
+    rules = [('self_assignment', self_assignment),
+             ('increment', increment),
+             ('constant_condition', constant_condition),
+             ('empty_if', empty_if),
+             ('unused_result', unused_result),
+             ('elif_chain', elif_chain)]
+
+    def __init__(self, rules: list=None) -> None:
+        table = dict(self.rules)
+        if rules is None:
+            rules = list(table)
+        for name in rules:
+            if name not in table:
+                raise KeyError(f'there is no rule "{name}"')
+        self.rules = [(name, table[name]) for name in rules]
+        self.fired = dict.fromkeys(rules, 0)
+
+    def __call__(self, program):
+        self.fired = dict.fromkeys(self.fired, 0)
+        for block in program.blocks:
+            self._optimize(block.body)
+
+    def _optimize(self, body):
+        changed = True
+        while changed:
+            changed = False
+            for stmt in body:
+                for nested in stmt.bodies():
+                    self._optimize(nested)
+            out = list()
+            for stmt in body:
+                replacement = self._apply(stmt)
+                if replacement is None:
+                    out.append(stmt)
+                    continue
+                out.extend(replacement)
+                changed = True
+            body[:] = out
+
+    def _apply(self, stmt):
+        for name, rule in self.rules:
+            replacement = rule(stmt)
+            if replacement is not None:
+                self.fired[name] += 1
+                return replacement
+        return None
@@ -0,0 +1,261 @@
+import json
+import time
+import tracemalloc
+
+from abstract import Output
+from context import ContextAttr
+from context import ContextMeta
+
+
+class Stats:
+    '''measurements of one phase of compilation, callback or function.
+
+    - time is the wall time, spent inside the unit (with nested units)
+    - self_time excludes time of nested units
+    - peak is the tracemalloc peak of traced memory, reached
+        inside the unit (with nested units), in bytes
+    - puts is the count of Output().put() calls (self_puts excludes
+        nested units)
+    - lines is the count of lines, emitted by the unit
+
+    Is used as context manager to measure block of code, and
+    every entering adds to the previous measurements.'''
+
+    _fields = ('time', 'self_time', 'peak', 'puts', 'self_puts', 'lines')
+
+    def __init__(self, report, kind, name):
+        self._report = report
+        self.kind = kind
+        self.name = name
+        self.time = 0.0
+        self.self_time = 0.0
+        self.peak = 0
+        self.puts = 0
+        self.self_puts = 0
+        self.lines = 0
+        self.calls = 0
+        self._start = None
+
+    def add_lines(self, count: int):
+        self.lines += count
+
+    def to_dict(self):
+        out = {'name': self.name}
+        for field in self._fields:
+            out[field] = getattr(self, field)
+        return out
+
+    def __enter__(self):
+        self._report._enter(self)
+        return self
+
+    def __exit__(self, exc_type, value, trace):
+        self._report._exit(self)
+
+
+class _NullStats:
+    '''is returned by measure() if there is no active report'''
+
+    def add_lines(self, count):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, value, trace):
+        pass
+
+
+_null_stats = _NullStats()
+
+
+class CompileReport(metaclass=ContextMeta):
+    '''collects per-phase, per-callback and per-function
+    measurements of the compilation.
+
+    Is returned by kScript.compile(report=True). Can be dumped
+    as JSON (to_dict() or to_json()), str() gives the table
+    (callbacks and functions, which emitted nothing are omitted).
+    if memory is False, tracemalloc is not used and peaks are 0.
+
+    Report becomes active within the current CompileContext
+    on entering, so units measured with measure() and stream()
+    functions are added to it.
+
+    Example:
+    report = script.compile(report=True)
+    print(report)
+    with open('report.json', 'w') as f:
+        f.write(report.to_json())
+    '''
+
+    current = ContextAttr(None)
+
+    def __init__(self, script: str=None, memory=True) -> None:
+        self.script = script
+        self.memory = memory
+        self.total = Stats(self, 'total', 'total')
+        self.phases = dict()
+        self.callbacks = dict()
+        self.functions = dict()
+        self.info = dict()
+        self._stack = list()
+        self._last_time = None
+        self._last_puts = 0
+        self._own_tracing = False
+        self._previous = None
+
+    def phase(self, name: str) -> Stats:
+        '''returns Stats of phase, creates it at the first call'''
+        return self._get(self.phases, 'phase', name)
+
+    def unit(self, kind: str, name: str) -> Stats:
+        '''returns Stats of callback or function'''
+        units = self.callbacks if kind == 'callback' else self.functions
+        return self._get(units, kind, name)
+
+    def _get(self, units, kind, name):
+        try:
+            return units[name]
+        except KeyError:
+            stats = units[name] = Stats(self, kind, name)
+            return stats
+
+    def _switch(self):
+        '''charges time, memory peak and puts since the last
+        switch to the top unit of stack'''
+        now = time.perf_counter()
+        puts = Output().puts
+        top = self._stack[-1]
+        top.self_time += now - self._last_time
+        top.self_puts += puts - self._last_puts
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            top.peak = max(top.peak, peak)
+            tracemalloc.reset_peak()
+        self._last_time = now
+        self._last_puts = puts
+        return now, puts
+
+    def _enter(self, stats):
+        now, puts = self._switch()
+        stats._start = (now, puts)
+        stats.calls += 1
+        self._stack.append(stats)
+
+    def _exit(self, stats):
+        now, puts = self._switch()
+        self._stack.pop()
+        start_time, start_puts = stats._start
+        stats.time += now - start_time
+        stats.puts += puts - start_puts
+        parent = self._stack[-1]
+        parent.peak = max(parent.peak, stats.peak)
+
+    def __enter__(self):
+        self._previous = CompileReport.current
+        CompileReport.current = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracing = True
+        self._last_time = time.perf_counter()
+        self._last_puts = Output().puts
+        self._stack.append(self.total)
+        self.total._start = (self._last_time, self._last_puts)
+        self.total.calls += 1
+        if self.memory:
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, exc_type, value, trace):
+        now, puts = self._switch()
+        self._stack.pop()
+        start_time, start_puts = self.total._start
+        self.total.time += now - start_time
+        self.total.puts += puts - start_puts
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+        CompileReport.current = self._previous
+
+    def to_dict(self):
+        '''returns JSON-serializable dict'''
+        return {
+            'script': self.script,
+            'total': self.total.to_dict(),
+            'phases': [s.to_dict() for s in self.phases.values()],
+            'callbacks': [s.to_dict() for s in self.callbacks.values()],
+            'functions': [s.to_dict() for s in self.functions.values()],
+            'info': self.info}
+
+    def to_json(self, **kwargs):
+        '''returns JSON string. kwargs are passed to json.dumps'''
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __str__(self):
+        header = f'{"":<40}{"time, s":>10}{"self, s":>10}' + \
+            f'{"peak, KiB":>11}{"puts":>9}{"lines":>8}'
+        out = [f'compile report of {self.script}', header]
+        sections = (('phases', self.phases), ('callbacks', self.callbacks),
+                    ('functions', self.functions))
+        for title, units in sections:
+            if not units:
+                continue
+            out.append(title + ':')
+            out.extend(self._row('  ' + s.name, s) for s in units.values()
+                       if s.lines or s.puts)
+        out.append(self._row('total', self.total))
+        return '\n'.join(out)
+
+    @staticmethod
+    def _row(title, s):
+        return f'{title[:39]:<40}{s.time:>10.3f}{s.self_time:>10.3f}' + \
+            f'{s.peak / 1024:>11.1f}{s.puts:>9}{s.lines:>8}'
+
+
+def measure(kind: str, name: str=None):
+    '''returns Stats of the active report to be used as
+    context manager. If name is None, kind is the name of phase,
+    otherwise kind is "callback" or "function".
+    Without active report does nothing.
+
+    Example:
+    with measure('callback', 'note') as stats:
+        lines = generate()
+        stats.add_lines(len(lines))
+    '''
+    report = CompileReport.current
+    if report is None:
+        return _null_stats
+    if name is None:
+        return report.phase(kind)
+    return report.unit(kind, name)
+
+
+def stream(name: str, lines):
+    '''measures lazy phase: only time of getting every line from
+    lines iterable is added to the phase.
+    Without active report returns lines.'''
+    report = CompileReport.current
+    if report is None:
+        return lines
+    return _stream(report.phase(name), lines)
+
+
+def _stream(stats, lines):
+    lines = iter(lines)
+    while True:
+        with stats:
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+        stats.lines += 1
+        yield line
+
+
+def annotate(key: str, value):
+    '''adds value to info section of the active report'''
+    report = CompileReport.current
+    if report is not None:
+        report.info[key] = value
@@ -1,9 +1,7 @@
+import contextlib
 import time
 import os
 import sys
-import textwrap
-import codecs
-import pyperclip
 
 from abstract import KspObject
 from abstract import Output
@@ -11,17 +9,25 @@ from abstract import IName
 from abstract import KSP
 
 from native_types import refresh_names_count
+from base_types import AstOperator
 from k_built_ins import Callback
 from k_built_ins import InitCallback
 from callbacks import persistence_changed
 from k_built_ins import BuiltIn
 # from functions import Function
-from bi_ui_controls import refresh as gui_refresh
 from conditions_loops import For
 from functions import Function
 from functions import FuncStack
-from bi_ui_controls import KspNativeControlMeta
-from bi_misc import kLog
+from compile_cache import CompileCache
+from line_wrap import wrap
+from ir import PassManager
+from optimizer import level_passes
+from context import current_context
+from report import CompileReport
+from report import annotate
+from report import measure
+from report import stream
+from classic_builtins import import_modules
 
 
 def refresh_all():
@@ -29,24 +35,48 @@ def refresh_all():
     calls refresh methods of:
     BuiltIn
     IName
+    AstOperator
     For
     KSP
     calls native_types.refresh_names_count()
-    and bi_ui_controls.refresh()
+    and bi_ui_controls.refresh() (if it is imported)
     '''
+    # stack arrays are declared with FuncStack init lines
+    FuncStack()
     KspObject.refresh()
     # Callback.refresh()
     # Function.refresh()
     BuiltIn.refresh()
     refresh_names_count()
     IName.refresh()
-    gui_refresh()
+    AstOperator.refresh()
+    gui = _imported('bi_ui_controls')
+    if gui:
+        gui.refresh()
     For.refresh()
     Output().refresh()
     KSP.refresh()
     # FuncStack().refr()
 
 
+def _imported(module):
+    '''returns module if it is imported or None.
+    built-ins modules are imported on the first access to their names,
+    so objects of not imported module can not exist'''
+    return sys.modules.get(module)
+
+
+def main_is_frozen():
+    return (hasattr(sys, "frozen") or  # new py2exe
+            hasattr(sys, "importers"))
+
+
+def get_main_dir():
+    if main_is_frozen():
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(sys.argv[0])
+
+
 class kScript:
     '''Is used for generating code of all API calls used in project.
     All KSP objects, attempted to appear in code has to be placed inside
@@ -62,13 +92,54 @@ class kScript:
     - title is script title to be set via set_script_title() func
 
     -if compact is True, all variable names will be hashed
+        if compact is IName.shortest ('shortest'), names are replaced by
+        the shortest unique identifiers, the most referenced names get
+        the shortest ones. Names of persistent variables are hashed
 
     - with max_line_length being not None, lines with
         length > max_line_length will be wrapped to fit it.
-        currently, lines with "quoted strings" are not wrapped
+        lines are split between tokens outside of "quoted strings",
+        so only a single string literal longer than max_line_length
+        can exceed it
 
     - indents and docstrings are out of work
 
+    - cache is a directory for the incremental compilation cache.
+        Bodies of callbacks and functions, which code (with referenced
+        globals) and declarations are unchanged, are taken from it.
+        if path is not full, the __main__.__file__ path will be used.
+
+    - if deterministic is True, header of the script does not
+        contain compilation time, so the same sources produce
+        byte-identical output
+
+    - passes is a list of optimization passes. Pass is a callable,
+        which takes ir.Program (the code, lifted to the intermediate
+        representation) and changes it before the final rendering.
+        Passes can be also added later by script.passes.add(pass).
+        Analysis passes only read the code, e.g. CallGraph
+        (see callgraph.py) exports calls between functions
+
+    - if intern_ast is True, structurally identical expressions
+        within a callback are built as the same Ast object
+        (see AstOperator.set_interning)
+
+    - if simulate is False, runtime values of variables, arrays and
+        built-in functions are not computed under compilation
+        (see KSP.set_simulated). Bodies of loops are traced once
+        in any case (see For).
+        Python code of the script can not depend on runtime values
+        (e.g. with kInt.val in runtime), but the compilation is faster
+
+    - optimize is the optimization level (see optimizer.py). Passes of
+        the level are run after passes and are kept in
+        script.optimizers after compilation, e.g. counters of
+        peephole rules are script.optimizers[1].fired at level 2
+
+    Script is compiled within the current CompileContext. For building
+    several scripts concurrently, execute every script module (with
+    its compile() call) inside its own CompileContext.
+
     Example:
     script = kScript(r'C:/file.txt',
                          'myscript', max_line_length=70, compact=True)
@@ -87,7 +158,13 @@ class kScript:
     def __init__(self, out_file: str, title: str=None,
                  compact=False, max_line_length=79,
                  indents=False,
-                 docstrings=False) -> None:
+                 docstrings=False,
+                 cache: str=None,
+                 deterministic=False,
+                 passes: list=None,
+                 intern_ast=False,
+                 optimize: int=0,
+                 simulate=True) -> None:
         if out_file is self.clipboard:
             self._file = out_file
         else:
@@ -95,118 +172,233 @@ class kScript:
         self._compact = compact
         self._title = title
         self._line_length = max_line_length
+        self._cache_dir = cache
+        self._cache = None
+        self._deterministic = deterministic
+        self.passes = PassManager(passes)
+        self._intern_ast = intern_ast
+        level_passes(optimize)
+        self._optimize = optimize
+        self._simulate = simulate
+        self.optimizers = list()
 
     def _generate_code(self):
-        print('generating code')
-        refresh_all()
-        KSP.set_compiled(True)
-        KSP.in_init(True)
-        if self._compact:
-            IName.set_compact(True)
-        # try:
-        self.main()
-        # except AttributeError:
-        #     raise RuntimeError(
-        #         '''all KSP objects attemped to appear in the code
-        #         has to be placed inside function, which is assigned
-        #         to script main attribute''')
+        '''generator of the script lines.
+        Code is produced by the pipeline of phases (header, init,
+        functions and callbacks), every line is wrapped on the fly.
+        Bodies of callbacks and functions are collected before they
+        are yielded: functions are placed before callbacks, but the
+        called ones are known only after callbacks are generated.
+        With optimization passes the code is lifted to IR and
+        rendered after all passes.
+        Phases are measured by the active CompileReport'''
+        with measure('refresh'):
+            refresh_all()
+            KSP.set_compiled(True)
+            KSP.in_init(True)
+            if self._compact:
+                IName.set_compact(self._compact)
+            AstOperator.set_interning(self._intern_ast)
+            KSP.set_simulated(self._simulate)
+            self._cache = None
+            if self._cache_dir is not None:
+                cache_dir = self._cache_dir
+                if not os.path.isabs(cache_dir):
+                    cache_dir = os.path.join(get_main_dir(), cache_dir)
+                self._cache = CompileCache(cache_dir)
         try:
-            kLog()
-            if kLog()._path:
-                KSP.in_init(False)
-                persistence_changed(kLog()._log_arr_pers)
-                KSP.in_init(True)
-        except TypeError as e:
-            if str(e).startswith('__init__()'):
-                pass
-            else:
-                raise e
-        print('getting lines of regular operations')
-        regular = Output().get()
-        print('getting inits of declared objects')
-        obj_init = KspObject.generate_all_inits()
-        print('getting inits of NativeControls params')
-        ctrls = KspNativeControlMeta.generate_init_code()
-        print('getting lines of init callback, pasted as decorated funcs')
-        init_cb = InitCallback.generate_body()[1:-1]
+            self.optimizers = level_passes(self._optimize)
+            passes = self.passes.extended(self.optimizers)
+            lines = passes.process(self._generate_lines())
+            if self._compact == IName.shortest:
+                # all names have to be counted before wrapping
+                with measure('shortening names'):
+                    lines = list(lines)
+                    # names of all built-in functions are reserved
+                    # on import of their modules
+                    import_modules()
+                    lines = IName.shorten(lines)
+            yield from stream('wrapping long lines',
+                              self._check_length(lines))
+        finally:
+            KSP.set_compiled(False)
+            KSP.set_simulated(True)
+
+    def _generate_lines(self):
+        '''chains lines of all phases of the code'''
+        if self._deterministic:
+            yield '{ Compiled with pyksp }'
+        else:
+            localtime = time.asctime(time.localtime(time.time()))
+            yield '{ Compiled on %s }' % localtime
+        cache = self._cache
+        for line in self._generate_init():
+            if cache:
+                cache.update_context(line)
+            yield line
+        with measure('generating other callbacks') as stats:
+            cbs = Callback.get_all_bodies(cache)
+            stats.add_lines(len(cbs))
+        with measure('generating functions bodies') as stats:
+            functions = self._generate_functions()
+            stats.add_lines(len(functions))
+        yield from functions
+        yield from cbs
+        if cache:
+            annotate('cache', {'hits': cache.hits, 'misses': cache.misses})
+
+    def _generate_init(self):
+        '''executes script main and yields lines of init callback'''
+        with measure('getting lines of regular operations') as stats:
+            self.main()
+            misc = _imported('bi_misc')
+            try:
+                if misc and misc.kLog()._path:
+                    KSP.in_init(False)
+                    persistence_changed(misc.kLog()._log_arr_pers)
+                    KSP.in_init(True)
+            except TypeError as e:
+                if '__init__()' in str(e):
+                    pass
+                else:
+                    raise e
+            regular = Output().get()
+            stats.add_lines(len(regular))
+        with measure('getting inits of declared objects') as stats:
+            # has to be collected before FuncStack is touched
+            obj_init = KspObject.generate_all_inits()
+            stack_init = FuncStack()._init_lines
+            stats.add_lines(len(obj_init) + len(stack_init))
+        yield 'on init'
+        if self._title:
+            yield f'set_script_title("{self._title}")'
+        yield from stack_init
+        yield from obj_init
+        with measure('getting inits of NativeControls params') as stats:
+            gui = _imported('bi_ui_controls')
+            controls_init = gui.KspNativeControlMeta.generate_init_code() \
+                if gui else []
+            stats.add_lines(len(controls_init))
+        yield from controls_init
+        yield from regular
+        with measure('getting lines of init callback') as stats:
+            init_cb = InitCallback.generate_body()[1:-1]
+            stats.add_lines(len(init_cb))
+        yield from init_cb
+        yield 'end on'
         KSP.in_init(False)
-        print('generating other callbacks')
-        cbs = Callback.get_all_bodies()
-        print('generating functions bodies')
-        funcs = list()
+
+    def _generate_functions(self):
+        '''returns sorted bodies of all invoked functions'''
         for f in Function._functions.values():
-            funcs = f._generate_executable()
-            break
-        # funcs = KspObject.generate_all_executables()
-        out = list()
-        print('joining the code')
-        localtime = time.asctime(time.localtime(time.time()))
-        out.append('{ Compiled on %s }' % localtime)
-        out.append('on init')
-        if self._title:
-            out.append(f'set_script_title("{self._title}")')
-        out.extend(FuncStack()._init_lines)
-        out.extend(obj_init)
-        out.extend(ctrls)
-        out.extend(regular)
-        out.extend(init_cb)
-        out.append('end on')
-
-        out.extend(funcs)
-        out.extend(cbs)
-        print('wrapping long lines')
-        out = self._check_length(out)
-
-        KSP.set_compiled(False)
-        print('sucsessfully generated')
-        return out
+            # generation is started by any called function
+            if f.called:
+                return f._generate_executable(self._cache)
+        return []
 
     def _check_length(self, lines):
-        if self._line_length is False:
-            return lines
-        new_lines = list()
+        length = self._line_length
+        if length is False or length is None:
+            yield from lines
+            return
         for line in lines:
             line = line.strip()
-            if len(line) <= self._line_length:
-                new_lines.append(line)
+            if len(line) <= length:
+                yield line
                 continue
-            if line.find('"') > -1:
-                new_lines.append(line)
-                continue
-            new_lines.extend(self.wrap(line, self._line_length))
-        return new_lines
+            yield from wrap(line, length)
 
     def wrap(self, s, w):
-        new = textwrap.wrap(s, w, break_long_words=False,
-                            subsequent_indent='    ')
-        for idx in range(len(new) - 1):
-            new[idx] += '...'
-        new[-1]
-        return new
-
-    def compile(self):
+        '''returns lines of s, wrapped to the width w'''
+        return wrap(s, w)
+
+    def compile(self, report=False):
+        '''generates code and writes it to the out_file or clipboard.
+        if report is True, returns CompileReport with measurements
+        of phases, callbacks and functions'''
         print(f'compiling the script {self}')
+        if not report:
+            self._compile()
+            return None
+        title = self._title
+        if title is None:
+            title = 'clipboard' if self._file is self.clipboard \
+                else self._file
+        with CompileReport(title) as compile_report:
+            self._compile()
+        compile_report.total.lines = \
+            compile_report.phase('wrapping long lines').lines
+        return compile_report
+
+    def watch(self, interval=0.5):
+        '''compiles the script and recompiles it on every change of
+        the main module or local modules, imported by it. Is used
+        instead of compile(). Main module is executed again by the
+        watcher in the same process, where the compiler is already
+        imported. Stops by KeyboardInterrupt (Ctrl+C)'''
+        if current_context().watching:
+            return self.compile()
+        from watch import Watcher
+        Watcher(sys.argv[0], interval).run()
+
+    def _compile(self):
         code = self._generate_code()
-        newcode = ''
+        context = current_context()
+        out_file = self._file
+        if out_file is self.clipboard:
+            if context.clipboard_file is None:
+                with ClipboardSink() as output:
+                    self._write_code(code, output)
+                print(f'saved compiled script {self} to clipboard')
+                return
+            out_file = context.clipboard_file
+        elif not os.path.isabs(out_file):
+            out_file = self._file = os.path.join(get_main_dir(), out_file)
+        tmp_file = out_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='latin-1',
+                      newline='') as output:
+                self._write_code(code, output)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_file)
+            raise
+        os.replace(tmp_file, out_file)
+        context.outputs.append(out_file)
+        print(f'saved compiled script {self} to {out_file}')
+
+    @staticmethod
+    def _write_code(code, output, chunk_size=1024):
+        '''writes lines of code to the output by chunks of
+        chunk_size lines'''
+        chunk = list()
         for line in code:
-            newcode += line + '\n'
-        if self._file is self.clipboard:
-            print(f'saved compiled script {self} to clipboard')
-            pyperclip.copy(newcode)
-            return
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                output.write('\n'.join(chunk) + '\n')
+                chunk.clear()
+        if chunk:
+            output.write('\n'.join(chunk) + '\n')
+
+
+class ClipboardSink:
+    '''file-like sink, collects written chunks and copies them
+    to the exchange buffer on close'''
+
+    def __init__(self):
+        self._chunks = list()
+
+    def write(self, data):
+        self._chunks.append(data)
+
+    def close(self):
+        import pyperclip
+        pyperclip.copy(''.join(self._chunks))
+        self._chunks = list()
+
+    def __enter__(self):
+        return self
 
-        def main_is_frozen():
-            return (hasattr(sys, "frozen") or  # new py2exe
-                    hasattr(sys, "importers"))
-
-        def get_main_dir():
-            if main_is_frozen():
-                return os.path.dirname(sys.executable)
-            return os.path.dirname(sys.argv[0])
-
-        if not os.path.isabs(self._file):
-            self._file = os.path.join(get_main_dir(), self._file)
-        with codecs.open(self._file, 'w', encoding='latin-1') as output:
-            if output:
-                output.write(newcode)
-        print(f'saved compiled script {self} to {self._file}')
+    def __exit__(self, exc_type, value, trace):
+        if exc_type is None:
+            self.close()
@@ -11,6 +11,7 @@ from base_types import KspVar
 from base_types import KspIntVar
 from base_types import KspRealVar
 from base_types import KspStrVar
+from base_types import get_runtime
 
 from conditions_loops import For
 
@@ -125,6 +126,7 @@ class StackFrame(KSP):
                                 f'Type of {var} is {type(var)}')
             if isinstance(var, kLoc):
                 if var._size > 1:
+                    self.__check_size(arr, idx + start_idx, var._size)
                     self.__vars.append(StackFrameArray(arr,
                                                        idx + start_idx,
                                                        idx + start_idx +
@@ -132,13 +134,14 @@ class StackFrame(KSP):
                     with For(var._size) as seq:
                         for val in seq:
                             arr[val + idx + start_idx] <<= arr.default
-                        idx += var._size
+                    idx += var._size
                 else:
                     arr[idx + start_idx] <<= arr.default
                     self.__vars.append(arr[idx + start_idx])
                     idx += 1
                 continue
             if isinstance(var, KspArray):
+                self.__check_size(arr, idx + start_idx, len(var))
                 self.__vars.append(StackFrameArray(arr,
                                                    idx + start_idx,
                                                    idx + start_idx +
@@ -146,13 +149,25 @@ class StackFrame(KSP):
                 with For(len(var)) as seq:
                     for val in seq:
                         self.__vars[-1][val] = var[val]
-                        idx += 1
+                if self.is_compiled() and self.is_simulated():
+                    # runtime values of the traced loop
+                    start = get_runtime(idx + start_idx)
+                    for item in range(len(var)):
+                        arr._store(start + item, var[item]._get_runtime())
+                idx += len(var)
                 continue
             arr[idx + start_idx] <<= var
             self.__vars.append(arr[idx + start_idx])
             idx += 1
         self.__size = idx
 
+    def __check_size(self, arr, start_idx, size):
+        '''raises IndexError if size items from start_idx are out of
+        arr. Loops, filling the frame, are not simulated under
+        compilation (see For), so it is checked beforehand'''
+        if self.is_simulated() and get_runtime(start_idx) + size > len(arr):
+            raise IndexError(f'stack {arr.name()} is full')
+
     @property
     def vars(self):
         '''returns tuple of array items and StackFrameArray objects
@@ -193,7 +208,7 @@ class Stack(KSP):
         items of self array.
         '''
         self._pointer.inc()
-        if self._pointer._get_runtime() > 0:
+        if self._frames:
             self._idx[self._pointer] <<= \
                 self._idx[self._pointer - 1] + self._frames[-1].size
         start_idx = self._idx[self._pointer]
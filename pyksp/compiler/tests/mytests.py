@@ -14,7 +14,6 @@ from native_types import refresh_names_count
 from k_built_ins import Callback
 from k_built_ins import BuiltIn
 # from functions import Function
-from bi_ui_controls import refresh as gui_refresh
 from conditions_loops import For
 
 
@@ -28,7 +27,8 @@ class DevTest(t.TestCase):
         BuiltIn.refresh()
         refresh_names_count()
         IName.refresh()
-        gui_refresh()
+        if 'bi_ui_controls' in sys.modules:
+            sys.modules['bi_ui_controls'].refresh()
         For.refresh()
         KSP.refresh()
 
@@ -40,6 +40,7 @@ class DevTest(t.TestCase):
         BuiltIn.refresh()
         refresh_names_count()
         IName.refresh()
-        gui_refresh()
+        if 'bi_ui_controls' in sys.modules:
+            sys.modules['bi_ui_controls'].refresh()
         For.refresh()
         KSP.refresh()
@@ -1,3 +1,5 @@
+import importlib
+import itertools
 import os
 import sys
 import unittest as t
@@ -10,6 +12,11 @@ sys.path.append(path)
 from mytests import DevTest
 
 from abstract import *
+from abstract import _keywords
+from abstract import _short_ids
+from classic_builtins import _names as builtins_modules
+from classic_builtins import import_modules
+from k_built_ins import BuiltInFunc
 
 
 class TestSingleton(DevTest):
@@ -113,6 +120,42 @@ class TestName(DevTest):
         g = self.Test4()
         self.assertEqual(g.name(), '@bu20h[20]')
 
+    def test_shortest(self):
+        IName.set_compact(IName.shortest)
+        rare = self.Test3('rare')
+        often = self.Test3('often')
+        kept = self.Test3('a', preserve=True)
+        saved = self.Test3('saved')
+        unused = self.Test3('unused')
+        with self.assertRaises(NameError):
+            self.Test3('often')
+        lines = [f'{rare.name()} := {often.name()}',
+                 f'{often.name()} := {often.name()} + {kept.name()}',
+                 f'make_persistent({saved.name()})',
+                 'message("often")']
+        self.assertEqual(IName.shorten(lines), [
+            '$c := $b', '$b := $b + $a',
+            f'make_persistent(${IName.get_compact_name("saved")})',
+            'message("often")'])
+        self.assertEqual(often.name(), '$b')
+        self.assertEqual(unused.name(), '$d')
+
+    def test_reserved(self):
+        import_modules()
+        names = {'lsb', 'msb', 'abs', 'inc'}
+        for module in builtins_modules:
+            for value in vars(importlib.import_module(module)).values():
+                value = getattr(value, '__self__', value)
+                if isinstance(value, BuiltInFunc):
+                    names.add(value._name)
+        self.assertIn('sqrt', names)
+        # all ids up to 4 characters
+        ids = set(itertools.islice(_short_ids(set()),
+                                   26 * (1 + 36 + 36 ** 2 + 36 ** 3)))
+        self.assertIn('zzzz', ids)
+        self.assertEqual(ids & names, set())
+        self.assertEqual(ids & set(_keywords), set())
+
 
 class TestKspObject(DevTest):
 
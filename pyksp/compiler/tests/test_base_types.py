@@ -1,4 +1,5 @@
 import os
+import random
 import sys
 import unittest as t
 
@@ -10,6 +11,9 @@ sys.path.append(path)
 from mytests import DevTest
 
 from base_types import *
+from native_types import kInt
+from native_types import kReal
+from abstract import IName
 
 
 class NumericWarn:
@@ -241,7 +245,7 @@ class TestAstOperator(DevTest):
 
         self.assertEqual((self.op + 1).expand(), 'expanded + 1')
         self.assertEqual((self.op + 1 + 1 + 1).expand(),
-                         'expanded + 1 + 1 + 1')
+                         'expanded + 3')
         self.assertEqual((1 + self.op).expand(), '1 + (expanded)')
         self.assertEqual((1 + self.op).get_value(), 1 + 1)
         with self.assertRaises(NotImplementedError):
@@ -307,6 +311,204 @@ class TestAstOperator(DevTest):
         self.assertEqual((1 & self.op).expand(), '1 and expanded')
         self.assertEqual((self.op & 1).expand(), 'expanded and 1')
 
+class TestFolding(DevTest):
+
+    def setUp(self):
+        super().setUp()
+        KSP.set_bool(False)
+
+    def test_semantics(self):
+        self.assertEqual(ksp_div(7, 2), 3)
+        self.assertEqual(ksp_div(-7, 2), -3)
+        self.assertEqual(ksp_div(7, -2), -3)
+        self.assertEqual(ksp_mod(-7, 2), -1)
+        self.assertEqual(ksp_mod(7, -2), 1)
+        self.assertEqual(int32(2 ** 31), -2 ** 31)
+        self.assertEqual(int32(-2 ** 31 - 1), 2 ** 31 - 1)
+
+        self.assertEqual(AstAdd(AstMul(3, 128), 4).expand(), '388')
+        self.assertEqual(AstMul(2 ** 16, 2 ** 16).expand(), '0')
+        self.assertEqual(AstAdd(2 ** 31 - 1, 1).expand(), str(-2 ** 31))
+        self.assertEqual(AstDiv(-7, 2).expand(), '-3')
+        self.assertEqual(AstMod(-7, 2).expand(), '-1')
+        self.assertEqual(AstNot(AstBinOr(1, 4)).expand(), '-6')
+        self.assertEqual(AstDiv(7.0, 2.0).expand(), '3.5')
+        self.assertEqual(AstNeg(AstSub(1.5, 0.25)).expand(), '-1.25')
+
+        # not folded
+        self.assertEqual(AstDiv(1, 0).expand(), '1 / 0')
+        self.assertEqual(AstAdd(1, 1.5).expand(), '1 + 1.5')
+        self.assertEqual(AstMod(7.5, 2.0).expand(), '7.5 mod 2.0')
+        self.assertEqual(AstNot(1.5).expand(), '.not.1.5')
+        self.assertEqual(AstMul(1e200, 1e200).expand(), '1e+200 * 1e+200')
+        self.assertEqual(AstEq(1, 1).expand(), '1 = 1')
+        KSP.set_bool(True)
+        self.assertEqual(AstBinAnd(1, 2).expand(), '1 and 2')
+        KSP.set_bool(False)
+
+        SimpleAst().set_compiled(True)
+        x = ValuebleKspVar('x', is_local=True, value=3)
+        self.assertEqual(AstAdd(x, AstMul(3, 128)).expand(), 'x + 384')
+        self.assertEqual(AstMul(x, AstAdd(1, 2)).expand(), 'x * 3')
+        self.assertEqual(AstMul(AstAdd(x, 1), 2).expand(), '(x + 1) * 2')
+        self.assertEqual(AstMul(AstAdd(x, 1), 2).get_value(), 8)
+
+    def test_differential(self):
+        rnd = random.Random(0)
+        binary = (AstAdd, AstSub, AstMul, AstDiv, AstMod, AstBinAnd,
+                  AstBinOr)
+
+        def tree(depth):
+            if depth == 0 or rnd.random() < 0.3:
+                return rnd.randint(-50, 50)
+            if rnd.random() < 0.2:
+                return rnd.choice((AstNeg, AstNot))(tree(depth - 1))
+            return rnd.choice(binary)(tree(depth - 1), tree(depth - 1))
+
+        for _ in range(1000):
+            node = tree(4)
+            if not isinstance(node, AstOperator):
+                continue
+            with self.subTest(node=node.expand()):
+                try:
+                    expected = node.get_value()
+                except ZeroDivisionError:
+                    self.assertIsNone(node.folded())
+                    continue
+                self.assertEqual(int(node.expand()), expected)
+
+        def real_tree(depth):
+            if depth == 0 or rnd.random() < 0.3:
+                return round(rnd.uniform(-10, 10), 2)
+            if rnd.random() < 0.2:
+                return AstNeg(real_tree(depth - 1))
+            op = rnd.choice((AstAdd, AstSub, AstMul, AstDiv))
+            return op(real_tree(depth - 1), real_tree(depth - 1))
+
+        for _ in range(500):
+            node = real_tree(3)
+            if not isinstance(node, AstOperator) or node.folded() is None:
+                continue
+            with self.subTest(node=node):
+                self.assertEqual(float(node.expand()), node.get_value())
+
+    def test_strings(self):
+        SimpleAst().set_compiled(True)
+        x = ValuebleKspVar('x', is_local=True, value=3)
+        self.assertEqual(AstAddString('a', 'b').expand(), '"ab"')
+        self.assertEqual(AstAddString('a', 'b').get_value(), 'ab')
+        concat = AstAddString(AstAddString('a', x), 'b') + 'c'
+        self.assertEqual(concat.expand(), '"a" & x & "bc"')
+        concat = 'a' + AstAddString('b', AstAddString('c', x))
+        self.assertEqual(concat.expand(), '"abc" & x')
+
+    def test_chains(self):
+        KSP.set_compiled(True)
+        x = kInt(5, 'x')
+        y = kReal(1.5, 'y')
+        cases = (((x + 3) + 4, '$x + 7'),
+                 (3 + (x + 4), '$x + 7'),
+                 ((x + 3) - 4, '$x - 1'),
+                 ((x - 3) - 4, '$x - 7'),
+                 (10 + (x - 10), '$x + 0'),
+                 (2 * (x * 3), '$x * 6'),
+                 (((x * 2) * 3) + 1 + 2, '$x * 6 + 3'),
+                 ((x + 3) * 4, '($x + 3) * 4'),
+                 (4 - (x + 3), '4 - ($x + 3)'),
+                 ((x + 2 ** 31 - 1) + 1, '$x + 2147483647 + 1'),
+                 ((y + 1.0) + 2.0, '~y + 1.0 + 2.0'))
+        for expr, expanded in cases:
+            with self.subTest(expanded=expanded):
+                self.assertEqual(expr.expand(), expanded)
+        self.assertEqual(((x + 3) - 4).get_value(), 4)
+        self.assertEqual((2 * (x * 3)).get_value(), 30)
+
+
+
+class TestMemoized(DevTest):
+
+    def setUp(self):
+        super().setUp()
+        KSP.set_compiled(True)
+        self.x = ValuebleKspVar('x', is_local=True, value=3)
+
+    def test_cache(self):
+        expr = AstMul(AstAdd(self.x, 1), self.x)
+        self.assertEqual(expr.expand(), '(x + 1) * x')
+        self.assertIs(expr.expand(), expr.expand())
+        concat = AstAddString('a', self.x) + 'b'
+        self.assertEqual(concat.expand(), '"a" & x & "b"')
+        self.assertIs(concat.expand(), concat.expand())
+
+    def test_invalidation(self):
+        expr = AstAdd(self.x, 1)
+        concat = AstAddString('a', self.x)
+        self.assertEqual(expr.expand(), 'x + 1')
+        IName.script_prefix = 'p_'
+        self.assertEqual(expr.expand(), 'p_x + 1')
+        self.assertEqual(concat.expand(), '"a" & p_x')
+        KSP.set_compiled(False)
+        self.assertEqual(expr.expand(), '3 + 1')
+        self.x._set_runtime(5)
+        self.assertEqual(expr.expand(), '5 + 1')
+
+    def test_long_chain(self):
+        expr = self.x
+        for _ in range(3000):
+            expr = AstAdd(expr, self.x)
+        self.assertEqual(expr.expand(), 'x' + ' + x' * 3000)
+        # shared subtrees are expanded once
+        leaf = self.CountedAst()
+        common = AstAdd(leaf, 1)
+        for idx in range(2, 100):
+            self.assertEqual(AstMul(common, idx).expand(),
+                             f'(SimpleAst_expanded + 1) * {idx}')
+        self.assertEqual(leaf.count, 1)
+
+    class CountedAst(SimpleAst):
+        priority = 0
+
+        def __init__(self):
+            self.count = 0
+
+        def expand(self):
+            self.count += 1
+            return super().expand()
+
+
+class TestInterning(DevTest):
+
+    def setUp(self):
+        super().setUp()
+        KSP.set_compiled(True)
+        self.x = ValuebleKspVar('x', is_local=True, value=3)
+
+    def tearDown(self):
+        AstOperator.set_interning(False)
+        super().tearDown()
+
+    def test_interning(self):
+        x = self.x
+        self.assertFalse(hasattr(AstAdd(x, 1), '__dict__'))
+        self.assertIsNot(AstAdd(x, 1), AstAdd(x, 1))
+        AstOperator.set_interning(True)
+        expr = AstEq(AstAdd(x, 1), 2)
+        self.assertIs(AstEq(AstAdd(x, 1), 2), expr)
+        self.assertEqual(expr.expand(), 'x + 1 = 2')
+        self.assertIsNot(AstAdd(x, 1), AstAdd(x, 1.0))
+        self.assertIsNot(AstAdd(x, 1), AstSub(x, 1))
+        self.assertIsNot(AstAdd(x, 1), AstAdd(1, x))
+
+        callback = object()
+        KSP.set_callback(callback)
+        self.assertIsNot(AstEq(AstAdd(x, 1), 2), expr)
+        KSP.set_callback(None)
+
+        AstOperator.refresh()
+        self.assertTrue(AstOperator.is_interning())
+        self.assertIsNot(AstEq(AstAdd(x, 1), 2), expr)
+
+
 # I don't know why they don't have self._get_runtime_other
 # kInt, kReal have
 
@@ -353,8 +555,9 @@ class TestKspVar(DevTest):
         self.assertEqual(Output().get()[-1],
                          'x := 1')
         x <<= AstAddString('a', 'a')
+        # adjacent string literals are folded
         self.assertEqual(Output().get()[-1],
-                         'x := "a" & "a"')
+                         'x := "aa"')
 
         self.assertEqual(x._generate_init(),
                          ['GoodKspVar (x) init'])
@@ -0,0 +1,70 @@
+import io
+import os
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+sys.path.append(path + '/benchmarks')
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+import runner
+import imports
+from synthetic import scenarios
+
+
+class TestBenchmarks(DevTest):
+
+    def runTest(self):
+        output = io.StringIO()
+        results = runner.run(sizes=[2], repeat=1, output=output)
+        self.assertEqual(list(results), list(scenarios))
+        for name, sizes in results.items():
+            with self.subTest(scenario=name):
+                self.assertGreater(sizes['2']['lines'], 0)
+                self.assertGreater(sizes['2']['peak'], 0)
+
+        compiled = runner.run(sizes=[2], repeat=1, output=output,
+                              simulate=False)
+        for name, sizes in compiled.items():
+            self.assertEqual(sizes['2']['lines'],
+                             results[name]['2']['lines'])
+
+        baseline = {'variables': {'2': dict(results['variables']['2'])}}
+        baseline['variables']['2']['time'] /= 10
+        regressions = runner.compare(results, baseline, output=output)
+        self.assertEqual([r[:3] for r in regressions],
+                         [('variables', '2', 'time')])
+
+
+class TestImports(DevTest):
+
+    def runTest(self):
+        output = io.StringIO()
+        results = imports.run(['compiler'], repeat=1, output=output)
+        self.assertGreater(results['compiler'], 0)
+        self.assertIn('compiler', output.getvalue())
+        # built-ins modules are not imported with the compiler
+        code = ('import sys\nimport pyksp.compiler as c\n'
+                'assert "bi_ui_controls" not in sys.modules\n'
+                'assert "pyperclip" not in sys.modules\n'
+                'c.kButton\n'
+                'assert "bi_ui_controls" in sys.modules\n'
+                'assert "os" not in c.__all__\n'
+                'assert "path" not in c.__all__\n'
+                'from pyksp.compiler.classic_builtins import message\n'
+                'assert "bi_engine_par" not in sys.modules')
+        self.assertGreater(imports.measure(code, repeat=1), 0)
+        # star import binds every name, so it imports all of them
+        code = ('import sys\n'
+                'from pyksp.compiler.classic_builtins import *\n'
+                'assert "bi_engine_par" in sys.modules\n'
+                'assert "os" not in dir()')
+        self.assertGreater(imports.measure(code, repeat=1), 0)
+
+
+if __name__ == '__main__':
+    t.main()
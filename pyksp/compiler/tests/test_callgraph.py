@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+import tempfile
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from callgraph import CallGraph
+
+
+code = '''on init
+declare $x
+end on
+function inner
+inc($x)
+end function
+function outer
+call inner
+if($x = 1)
+call inner
+end if
+end function
+on note
+call outer
+while($x < 10)
+call inner
+end while
+end on'''.split('\n')
+
+dot = r'''digraph calls {
+    "on init" [shape=box, label="on init\n1 lines"];
+    "function inner" [label="function inner\n1 lines, 3 calls"];
+    "function outer" [label="function outer\n4 lines, 1 calls"];
+    "on note" [shape=box, label="on note\n4 lines"];
+    "function outer" -> "function inner" [label="2"];
+    "on note" -> "function outer" [label="1"];
+    "on note" -> "function inner" [label="1"];
+}
+'''
+
+
+class TestCallGraph(DevTest):
+
+    def runTest(self):
+        program = build(code)
+        graph = CallGraph()
+        graph(program)
+        self.assertEqual(list(program.render()), code)
+        self.assertEqual(graph.nodes['function inner'],
+                         {'kind': 'function', 'lines': 1, 'calls': 3})
+        self.assertEqual(graph.edges,
+                         {('function outer', 'function inner'): 2,
+                          ('on note', 'function outer'): 1,
+                          ('on note', 'function inner'): 1})
+        self.assertEqual(graph.to_dot(), dot)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'calls.json')
+            CallGraph(path)(program)
+            with open(path) as f:
+                data = json.load(f)
+        self.assertEqual(data['nodes'][2], {'name': 'function outer',
+                                            'kind': 'function',
+                                            'lines': 4, 'calls': 1})
+        self.assertEqual(len(data['edges']), 3)
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,87 @@
+import io
+import os
+import sys
+import tempfile
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from cli import build
+from cli import discover
+from cli import _IsolatedPool
+
+
+script_source = '''from script import kScript
+from native_types import kInt
+
+script = kScript('{name}.txt', deterministic=True)
+
+
+def main():
+    x = kInt(1, '{name}')
+    x <<= {value}
+
+
+script.main = main
+script.compile()
+'''
+
+
+class TestBuild(DevTest):
+
+    def write(self, name, source):
+        with open(os.path.join(self.dir, name), 'w') as f:
+            f.write(source)
+
+    def build(self):
+        output = io.StringIO()
+        results = build([self.dir], jobs=2,
+                        state_file=os.path.join(self.dir, 'state.json'),
+                        output=output)
+        return {os.path.basename(r['target']): r['status']
+                for r in results}, output.getvalue()
+
+    def runTest(self):
+        self.dir = tempfile.mkdtemp()
+        self.write('first.py', script_source.format(name='first', value=2))
+        self.write('second.py', script_source.format(name='second', value=3))
+        self.write('helper.py', 'x = 1\n')
+        self.assertEqual([os.path.basename(p) for p in discover([self.dir])],
+                         ['first.py', 'second.py'])
+
+        statuses, table = self.build()
+        self.assertEqual(statuses, {'first.py': 'built', 'second.py': 'built'})
+        self.assertIn('2 targets: 2 built, 0 skipped, 0 failed', table)
+        with open(os.path.join(self.dir, 'second.txt')) as f:
+            self.assertIn('$second := 3', f.read())
+
+        self.write('second.py', script_source.format(name='second', value=4))
+        statuses, table = self.build()
+        self.assertEqual(statuses,
+                         {'first.py': 'skipped', 'second.py': 'built'})
+
+        self.write('first.py', 'from script import kScript\n'
+                   'kScript(None).compile()\n')
+        statuses, table = self.build()
+        self.assertEqual(statuses['first.py'], 'failed')
+        self.assertIn('Traceback', table)
+
+
+class TestIsolatedPool(DevTest):
+
+    def runTest(self):
+        with _IsolatedPool(1) as pool:
+            pids = [pool.submit(os.getpid).result() for _ in range(3)]
+            self.assertEqual(len(set(pids)), 3)
+            self.assertNotIn(os.getpid(), pids)
+            with self.assertRaises(ValueError):
+                pool.submit(int, 'x').result()
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from compile_cache import code_hash
+from compile_cache import CompileCache
+
+from functions import Function
+
+
+velocity = 10
+
+
+def body_a():
+    return velocity + 1
+
+
+def body_b():
+    return body_a()
+
+
+class FakeCallback:
+    _header = 'note'
+
+    def __init__(self, functions, lines, calls=0):
+        self.functions = functions
+        self.lines = lines
+        self.calls = calls
+        self.generated = 0
+
+    def generate_body(self):
+        self.generated += 1
+        Function._invocations += self.calls
+        return list(self.lines)
+
+
+class TestCodeHash(DevTest):
+
+    def runTest(self):
+        global velocity
+        h_a = code_hash(body_a)
+        h_b = code_hash(body_b)
+        self.assertEqual(h_a, code_hash(body_a))
+        self.assertNotEqual(h_a, h_b)
+        velocity = 11
+        try:
+            self.assertNotEqual(h_a, code_hash(body_a))
+            self.assertNotEqual(h_b, code_hash(body_b))
+        finally:
+            velocity = 10
+        self.assertEqual(h_b, code_hash(body_b))
+
+
+class TestCompileCache(DevTest):
+
+    def runTest(self):
+        directory = tempfile.mkdtemp()
+        cache = CompileCache(directory)
+        cache.update_context('on init')
+        cb = FakeCallback((body_a,), ['on note', 'message(1)', 'end on'])
+        self.assertEqual(cache.callback_body(cb), cb.lines)
+        self.assertEqual(cache.callback_body(cb), cb.lines)
+        self.assertEqual(cb.generated, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache = CompileCache(directory)
+        cache.update_context('on init')
+        cache.update_context('declare $x')
+        self.assertEqual(cache.callback_body(cb), cb.lines)
+        self.assertEqual(cb.generated, 2)
+
+        calling = FakeCallback((body_b,), ['call f'], calls=1)
+        cache.callback_body(calling)
+        cache.callback_body(calling)
+        self.assertEqual(calling.generated, 2)
+
+        cache.clear()
+        self.assertEqual(os.listdir(directory), [])
+
+
+if __name__ == '__main__':
+    t.main()
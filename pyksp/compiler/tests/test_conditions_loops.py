@@ -360,6 +360,53 @@ class TestForRange(DevTest, t.TestCase):
             out = unpack_lines(self.code)
             self.assertEqual(out, step_string)
 
+    def test_trace(self):
+        KSP.set_compiled(True)
+        x = kInt(name='x')
+        arr = kArrInt([0] * 32768, 'arr')
+        traced = list()
+        with For(32768) as name:
+            for i in name:
+                traced.append(i)
+                arr[i] <<= x
+        self.assertEqual(len(traced), 1)
+        self.assertIn('%arr[%_for_loop_idx[$_for_loop_curr_idx]] := $x',
+                      self.code)
+        with For(arr=arr) as seq:
+            for item in seq:
+                traced.append(item)
+                x <<= item
+        self.assertEqual(len(traced), 2)
+        self.assertTrue(KSP.is_simulated())
+        self.assertEqual(For.idx._get_runtime(), -1)
+
+    def test_unroll(self):
+        KSP.set_compiled(True)
+        x = kInt(name='x')
+        arr = kArrInt([1, 2, 3], 'arr')
+        with For(1, 6, 2, unroll=True) as seq:
+            for i in seq:
+                arr[i // 2] <<= x + i
+        with For(arr=arr, unroll=True) as seq:
+            for item in seq:
+                x <<= item
+        self.assertEqual(unpack_lines(self.code), unroll_string)
+        self.assertEqual(x._get_runtime(), 5)
+        with self.assertRaises(KspCondError):
+            For(x, unroll=True)
+        with self.assertRaises(KspCondError):
+            with For(3, unroll=True) as seq:
+                for i in seq:
+                    Break()
+
+
+unroll_string = '''%arr[0] := $x + 1
+%arr[1] := $x + 3
+%arr[2] := $x + 5
+$x := %arr[0]
+$x := %arr[1]
+$x := %arr[2]'''
+
 
 while_string = '''while($x # $y)
 if($y # 10)
@@ -400,10 +447,13 @@ class TestWhile(DevTest, t.TestCase):
                     check()
                     self.y <<= 10
                 self.x += 1
-        self.assertEqual(self.x._get_runtime(), self.y._get_runtime())
         if KSP.is_compiled():
+            # the loop body is traced once
+            self.assertEqual(self.x._get_runtime(), 0)
             out = unpack_lines(self.code)
             self.assertEqual(out, while_string)
+            return
+        self.assertEqual(self.x._get_runtime(), self.y._get_runtime())
 
 
 if __name__ == '__main__':
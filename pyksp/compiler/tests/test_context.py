@@ -0,0 +1,101 @@
+import os
+import sys
+import unittest as t
+import gc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from abstract import KSP
+from abstract import Output
+from abstract import KspObject
+from context import CompileContext
+from context import current_context
+from context import ContextInstanceAttr
+
+from script import kScript
+from native_types import kInt
+from native_types import kArrInt
+from bi_ui_controls import kKnob
+from conditions_loops import For
+from conditions_loops import If
+from conditions_loops import check
+from k_built_ins import message
+
+
+def make_script(prefix, size):
+    def main():
+        arr = kArrInt([1, 2, 3], name=prefix + 'arr')
+        for i in range(size):
+            x = kInt(i, prefix + str(i))
+            if i % 20 == 0:
+                kKnob(0, 100, 1, name=f'{prefix}knob{i}')
+            with For(arr=arr) as seq:
+                for item in seq:
+                    with If(item == i):
+                        check()
+                        x <<= item + 1
+                        message(x)
+    script = kScript(prefix + '.txt', deterministic=True)
+    script.main = main
+    return script
+
+
+def generate(script):
+    with CompileContext():
+        return list(script._generate_code())
+
+
+class TestContext(DevTest):
+
+    def test_state(self):
+        glob = current_context()
+        kInt(1, 'x')
+        count = len(KspObject.instances())
+        with CompileContext() as ctx:
+            self.assertIs(current_context(), ctx)
+            self.assertEqual(KspObject.instances(), [])
+            KSP.set_compiled(True)
+            Output().blocked = True
+            kInt(2, 'x')
+            self.assertEqual(len(KspObject.instances()), 1)
+        self.assertIs(current_context(), glob)
+        self.assertFalse(KSP.is_compiled())
+        self.assertFalse(Output().blocked)
+        self.assertEqual(len(KspObject.instances()), count)
+
+    def test_concurrent(self):
+        scripts = [make_script(prefix, 150) for prefix in ('va', 'vb', 'vc', 'vd')]
+        serial = [generate(script) for script in scripts]
+        with ThreadPoolExecutor(4) as pool:
+            concurrent = list(pool.map(generate, scripts))
+        self.assertEqual(serial, concurrent)
+
+    def test_instance_attr(self):
+        class Owner:
+            items = ContextInstanceAttr(lambda self: list())
+
+        obj = Owner()
+        ref = weakref.ref(obj)
+        with CompileContext() as ctx:
+            obj.items.append(1)
+            obj.items = [2]
+            self.assertEqual(obj.items, [2])
+        self.assertEqual(obj.items, [])
+        self.assertEqual(len(ctx._values), 1)
+        del obj
+        gc.collect()
+        # context does not keep objects alive
+        self.assertIsNone(ref())
+        self.assertEqual(ctx._values, {})
+        self.assertEqual(ctx._objects, {})
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,147 @@
+import os
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from ir import parse_expr
+from cse import CommonSubexpressions
+from cse import value_type
+from k_built_ins import BuiltInFunc
+from k_built_ins import message
+# pure functions of bi_misc are registered on import
+import bi_misc  # noqa
+
+from script import kScript
+from native_types import kInt
+from native_types import kArrInt
+
+
+code = '''on init
+declare $base
+declare %arr[10]
+declare $x
+end on
+on note
+$x := find_group("a") * ($EVENT_NOTE - $base)
+%arr[$EVENT_NOTE - $base + 1] := %arr[$EVENT_NOTE - $base + 1] + 1
+$base := 5
+$x := $EVENT_NOTE - $base
+if($x = 1)
+message(find_group("a") * ($EVENT_NOTE - $base))
+end if
+$x := find_group("a") * ($EVENT_NOTE - $base)
+wait(1)
+$x := $KSP_TIMER - $base + ($KSP_TIMER - $base)
+end on
+on release
+$x := random(1, 2) + random(1, 2)
+$x := $x + 1
+$x := $x + 1
+end on'''.split('\n')
+
+expected = '''on init
+declare $_cse0
+declare $_cse1
+declare $base
+declare %arr[10]
+declare $x
+end on
+on note
+$_cse1 := $EVENT_NOTE - $base
+$x := find_group("a") * $_cse1
+$_cse0 := $_cse1 + 1
+%arr[$_cse0] := %arr[$_cse0] + 1
+$base := 5
+$x := $EVENT_NOTE - $base
+if($x = 1)
+message(find_group("a") * ($EVENT_NOTE - $base))
+end if
+$x := find_group("a") * ($EVENT_NOTE - $base)
+wait(1)
+$x := $KSP_TIMER - $base + ($KSP_TIMER - $base)
+end on
+on release
+$x := random(1, 2) + random(1, 2)
+$x := $x + 1
+$x := $x + 1
+end on'''.split('\n')
+
+
+cheap = '''on init
+declare %arr[10]
+declare %idx[10]
+declare $ptr
+declare $x
+end on
+on note
+%arr[$x * 2 + %idx[$ptr]] := %arr[$x * 2 + %idx[$ptr]]
+%arr[0 + %idx[$ptr]] := 1
+$x := %arr[0 + %idx[$ptr]] + %idx[$ptr - 1]
+$x := %idx[$ptr - 1] - 1
+end on'''.split('\n')
+
+
+class TestPurity(DevTest):
+
+    def runTest(self):
+        self.assertTrue(BuiltInFunc.is_pure('find_group'))
+        self.assertTrue(BuiltInFunc.is_pure('sqrt'))
+        self.assertFalse(BuiltInFunc.is_pure('message'))
+        self.assertFalse(BuiltInFunc.is_pure('wait'))
+        self.assertFalse(BuiltInFunc.is_pure('random'))
+        self.assertEqual(BuiltInFunc.result_prefix('find_group'), '$')
+        self.assertEqual(BuiltInFunc.result_prefix('group_name'), '@')
+        self.assertEqual(BuiltInFunc.result_prefix('sqrt'), '~')
+
+        self.assertEqual(value_type(parse_expr('$x + %arr[1]')), '$')
+        self.assertEqual(value_type(parse_expr('~x * 2.0')), '~')
+        self.assertEqual(value_type(parse_expr('$x * 2.0')), None)
+        self.assertEqual(value_type(parse_expr('$x & "a"')), '@')
+        self.assertEqual(value_type(parse_expr('$x = 1')), None)
+        self.assertEqual(value_type(parse_expr('random(1, 2)')), None)
+
+
+class TestCommonSubexpressions(DevTest):
+
+    def test_program(self):
+        program = build(code)
+        cse = CommonSubexpressions()
+        cse(program)
+        self.assertEqual(list(program.render()), expected)
+        self.assertEqual(cse.temporaries, ['$_cse0', '$_cse1'])
+        self.assertEqual(cse.hoisted, 2)
+
+    def test_cheap(self):
+        program = build(cheap)
+        cse = CommonSubexpressions()
+        cse(program)
+        self.assertEqual(list(program.render()), cheap)
+        self.assertEqual(cse.temporaries, [])
+
+    def test_script(self):
+        def foo():
+            x = kInt(1, 'x')
+            y = kInt(2, 'y')
+            arr = kArrInt([0] * 10, 'arr')
+            x <<= (x + y) * 2
+            arr[x + y - 1] <<= x + y
+            message(x)
+
+        script = kScript(kScript.clipboard, deterministic=True,
+                         passes=[CommonSubexpressions()])
+        script.main = foo
+        lines = list(script._generate_code())
+        self.assertIn('declare $_cse0', lines)
+        self.assertIn('$_cse0 := $x + $y', lines)
+        self.assertIn('%arr[$_cse0 - 1] := $_cse0', lines)
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,141 @@
+import os
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from deadcode import DeadCode
+from deadcode import DeadStores
+from k_built_ins import message
+# pure functions of bi_misc are registered on import
+import bi_misc  # noqa
+
+from script import kScript
+from native_types import kInt
+
+
+code = '''on init
+declare $used
+declare $dead := 5
+declare %dead_arr[10]
+declare %sized[$dead]
+declare $id
+declare $counter
+declare ui_knob $knob (0, 100, 1)
+declare $saved
+declare $size := 4
+declare %by_size[$size]
+make_persistent($saved)
+read_persistent_var($saved)
+make_persistent($knob)
+%dead_arr[0] := $used + 1
+$dead := find_group("a")
+end on
+function unused
+message($used)
+call helper
+end function
+function helper
+$dead := 1
+end function
+function used_func
+message($used)
+end function
+on note
+$id := play_note(60, 100, 0, -1)
+$counter := $counter + 1
+$used := 1
+call used_func
+end on'''.split('\n')
+
+expected = '''on init
+declare $used
+declare $dead := 5
+declare %dead_arr[10]
+declare $id
+declare $counter
+declare ui_knob $knob (0, 100, 1)
+declare $saved
+make_persistent($saved)
+read_persistent_var($saved)
+make_persistent($knob)
+%dead_arr[0] := $used + 1
+$dead := find_group("a")
+end on
+function used_func
+message($used)
+end function
+on note
+$id := play_note(60, 100, 0, -1)
+$counter := $counter + 1
+$used := 1
+call used_func
+end on'''.split('\n')
+
+stores = '''on init
+declare $used
+declare $id
+declare ui_knob $knob (0, 100, 1)
+declare $saved
+make_persistent($saved)
+read_persistent_var($saved)
+make_persistent($knob)
+end on
+function used_func
+message($used)
+end function
+on note
+$id := play_note(60, 100, 0, -1)
+$used := 1
+call used_func
+end on'''.split('\n')
+
+
+class TestDeadCode(DevTest):
+
+    def test_program(self):
+        program = build(code)
+        dce = DeadCode()
+        dce(program)
+        self.assertEqual(list(program.render()), expected)
+        # stores and persistence calls are kept, %sized and
+        # %by_size are not referenced, $size only by %by_size
+        self.assertEqual(dce.declarations, ['%sized', '$size',
+                                            '%by_size'])
+        self.assertEqual(dce.functions, ['unused', 'helper'])
+        self.assertEqual(dce.removed, 3)
+
+    def test_stores(self):
+        program = build(code)
+        dse = DeadStores()
+        dse(program)
+        self.assertEqual(list(program.render()), stores)
+        self.assertEqual(dse.declarations, ['$dead', '%dead_arr',
+                                            '%sized', '$counter',
+                                            '$size', '%by_size'])
+        self.assertEqual(dse.functions, ['unused', 'helper'])
+        self.assertEqual(dse.removed, 9)
+
+    def test_script(self):
+        def foo():
+            x = kInt(1, 'x')
+            kInt(2, 'y')
+            message(x)
+
+        script = kScript(kScript.clipboard, deterministic=True,
+                         passes=[DeadCode()])
+        script.main = foo
+        lines = list(script._generate_code())
+        self.assertIn('declare $x := 1', lines)
+        self.assertNotIn('declare $y := 2', lines)
+        self.assertFalse([line for line in lines if '_stack_' in line])
+
+
+if __name__ == '__main__':
+    t.main()
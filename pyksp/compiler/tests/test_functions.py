@@ -28,6 +28,7 @@ from native_types import kArrStr
 from dev_tools import unpack_lines
 
 from conditions_loops import For
+from k_built_ins import NoteCallback
 
 
 class TestOut(DevTest):
@@ -289,5 +290,74 @@ class TestFuncRefresh(DevTest):
         self.assertEqual(generated, [])
 
 
+class TestNestedCall(DevTest):
+
+    def runTest(self):
+        @func
+        def inner(x: kInt):
+            x += 1
+
+        @func
+        def outer(x: kInt):
+            inner(x)
+
+        x = kInt(1, 'x')
+        KSP.set_compiled(True)
+        KSP.in_init(False)
+        NoteCallback.open()
+        outer(x)
+        self.assertIs(KSP.callback(), NoteCallback)
+        NoteCallback.close()
+        KSP.in_init(True)
+        KSP.set_compiled(False)
+
+
+class TestSort(DevTest):
+
+    def runTest(self):
+        @func
+        def first(x: kInt):
+            x += 1
+
+        @func
+        def second(x: kInt):
+            first(x)
+
+        @func
+        def third(x: kInt):
+            second(x)
+            first(x)
+
+        @func
+        def rec(x: kInt):
+            rec(x)
+
+        x = kInt(1, 'x')
+        KSP.set_compiled(True)
+        KSP.in_init(False)
+        NoteCallback.open()
+        third(x)
+        second(x)
+        funcs = [Function._functions[Function._get_key(f.__wrapped__)]
+                 for f in (third, second, first)]
+        self.assertEqual(sort_functions(funcs), funcs[::-1])
+        self.assertEqual(list(funcs[0]._calls), funcs[1:])
+
+        funcs[2]._calls[funcs[0]] = None
+        with self.assertRaises(KspRecursionError) as e:
+            sort_functions(funcs)
+        self.assertEqual(e.exception.path, funcs + [funcs[0]])
+        funcs[2]._calls.clear()
+
+        with self.assertRaises(KspRecursionError) as e:
+            rec(x)
+        self.assertEqual(len(e.exception.path), 2)
+        self.assertIn('recursive call detected', str(e.exception))
+        FuncCallsStack.stack.clear()
+        NoteCallback.close()
+        KSP.in_init(True)
+        KSP.set_compiled(False)
+
+
 if __name__ == '__main__':
     t.main()
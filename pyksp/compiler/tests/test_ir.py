@@ -0,0 +1,240 @@
+import os
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from ir import parse_expr
+from ir import walk
+from ir import KspIRError
+from ir import PassManager
+from ir import Assign
+from ir import BinOp
+from ir import Call
+from ir import CallFunction
+from ir import Declare
+from ir import FuncCall
+from ir import If
+from ir import Index
+from ir import Name
+from ir import Num
+from ir import Raw
+from ir import Select
+from ir import Str
+from ir import UnaryOp
+from ir import While
+
+from abstract import KSP
+from base_types import AstLogAnd
+from base_types import AstLogOr
+from script import kScript
+from native_types import kInt
+from conditions_loops import If as kIf
+from conditions_loops import check
+from k_built_ins import message
+from report import CompileReport
+
+
+code = '''{ Compiled with pyksp }
+on init
+declare $x := 1
+declare ui_knob $knob (0, 1000, 1)
+declare %arr[4] := (1, 2, 3, 4)
+$x := %arr[$x + 1] * (2 + $x)
+message("a, b := c")
+make_perfview
+while(1=1)
+if($x # 1 and not in_range($x, 1, 3))
+inc($x)
+else
+if($x = 2)
+dec($x)
+end if
+end if
+end while
+end on
+
+function foo
+select($x)
+case(1)
+call bar
+case(2 to 3)
+case(4)
+set_control_par($INST_ICON_ID,$CONTROL_PAR_HIDE,$HIDE_WHOLE_CONTROL)
+end select
+end function
+on note
+{ comment }
+end on'''.split('\n')
+
+
+class TestExpr(DevTest):
+
+    def runTest(self):
+        x = Name('$x')
+        self.assertEqual(parse_expr('$x + 2 * 3'),
+                         BinOp('+', x, BinOp('*', Num('2'), Num('3'))))
+        self.assertEqual(parse_expr('($x + 2) * 3'),
+                         BinOp('*', BinOp('+', x, Num('2')), Num('3')))
+        self.assertEqual(parse_expr('$x - 1 - 2'),
+                         BinOp('-', BinOp('-', x, Num('1')), Num('2')))
+        self.assertEqual(parse_expr('a = 1 or b = 2 and c # 3'),
+                         BinOp('or', BinOp('=', Name('a'), Num('1')),
+                               BinOp('and', BinOp('=', Name('b'), Num('2')),
+                                     BinOp('#', Name('c'), Num('3')))))
+        self.assertEqual(parse_expr('-%arr[$x mod 2]'),
+                         UnaryOp('-', Index('%arr',
+                                            BinOp('mod', x, Num('2')))))
+        self.assertEqual(parse_expr('not in_range($x, 1, 2)'),
+                         UnaryOp('not', FuncCall(
+                             'in_range', (x, Num('1'), Num('2')))))
+        self.assertEqual(Num('9Fh').value, 159)
+        self.assertEqual(Num('1.5').value, 1.5)
+        with self.assertRaises(KspIRError):
+            parse_expr('$x +')
+        with self.assertRaises(KspIRError):
+            parse_expr('foo(1, 2')
+
+        for text in ('$x - ($y - 1)', '($x - $y) - 1', '($a + $b) * -$c',
+                     '.not.($x .and. 3)', 'not ($a = 1 and $b = 2)',
+                     '!s[1] & "text" & ($x + 1)', 'a or b and c'):
+            with self.subTest(text=text):
+                expr = parse_expr(text)
+                self.assertEqual(parse_expr(expr.render()), expr)
+        self.assertEqual(parse_expr('($x - $y) - 1').render(), '$x - $y - 1')
+        self.assertEqual(parse_expr(r'"C:\dir\" & "text"'),
+                         BinOp('&', Str(r'"C:\dir\"'), Str('"text"')))
+
+        expr = parse_expr('$x + 1 * $y')
+        mapped = expr.map(lambda e: Num('2') if e == Name('$y') else e)
+        self.assertEqual(mapped.render(), '$x + 1 * 2')
+        self.assertEqual(expr.render(), '$x + 1 * $y')
+        self.assertIs(expr.map(lambda e: e), expr)
+        with self.assertRaises(AttributeError):
+            expr.op = '-'
+        self.assertEqual(len({parse_expr('$x + 1'), parse_expr('$x+1')}), 1)
+
+
+class TestPrecedence(DevTest):
+
+    def runTest(self):
+        KSP.set_compiled(True)
+        KSP.set_bool(True)
+        x = kInt(1, 'x')
+        y = kInt(2, 'y')
+        less = BinOp('<', Name('$x'), Name('$y'))
+        one = BinOp('=', Name('$x'), Num('1'))
+        two = BinOp('=', Name('$y'), Num('2'))
+        cases = (((x < y) | (x == 1)) & (y == 2),
+                 (x < y) | ((x == 1) & (y == 2)),
+                 AstLogAnd(AstLogOr(x < y, x == 1), y == 2),
+                 AstLogOr(x < y, AstLogAnd(x == 1, y == 2)))
+        trees = (BinOp('and', BinOp('or', less, one), two),
+                 BinOp('or', less, BinOp('and', one, two)))
+        for cond, tree in zip(cases, trees * 2):
+            with self.subTest(cond=cond.expand()):
+                self.assertEqual(parse_expr(cond.expand()), tree)
+        self.assertEqual(cases[0].expand(),
+                         '(($x < $y) or ($x = 1)) and ($y = 2)')
+        KSP.set_bool(False)
+
+
+class TestBuild(DevTest):
+
+    def runTest(self):
+        program = build(code)
+        self.assertEqual(list(program.render()), code)
+        self.assertEqual([b.header for b in program.blocks],
+                         ['on init', 'function foo', 'on note'])
+        self.assertEqual([b.name for b in program.functions()], ['foo'])
+
+        init = program.block('on init')
+        self.assertEqual([type(s) for s in init.body],
+                         [Declare, Declare, Declare, Assign, Call, Call,
+                          While])
+        self.assertEqual([s.name for s in init.body[:3]],
+                         ['$x', '$knob', '%arr'])
+        loop = init.body[-1]
+        cond = loop.body[0]
+        self.assertIsInstance(cond, If)
+        self.assertIsInstance(cond.orelse[0], If)
+        self.assertEqual(len(list(walk(init.body))), 11)
+
+        select = program.block('function foo').body[0]
+        self.assertIsInstance(select, Select)
+        self.assertEqual([c.value for c in select.cases],
+                         [Num('1'), None, Num('4')])
+        self.assertIsInstance(select.cases[0].body[0], CallFunction)
+        self.assertIsInstance(program.block('on note').body[0], Raw)
+
+        # changed statements are rendered from their fields
+        assign = init.body[3]
+        assign.value = Num('3')
+        init.body[0].name = '$y'
+        init.body[4:6] = []
+        cond.cond = BinOp('#', Name('$x'), Num('1'))
+        select.cases[2].body[0].expr = Name('make_perfview')
+        lines = list(program.render())
+        self.assertIn('$x := 3', lines)
+        self.assertIn('declare $y := 1', lines)
+        self.assertIn('if($x # 1)', lines)
+        self.assertIn('else', lines)
+        self.assertNotIn('make_perfview', lines[:12])
+        self.assertEqual(lines[-6], 'make_perfview')
+
+        for broken in (['on init', 'end if'], ['on init'],
+                       ['on init', 'if(1)', 'else', 'else', 'end if',
+                        'end on'],
+                       ['function foo', 'end on'], ['on init', 'case(1)',
+                                                   'end on']):
+            with self.subTest(lines=broken):
+                with self.assertRaises(KspIRError):
+                    build(broken)
+
+
+class TestPassManager(DevTest):
+
+    def runTest(self):
+        def drop_messages(program):
+            for block in program.blocks:
+                block.body[:] = [s for s in block.body if not (
+                    isinstance(s, Call) and s.expr.name == 'message'
+                    and s.expr.args == (Name('$x'),))]
+
+        def foo():
+            x = kInt(1, 'x')
+            message(x)
+            with kIf(x == 1):
+                check()
+                message('one')
+        script = kScript(kScript.clipboard, deterministic=True)
+        script.main = foo
+        self.assertEqual(script.passes.process(code), code)
+        plain = list(script._generate_code())
+        self.assertIn('message($x)', plain)
+
+        script.passes.add(drop_messages)
+        self.assertEqual(script.passes.names(), ['drop_messages'])
+        with CompileReport() as report:
+            lines = list(script._generate_code())
+        self.assertNotIn('message($x)', lines)
+        self.assertEqual(len(lines), len(plain) - 1)
+        self.assertIn('message("one")', lines)
+        self.assertIn('pass drop_messages', report.phases)
+        self.assertIn('building IR', report.phases)
+
+        replaced = PassManager([lambda program: build(['on init',
+                                                       'end on'])])
+        self.assertEqual(list(replaced.process(code)), ['on init', 'end on'])
+        script.passes.remove('drop_messages')
+        self.assertEqual(len(script.passes), 0)
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,140 @@
+import os
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from jumptable import JumpTable
+from conditions_loops import Select
+from conditions_loops import Case
+from conditions_loops import check
+from k_built_ins import message
+
+from script import kScript
+from native_types import kInt
+
+
+code = '''on init
+declare $art
+declare %arts[4]
+end on
+on note
+select($EVENT_NOTE)
+case(36)
+$art := 2
+case(37)
+$art := 0
+case(38)
+$art := 5
+case(39)
+$art := 1
+end select
+select(%arts[$art])
+case(-1)
+%arts[0] := 3
+case(0)
+case(2)
+%arts[0] := -1
+case(3)
+%arts[0] := 2
+end select
+select($EVENT_VELOCITY)
+case(36)
+$art := 2
+case(37)
+$art := 0
+case(38)
+$art := 5
+case(39)
+$art := 1
+end select
+select($art)
+case(1)
+$art := 2
+case(2)
+$art := 3
+case(10)
+$art := 4
+case(20)
+$art := 5
+end select
+select($art)
+case(1)
+$art := 2
+case(2)
+$art := 3
+case(3)
+message($art)
+case(4)
+$art := 5
+end select
+end on'''.split('\n')
+
+expected = '''on init
+declare %_jt0[4] := (2, 0, 5, 1)
+declare %_jt1[5] := (3, -2, -2, -1, 2)
+declare $art
+declare %arts[4]
+end on
+on note
+if($EVENT_NOTE >= 36 and $EVENT_NOTE <= 39)
+$art := %_jt0[$EVENT_NOTE - 36]
+end if
+if(%arts[$art] >= -1 and %arts[$art] <= 3)
+if(%_jt1[%arts[$art] + 1] # -2)
+%arts[0] := %_jt1[%arts[$art] + 1]
+end if
+end if
+if($EVENT_VELOCITY >= 36 and $EVENT_VELOCITY <= 39)
+$art := %_jt0[$EVENT_VELOCITY - 36]
+end if'''.split('\n')
+
+
+class TestJumpTable(DevTest):
+
+    def test_program(self):
+        program = build(code)
+        jt = JumpTable()
+        jt(program)
+        out = list(program.render())
+        self.assertEqual(out[:len(expected)], expected)
+        # sparse select and select with call are left as is
+        self.assertEqual(out[len(expected):], code[-21:])
+        self.assertEqual(jt.tables, {'%_jt0': (2, 0, 5, 1),
+                                     '%_jt1': (3, -2, -2, -1, 2)})
+        self.assertEqual(jt.lowered, 3)
+
+        program = build(code)
+        JumpTable(min_cases=5)(program)
+        self.assertEqual(list(program.render()), code)
+
+    def test_script(self):
+        articulations = {60: 1, 61: 3, 62: 0, 63: 2, 65: 1}
+
+        def foo():
+            x = kInt(0, 'x')
+            art = kInt(0, 'art')
+            with Select(x):
+                for note, value in articulations.items():
+                    with Case(note):
+                        check()
+                        art <<= value
+            message(art)
+
+        script = kScript(kScript.clipboard, deterministic=True,
+                         passes=[JumpTable()])
+        script.main = foo
+        lines = list(script._generate_code())
+        self.assertIn('declare %_jt0[6] := (1, 3, 0, 2, -1, 1)', lines)
+        self.assertIn('$art := %_jt0[$x - 60]', lines)
+        self.assertNotIn('select($x)', lines)
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import textwrap
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from line_wrap import wrap
+
+
+def text_wrap(line, width):
+    new = textwrap.wrap(line, width, break_long_words=False,
+                        subsequent_indent='    ')
+    for idx in range(len(new) - 1):
+        new[idx] += '...'
+    return new
+
+
+class TestWrap(DevTest):
+
+    def test_as_textwrap(self):
+        lines = [
+            'declare %arr[100] := (' +
+            ', '.join(str(i) for i in range(100)) + ')',
+            'set_control_par(%_all_ui_ids[$idx], $CONTROL_PAR_POS_X, ' +
+            '%_all_x_params[$idx] + %_all_width_params[$idx])',
+            'if(($x < $y) or ($x = 1) or ($y = 2) or ($x + $y = 3))']
+        for line in lines:
+            for width in (40, 60, 79):
+                with self.subTest(line=line, width=width):
+                    self.assertEqual(wrap(line, width),
+                                     text_wrap(line, width))
+
+    def test_strings(self):
+        line = 'set_control_par_str(%_all_ui_ids[0], $CONTROL_PAR_TEXT, ' + \
+            '"long text with spaces, commas (and brackets)")'
+        out = wrap(line, 40)
+        self.assertEqual(out, [
+            'set_control_par_str(%_all_ui_ids[0],...',
+            '    $CONTROL_PAR_TEXT,...',
+            '    "long text with spaces, commas (and brackets)")'])
+        self.assertEqual(' '.join(l.rstrip('.').strip() for l in out),
+                         line)
+        self.assertEqual(wrap('{ a comment, which is longer } $x', 10),
+                         ['{ a comment, which is longer }...', '    $x'])
+        # KSP strings have no escapes, backslash ends no string
+        line = r'message("C:\dir\" & "some other text which is long")'
+        self.assertEqual(wrap(line, 30), [
+            r'message("C:\dir\" &...',
+            '    "some other text which is long")'])
+
+    def test_long_words(self):
+        line = 'set_control_par(%_all_ui_ids[%_for_loop_idx[' + \
+            '$_for_loop_curr_idx]],$CONTROL_PAR_POS_X,"a, (b")'
+        out = wrap(line, 30)
+        self.assertEqual(out, [
+            'set_control_par(%_all_ui_ids[...',
+            '    %_for_loop_idx[...',
+            '    $_for_loop_curr_idx]],...',
+            '    $CONTROL_PAR_POS_X,...',
+            '    "a, (b")'])
+        self.assertEqual(''.join(l.rstrip('.').strip() for l in out), line)
+
+
+if __name__ == '__main__':
+    t.main()
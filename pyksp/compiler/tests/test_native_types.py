@@ -265,6 +265,59 @@ class TestNativeArrays(DevTest):
         big_arr = kArrInt(big)
         self.assertEqual(big_arr[3]._get_runtime(), 3)
 
+    def test_items(self):
+        KSP.set_compiled(True)
+        arr = kArrInt([5, 5, 7], 'arr')
+        x = kInt(0, 'x')
+        y = kInt(1, 'y')
+        # runtime values of items are equal, names are not
+        self.assertEqual((arr[x] + arr[y]).expand(), '%arr[$x] + %arr[$y]')
+        self.assertEqual((arr[x] + arr[y]).get_value(), 10)
+        item = arr[y]
+        y <<= 2
+        Output().pop()
+        self.assertEqual(item.val, '%arr[$y]')
+        self.assertEqual(item._get_runtime(), 5)
+        self.assertIsInstance(item, kInt)
+        self.assertNotIsInstance(item, kArrInt)
+
+        arr[x] <<= arr[y]
+        self.assertEqual(Output().pop(), '%arr[$x] := %arr[$y]')
+        self.assertEqual(arr._get_runtime(), [7, 5, 7])
+        arr[2] += 1
+        self.assertEqual(Output().pop(), '%arr[2] := %arr[2] + 1')
+        self.assertEqual(arr[2]._get_runtime(), 8)
+        x <<= arr[1]
+        self.assertEqual(Output().pop(), '$x := %arr[1]')
+        self.assertEqual(x._get_runtime(), 5)
+        self.assertEqual((x == arr[1]).expand(), '$x = %arr[1]')
+
+        KSP.set_simulated(False)
+        self.assertEqual(arr[x]._get_runtime(), 0)
+        arr[x] <<= 3
+        self.assertEqual(Output().pop(), '%arr[$x] := 3')
+        self.assertEqual(arr._get_runtime(), [7, 5, 8])
+
+    def test_storage(self):
+        KSP.set_compiled(True)
+        x = kInt(3, 'x')
+        ints = kArrInt([1, x], 'ints', size=4)
+        self.assertEqual(ints._seq.typecode, 'i')
+        self.assertEqual(ints._get_runtime(), [1, 3, 0, 0])
+        ints[1] <<= 2 ** 31
+        Output().pop()
+        self.assertEqual(ints[1]._get_runtime(), -2 ** 31)
+        self.assertEqual(list(ints.iter_runtime_fast()),
+                         [1, -2 ** 31, 0, 0])
+
+        reals = kArrReal(size=2)
+        self.assertEqual(reals._seq.typecode, 'd')
+        self.assertEqual(list(reals.runtime_values()), [0.0, 0.0])
+
+        strs = kArrStr(size=2)
+        self.assertIsInstance(strs._seq, list)
+        self.assertEqual(strs.runtime_values(), ['', ''])
+
     def test_real(self):
         KSP.set_compiled(True)
         x = kArrReal()
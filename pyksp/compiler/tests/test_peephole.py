@@ -0,0 +1,277 @@
+import os
+import re
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from ir import parse_expr
+from peephole import Peephole
+from peephole import constant
+from optimizer import level_passes
+from k_built_ins import message
+# pure functions of bi_misc are registered on import
+import bi_misc  # noqa
+
+from script import kScript
+from native_types import kInt
+from conditions_loops import If
+from conditions_loops import Else
+from conditions_loops import check
+from functions import func
+from stack import kLoc
+import callbacks as on
+
+
+code = '''on init
+declare $x
+declare %arr[10]
+end on
+on note
+$x := $x + 1
+$x := 1 + $x
+$x := $x - 1
+%arr[$x] := %arr[$x] + 1
+%arr[random(0, 9)] := %arr[random(0, 9)] + 1
+$x := $x
+if(1 = 1)
+$x := 2
+end if
+if(1 = 2 and $x = 1)
+$x := 3
+else
+$x := $x
+end if
+if($x = 1)
+else
+message($x)
+end if
+if($x = 2)
+message($x)
+else
+end if
+while(1 # 1)
+message($x)
+end while
+find_group("a")
+end on'''.split('\n')
+
+expected = '''on init
+declare $x
+declare %arr[10]
+end on
+on note
+inc($x)
+inc($x)
+dec($x)
+inc(%arr[$x])
+%arr[random(0, 9)] := %arr[random(0, 9)] + 1
+$x := 2
+if(not $x = 1)
+message($x)
+end if
+if($x = 2)
+message($x)
+end if
+end on'''.split('\n')
+
+
+chain = '''on note
+if($x = 1)
+message(1)
+else
+if($x = -2)
+message(2)
+else
+if($x = 3)
+message(3)
+end if
+end if
+end if
+if($x = 1)
+message(1)
+else
+if(1 = $x)
+message(2)
+end if
+end if
+if($x = 1)
+message(1)
+else
+if($y > 2)
+message(2)
+else
+if($y = 2)
+message(3)
+else
+if($y = 3)
+end if
+end if
+end if
+end if
+end on'''.split('\n')
+
+flat_chain = '''on note
+select($x)
+case(1)
+message(1)
+case(-2)
+message(2)
+case(3)
+message(3)
+end select
+if($x = 1)
+message(1)
+else
+if(1 = $x)
+message(2)
+end if
+end if
+if($x = 1)
+message(1)
+else
+if($y > 2)
+message(2)
+else
+select($y)
+case(2)
+message(3)
+case(3)
+end select
+end if
+end if
+end on'''.split('\n')
+
+
+class TestConstant(DevTest):
+
+    def runTest(self):
+        self.assertTrue(constant(parse_expr('1 = 1')))
+        self.assertFalse(constant(parse_expr('1 > 2')))
+        self.assertFalse(constant(parse_expr('1 = 2 and $x = 1')))
+        self.assertTrue(constant(parse_expr('$x = 1 or 2 >= 1')))
+        self.assertTrue(constant(parse_expr('not 1 = 2')))
+        self.assertIsNone(constant(parse_expr('$x = 1 and 1 = 1')))
+        self.assertIsNone(constant(parse_expr('$x = 1')))
+
+
+class TestPeephole(DevTest):
+
+    def test_program(self):
+        program = build(code)
+        peephole = Peephole()
+        peephole(program)
+        self.assertEqual(list(program.render()), expected)
+        self.assertEqual(peephole.fired, {'self_assignment': 2,
+                                          'increment': 4,
+                                          'constant_condition': 3,
+                                          'empty_if': 2,
+                                          'unused_result': 1,
+                                          'elif_chain': 0})
+
+    def test_rules(self):
+        program = build(code)
+        peephole = Peephole(['increment'])
+        peephole(program)
+        self.assertEqual(peephole.fired, {'increment': 4})
+        self.assertIn('$x := $x', list(program.render()))
+        with self.assertRaises(KeyError):
+            Peephole(['unknown'])
+
+    def test_elif_chain(self):
+        program = build(chain)
+        peephole = Peephole(['elif_chain'])
+        peephole(program)
+        self.assertEqual(list(program.render()), flat_chain)
+        self.assertEqual(peephole.fired, {'elif_chain': 3})
+
+        def foo():
+            x = kInt(1, 'x')
+            with If(x == 1):
+                check()
+                message(1)
+            for value in range(2, 30):
+                with Else(x == value):
+                    check()
+                    message(value)
+            message(x)
+
+        script = kScript(kScript.clipboard, deterministic=True,
+                         optimize=1)
+        script.main = foo
+        lines = list(script._generate_code())
+        self.assertIn('select($x)', lines)
+        self.assertIn('case(29)', lines)
+        self.assertNotIn('end if', lines)
+
+    def test_levels(self):
+        self.assertEqual(level_passes(0), [])
+        self.assertEqual([p.name for p in level_passes(2)],
+                         ['unroll', 'peephole', 'jumptable', 'cse',
+                          'dce'])
+        with self.assertRaises(ValueError):
+            kScript(kScript.clipboard, optimize=5)
+
+    def test_script(self):
+        def foo():
+            x = kInt(1, 'x')
+            x <<= x + 1
+            with If(x == 2):
+                message(x)
+            with Else():
+                x <<= x
+        script = kScript(kScript.clipboard, deterministic=True,
+                         optimize=1)
+        script.main = foo
+        lines = list(script._generate_code())
+        self.assertIn('inc($x)', lines)
+        self.assertNotIn('$x := $x', lines)
+        self.assertNotIn('else', lines)
+        fired = script.optimizers[-1].fired
+        self.assertEqual(fired['increment'], 1)
+        self.assertEqual(fired['self_assignment'], 1)
+
+    def test_level2(self):
+        @func
+        def helper(x: kInt):
+            message(x)
+
+        @func
+        def outer(a=kLoc(int)):
+            a <<= 1
+            helper(a)
+
+        def foo():
+            x = kInt(2, 'x')
+            y = kInt(3, 'y')
+            z = kInt(0, 'z')
+            z <<= x * y + 1
+            z <<= z + x * y
+
+            @on.note
+            def note_cb():
+                outer()
+
+        script = kScript(kScript.clipboard, deterministic=True,
+                         max_line_length=None, optimize=2)
+        script.main = foo
+        code = '\n'.join(script._generate_code())
+        self.assertIn('declare $_cse0', code)
+        # every temporary, written by callback or function, is read by it
+        blocks = re.findall(r'^(?:on|function) .*?^end (?:on|function)$',
+                            code, re.M | re.S)
+        for block in blocks:
+            for name in set(re.findall(r'^(\$_cse\d+) :=', block, re.M)):
+                with self.subTest(block=block.split('\n')[0], name=name):
+                    reads = re.findall(re.escape(name) + r'(?! :=)', block)
+                    self.assertTrue(reads)
+
+
+if __name__ == '__main__':
+    t.main()
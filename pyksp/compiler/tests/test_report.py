@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import tempfile
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from context import CompileContext
+from report import CompileReport
+from report import measure
+
+from script import kScript
+from native_types import kInt
+from functions import func
+from k_built_ins import message
+import callbacks as on
+
+
+class TestReport(DevTest):
+
+    def runTest(self):
+        with measure('phase') as stats:
+            stats.add_lines(1)
+        self.assertIsNone(CompileReport.current)
+
+        @func
+        def show(x: kInt):
+            message(x)
+
+        def main():
+            x = kInt(1, 'x')
+
+            @on.note
+            def note_cb():
+                x.inc()
+                show(x)
+
+        out_file = os.path.join(tempfile.mkdtemp(), 'out.txt')
+        script = kScript(out_file, 'reported', deterministic=True)
+        script.main = main
+        with CompileContext():
+            report = script.compile(report=True)
+        self.assertIsInstance(report, CompileReport)
+        with open(out_file) as f:
+            lines = f.read().splitlines()
+
+        data = json.loads(report.to_json())
+        self.assertEqual(data['script'], 'reported')
+        self.assertEqual(data['total']['lines'], len(lines))
+        phases = {p['name']: p for p in data['phases']}
+        self.assertIn('getting inits of declared objects', phases)
+        self.assertEqual(phases['wrapping long lines']['lines'], len(lines))
+        for phase in phases.values():
+            self.assertLessEqual(phase['time'], data['total']['time'])
+            self.assertLessEqual(phase['self_time'], phase['time'])
+            self.assertGreaterEqual(phase['peak'], 0)
+        callbacks = {c['name']: c for c in data['callbacks']}
+        self.assertEqual(callbacks['note']['lines'], 7)
+        self.assertGreater(callbacks['note']['puts'], 0)
+        functions = {f['name']: f for f in data['functions']}
+        self.assertEqual(len(functions), 1)
+        self.assertEqual(list(functions.values())[0]['lines'], 3)
+        self.assertIn('note', str(report))
+
+
+if __name__ == '__main__':
+    t.main()
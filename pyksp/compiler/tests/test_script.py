@@ -2,6 +2,7 @@ import os
 import sys
 import unittest as t
 import time
+import tempfile
 
 path = os.path.abspath(os.path.dirname(__file__)) + '/..'
 sys.path.append(path)
@@ -36,6 +37,11 @@ from callbacks import init
 from functions import func
 from functions import kArg
 
+from native_types import kInt
+from native_types import kArrInt
+from conditions_loops import While
+from bi_misc import in_range
+
 from dev_tools import unpack_lines
 
 
@@ -107,6 +113,106 @@ class TestScript(DevTest):
             fname=Function.get_func_name(self.switch)))
 
 
+class TestCompile(DevTest):
+
+    def runTest(self):
+        def foo():
+            kInt(2, 'x')
+        script = kScript(os.path.join(tempfile.mkdtemp(), 'out.txt'),
+                         'myscript')
+        script.main = foo
+        code = script._generate_code()
+        self.assertIs(iter(code), code)
+        lines = list(code)
+        self.assertEqual(lines[1:4], ['on init',
+                                      'set_script_title("myscript")',
+                                      'declare %_stack_functions_int_arr[32000]'])
+        self.assertIn('declare $x := 2', lines)
+        self.assertEqual(lines[-1], 'end on')
+
+        class Sink:
+            chunks = list()
+
+            def write(self, data):
+                self.chunks.append(data)
+        kScript._write_code(iter(lines), Sink(), chunk_size=3)
+        self.assertEqual(len(Sink.chunks), -(-len(lines) // 3))
+        self.assertEqual(''.join(Sink.chunks), '\n'.join(lines) + '\n')
+
+        script.main = foo
+        script.compile()
+        with open(script._file, newline='') as f:
+            compiled = f.read()
+        self.assertTrue(compiled.endswith('end on\n'))
+        self.assertEqual(compiled.splitlines()[1:4], lines[1:4])
+        self.assertIn('declare $x := 2\n', compiled)
+
+        # the error of not created temporary file is not masked
+        script = kScript(os.path.join(tempfile.mkdtemp(), 'no', 'out.txt'))
+        script.main = foo
+        with self.assertRaises(FileNotFoundError) as error:
+            script.compile()
+        self.assertIsNone(error.exception.__context__)
+
+
+class TestShortest(DevTest):
+
+    def runTest(self):
+        def foo():
+            rare = kInt(1, 'rare')
+            often = kInt(2, 'often')
+            often <<= often + rare
+            message(often)
+        script = kScript(kScript.clipboard, compact='shortest')
+        script.main = foo
+        lines = list(script._generate_code())
+        self.assertIn('declare $b := 1', lines)
+        self.assertIn('declare $a := 2', lines)
+        self.assertIn('$a := $a + $b', lines)
+        self.assertIn('message($a)', lines)
+        self.assertFalse(any('\x00' in line for line in lines))
+
+
+class TestSimulate(DevTest):
+
+    def runTest(self):
+        variables = dict()
+
+        def foo():
+            x = kInt(1, 'x')
+            y = kInt(0, 'y')
+            arr = kArrInt([1, 2, 3], 'arr')
+            variables['x'] = x
+            with For(3) as seq:
+                for idx in seq:
+                    arr[idx] <<= arr[idx] + x
+            with For(arr=arr) as seq:
+                for item in seq:
+                    y += item
+            with While() as w:
+                while w(lambda: x < 10):
+                    x += 1
+            # loops are not simulated under compilation
+            x += 9
+            arr[x - 8] <<= in_range(y, 0, x) + 1
+            message(arr[0] + arr[1])
+
+        def generate(simulate):
+            script = kScript(kScript.clipboard, deterministic=True,
+                             simulate=simulate)
+            script.main = foo
+            lines = list(script._generate_code())
+            # callbacks of other modules can depend on runtime values
+            start = lines.index('declare $x := 1')
+            end = lines.index('message(%arr[0] + %arr[1])')
+            return lines[start:end + 1]
+
+        simulated = generate(True)
+        self.assertEqual(variables['x']._get_runtime(), 10)
+        self.assertEqual(generate(False), simulated)
+        self.assertEqual(variables['x']._get_runtime(), 1)
+
+
 generated_code = \
     '''{init_line}
 on init
@@ -132,8 +132,8 @@ class TestStack(DevTest):
         self.assertIsInstance(returned, StackFrameArray)
         self.assertEqual(
             returned[1].val,
-            '%_stack_test_arr[1 + (0 + ' +
-            '%_stack_test_idx[$_stack_test_pointer])]')
+            '%_stack_test_arr[' +
+            '%_stack_test_idx[$_stack_test_pointer] + 1]')
         idx = kInt(4)
         self.assertEqual(
             returned[idx].val,
@@ -147,8 +147,8 @@ class TestStack(DevTest):
         self.assertIsInstance(returned, StackFrameArray)
         self.assertEqual(
             returned[1].val,
-            '%_stack_test_arr[1 + (0 + ' +
-            '%_stack_test_idx[$_stack_test_pointer])]')
+            '%_stack_test_arr[' +
+            '%_stack_test_idx[$_stack_test_pointer] + 1]')
         idx = kInt(4)
         self.assertEqual(returned[idx].val,
                          '%_stack_test_arr[$kInt1 + (0 + ' +
@@ -185,8 +185,9 @@ class TestStack(DevTest):
                     '%_stack_test_arr[%_for_loop_idx[' +
                     f'$_for_loop_curr_idx] + (2 + ' +
                     '%_stack_test_idx[$_stack_test_pointer])]')
-                self.assertEqual(var._get_runtime(),
-                                 arr[idx]._get_runtime())
+        for idx in range(len(arr)):
+            self.assertEqual(ret_arr[idx]._get_runtime(),
+                             arr[idx]._get_runtime())
         if KSP.is_compiled():
             # print(unpack_lines(Output().get()))
             self.assertEqual(unpack_lines(Output().get()), push_output)
@@ -275,12 +276,12 @@ class TestMultiStack(DevTest):
                          '%_stack_test_int_idx[$_stack_test_int_pointer]]')
         self.assertEqual(_int2._get_runtime(), 2)
         self.assertEqual(_int_arr[0].val,
-                         '%_stack_test_int_arr[0 + (2 + ' +
-                         '%_stack_test_int_idx[$_stack_test_int_pointer])]')
+                         '%_stack_test_int_arr[' +
+                         '%_stack_test_int_idx[$_stack_test_int_pointer] + 2]')
         self.assertEqual(_int_arr[0]._get_runtime(), 3)
         self.assertEqual(_int_arr[1].val,
-                         '%_stack_test_int_arr[1 + (2 + ' +
-                         '%_stack_test_int_idx[$_stack_test_int_pointer])]')
+                         '%_stack_test_int_arr[' +
+                         '%_stack_test_int_idx[$_stack_test_int_pointer] + 3]')
         self.assertEqual(_int_arr[1]._get_runtime(), 4)
 
         self.assertEqual(_str1.val,
@@ -292,12 +293,12 @@ class TestMultiStack(DevTest):
                          '%_stack_test_str_idx[$_stack_test_str_pointer]]')
         self.assertEqual(_str2._get_runtime(), '2')
         self.assertEqual(_str_arr[0].val,
-                         '!_stack_test_str_arr[0 + (2 + ' +
-                         '%_stack_test_str_idx[$_stack_test_str_pointer])]')
+                         '!_stack_test_str_arr[' +
+                         '%_stack_test_str_idx[$_stack_test_str_pointer] + 2]')
         self.assertEqual(_str_arr[0]._get_runtime(), '3')
         self.assertEqual(_str_arr[1].val,
-                         '!_stack_test_str_arr[1 + (2 + ' +
-                         '%_stack_test_str_idx[$_stack_test_str_pointer])]')
+                         '!_stack_test_str_arr[' +
+                         '%_stack_test_str_idx[$_stack_test_str_pointer] + 3]')
         self.assertEqual(_str_arr[1]._get_runtime(), '4')
 
         self.assertEqual(
@@ -312,13 +313,13 @@ class TestMultiStack(DevTest):
         self.assertEqual(_real2._get_runtime(), 2.0)
         self.assertEqual(
             _real_arr[0].val,
-            '?_stack_test_real_arr[0 + (2 + ' +
-            '%_stack_test_real_idx[$_stack_test_real_pointer])]')
+            '?_stack_test_real_arr[' +
+            '%_stack_test_real_idx[$_stack_test_real_pointer] + 2]')
         self.assertEqual(_real_arr[0]._get_runtime(), 3.0)
         self.assertEqual(
             _real_arr[1].val,
-            '?_stack_test_real_arr[1 + (2 + ' +
-            '%_stack_test_real_idx[$_stack_test_real_pointer])]')
+            '?_stack_test_real_arr[' +
+            '%_stack_test_real_idx[$_stack_test_real_pointer] + 3]')
         self.assertEqual(_real_arr[1]._get_runtime(), 4.0)
 
         Output().refresh()
@@ -0,0 +1,128 @@
+import os
+import sys
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from ir import build
+from unroll import Unroll
+from conditions_loops import For
+from conditions_loops import Break
+from conditions_loops import check
+from conditions_loops import If
+
+from script import kScript
+from native_types import kInt
+from native_types import kArrInt
+
+
+code = '''on note
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := 0
+while(%_for_loop_idx[$_for_loop_curr_idx] < 2)
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := 1
+while(%_for_loop_idx[$_for_loop_curr_idx] < 5)
+%arr[%_for_loop_idx[$_for_loop_curr_idx] - 1] := $x
+%_for_loop_idx[$_for_loop_curr_idx] := %_for_loop_idx[\
+$_for_loop_curr_idx] + 2
+end while
+dec($_for_loop_curr_idx)
+$x := $x + %_for_loop_idx[$_for_loop_curr_idx]
+inc(%_for_loop_idx[$_for_loop_curr_idx])
+end while
+dec($_for_loop_curr_idx)
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := 0
+while(%_for_loop_idx[$_for_loop_curr_idx] < 100)
+$x := $x + 1
+inc(%_for_loop_idx[$_for_loop_curr_idx])
+end while
+dec($_for_loop_curr_idx)
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := 0
+while(%_for_loop_idx[$_for_loop_curr_idx] < 2)
+%_for_loop_idx[$_for_loop_curr_idx] := 2
+inc(%_for_loop_idx[$_for_loop_curr_idx])
+end while
+dec($_for_loop_curr_idx)
+end on'''.replace('\\\n', '').split('\n')
+
+expected = '''on note
+%arr[0] := $x
+%arr[2] := $x
+$x := $x + 0
+%arr[0] := $x
+%arr[2] := $x
+$x := $x + 1
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := 0
+while(%_for_loop_idx[$_for_loop_curr_idx] < 100)
+$x := $x + 1
+inc(%_for_loop_idx[$_for_loop_curr_idx])
+end while
+dec($_for_loop_curr_idx)
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := 0
+while(%_for_loop_idx[$_for_loop_curr_idx] < 2)
+%_for_loop_idx[$_for_loop_curr_idx] := 2
+inc(%_for_loop_idx[$_for_loop_curr_idx])
+end while
+dec($_for_loop_curr_idx)
+end on'''.split('\n')
+
+
+class TestUnroll(DevTest):
+
+    def test_program(self):
+        For.init_arrays()
+        program = build(code)
+        unroll = Unroll()
+        unroll(program)
+        self.assertEqual(list(program.render()), expected)
+        # nested loop is unrolled first, the loop, changing its
+        # index (with Break()) is not considered
+        self.assertEqual(unroll.loops, [
+            {'trips': 2, 'lines': (7, 2), 'executed': (10, 2),
+             'unrolled': True},
+            {'trips': 2, 'lines': (9, 6), 'executed': (14, 6),
+             'unrolled': True},
+            {'trips': 100, 'lines': (7, 100), 'executed': (304, 100),
+             'unrolled': False}])
+
+    def test_threshold(self):
+        For.init_arrays()
+        program = build(code)
+        unroll = Unroll(threshold=1)
+        unroll(program)
+        self.assertEqual(list(program.render()), code)
+        self.assertFalse(any(loop['unrolled'] for loop in unroll.loops))
+
+    def test_script(self):
+        def foo():
+            x = kInt(0, 'x')
+            arr = kArrInt([1, 2, 3], 'arr')
+            with For(arr=arr) as seq:
+                for item in seq:
+                    with If(item > x):
+                        check()
+                        x <<= item
+                        Break()
+
+        script = kScript(kScript.clipboard, deterministic=True,
+                         optimize=2)
+        script.main = foo
+        lines = list(script._generate_code())
+        # loop with Break() is not unrolled
+        self.assertIn('while(%_for_loop_idx[$_for_loop_curr_idx] < 3)',
+                      lines)
+        self.assertEqual(script.optimizers[0].loops, [])
+
+
+if __name__ == '__main__':
+    t.main()
@@ -0,0 +1,102 @@
+import io
+import os
+import site
+import sys
+import tempfile
+import unittest as t
+
+path = os.path.abspath(os.path.dirname(__file__)) + '/..'
+sys.path.append(path)
+path = os.path.abspath(os.path.dirname(__file__))
+sys.path.append(path)
+
+from mytests import DevTest
+
+from watch import Watcher
+from functions import Function
+from cli import _is_local
+
+
+script_source = '''from script import kScript
+from native_types import kInt
+from functions import func
+import callbacks as on
+
+from watch_helper import VALUE
+
+script = kScript('watched.txt', deterministic=True)
+
+
+@func
+def step(x: kInt):
+    x += 1
+
+
+def main():
+    x = kInt(VALUE, 'x')
+
+    @on.note
+    def note_cb():
+        step(x)
+
+
+script.main = main
+script.watch()
+'''
+
+
+class TestWatcher(DevTest):
+
+    def write(self, name, source):
+        file = os.path.join(self.dir, name)
+        with open(file, 'w') as f:
+            f.write(source)
+        # mtime resolution of some file systems is too coarse
+        stat = os.stat(file)
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def read(self):
+        with open(os.path.join(self.dir, 'watched.txt')) as f:
+            return f.read()
+
+    def test_rebuild(self):
+        self.dir = tempfile.mkdtemp()
+        self.write('watched.py', script_source)
+        self.write('watch_helper.py', 'VALUE = 1\n')
+        output = io.StringIO()
+        watcher = Watcher(os.path.join(self.dir, 'watched.py'),
+                          output=output)
+
+        result = watcher.build()
+        self.assertIsNone(result['error'])
+        self.assertIn('declare $x := 1', self.read())
+        self.assertEqual(watcher.changed(), [])
+        self.assertIn(os.path.join(self.dir, 'watch_helper.py'),
+                      result['inputs'])
+
+        self.write('watch_helper.py', 'VALUE = 2\n')
+        self.assertEqual(watcher.changed(),
+                         [os.path.join(self.dir, 'watch_helper.py')])
+        watcher.run(builds=1)
+        self.assertIn('declare $x := 2', self.read())
+        self.assertEqual(self.read().count('function '), 1)
+        # functions of rebuilds are registered in their contexts
+        self.assertFalse([key for key in Function._functions
+                          if 'step' in key])
+        self.assertEqual(watcher.changed(), [])
+        self.assertIn('compiled to', output.getvalue())
+
+        self.write('watch_helper.py', 'VALUE = \n')
+        result = watcher.build()
+        self.assertIn('SyntaxError', result['error'])
+        self.assertIn('failed', output.getvalue())
+
+    def test_installed(self):
+        path = os.path.join(site.getusersitepackages(), 'module.py')
+        self.assertFalse(_is_local(path))
+        self.assertFalse(_is_local(os.__file__))
+        self.assertTrue(_is_local(__file__))
+
+
+if __name__ == '__main__':
+    t.main()
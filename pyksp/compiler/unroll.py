@@ -0,0 +1,225 @@
+'''loop unrolling pass.
+
+For(start, stop, step) and For(arr=...) loops with int bounds are
+generated as while loops over the shared %_for_loop_idx array:
+
+inc($_for_loop_curr_idx)
+%_for_loop_idx[$_for_loop_curr_idx] := start
+while(%_for_loop_idx[$_for_loop_curr_idx] < stop)
+    body
+    %_for_loop_idx[$_for_loop_curr_idx] := ... + step
+end while
+dec($_for_loop_curr_idx)
+
+Short loops are replaced by copies of body, where the index is
+substituted by int constant, so items of arrays are accessed at
+constant subscripts ("%arr[%_for_loop_idx[...] + 1]" becomes
+"%arr[3]"). Loop is unrolled if it has at most threshold iterations
+and unrolled code has at most max_lines lines. Loops, which body
+changes the index or uses $_for_loop_curr_idx (e.g. loops with
+Break() or nested loops, which were not unrolled) are left as is.
+Nested bodies are processed first, so nested loops can be unrolled
+with their parents.
+
+The pass trades size of the code for the executed instructions.
+Every considered loop is reported in loops (and in the info section
+of CompileReport as "unroll") as dict with keys:
+- trips: count of iterations
+- lines: (emitted lines of the loop, emitted lines if unrolled)
+- executed: (estimated executed statements of the loop,
+    the same if unrolled). The estimate counts every statement of
+    the body once per iteration, with loop condition and step
+- unrolled: True if the loop was replaced
+
+Example:
+script = kScript('out.txt', passes=[Unroll(threshold=16)])
+For(..., unroll=True) unrolls the loop at generation, regardless
+of the threshold.
+'''
+from ir import Assign
+from ir import BinOp
+from ir import Call
+from ir import Case
+from ir import FuncCall
+from ir import If
+from ir import Num
+from ir import Select
+from ir import While
+from ir import parse_expr
+from ir import walk
+
+from base_types import int32
+from conditions_loops import For
+from report import annotate
+
+
+_folding = {'+': lambda a, b: a + b, '-': lambda a, b: a - b,
+            '*': lambda a, b: a * b}
+
+
+def _int(expr):
+    '''returns value of int literal or None'''
+    if isinstance(expr, Num) and isinstance(expr.value, int):
+        return expr.value
+    return None
+
+
+def fold(node):
+    '''replaces arithmetic of int literals by its result'''
+    if isinstance(node, BinOp) and node.op in _folding:
+        left, right = _int(node.left), _int(node.right)
+        if left is not None and right is not None:
+            return Num.of(int32(_folding[node.op](left, right)))
+    return node
+
+
+def substitute(stmt, func):
+    '''returns copy of statement with nested ones, where every
+    expression is mapped with func. Statements without changed
+    expressions keep their text'''
+    exprs = stmt.exprs()
+    new = tuple(expr.map(func) for expr in exprs)
+    changed = any(a is not b for a, b in zip(new, exprs))
+    text = None if changed else stmt.text
+    if isinstance(stmt, Assign):
+        return Assign(*new, text=text)
+    if isinstance(stmt, Call):
+        return Call(*new, text=text)
+    if isinstance(stmt, If):
+        orelse = stmt.orelse
+        if orelse is not None:
+            orelse = [substitute(s, func) for s in orelse]
+        return If(*new, [substitute(s, func) for s in stmt.body],
+                  orelse, text=text)
+    if isinstance(stmt, While):
+        return While(*new, [substitute(s, func) for s in stmt.body],
+                     text=text)
+    if isinstance(stmt, Select):
+        return Select(*new, [substitute(s, func) for s in stmt.cases],
+                      text=text)
+    if isinstance(stmt, Case):
+        value = new[0] if new else None
+        return Case(value, [substitute(s, func) for s in stmt.body],
+                    text=text)
+    # Raw, Declare and CallFunction have no expressions
+    return stmt
+
+
+class Unroll:
+    '''optimization pass (see module doc).
+    loops is the list of considered loops of the last run'''
+
+    name = 'unroll'
+
+    def __init__(self, threshold: int=8, max_lines: int=64) -> None:
+        self.threshold = threshold
+        self.max_lines = max_lines
+        self.loops = list()
+
+    def __call__(self, program):
+        self.loops = list()
+        if For.idx is None:
+            return
+        self._curr = parse_expr(For.idx.name())
+        self._idx = parse_expr(f'{For.arr.name()}[{For.idx.name()}]')
+        self._inc = Call(FuncCall('inc', (self._curr,))).line()
+        self._dec = Call(FuncCall('dec', (self._curr,))).line()
+        for block in program.blocks:
+            self._unroll(block.body)
+        annotate('unroll', self.loops)
+
+    def _unroll(self, body):
+        for stmt in body:
+            for nested in stmt.bodies():
+                self._unroll(nested)
+        out = list()
+        pos = 0
+        while pos < len(body):
+            replacement = self._match(body[pos:pos + 4])
+            if replacement is None:
+                out.append(body[pos])
+                pos += 1
+                continue
+            out.extend(replacement)
+            pos += 4
+        body[:] = out
+
+    def _match(self, stmts):
+        '''returns unrolled statements of loop, if stmts are
+        the loop, which has to be unrolled, otherwise None'''
+        if len(stmts) < 4:
+            return None
+        inc, init, loop, dec = stmts
+        if inc.line() != self._inc or dec.line() != self._dec:
+            return None
+        if not isinstance(init, Assign) or init.target != self._idx \
+                or not isinstance(loop, While) or not loop.body:
+            return None
+        cond = loop.cond
+        start = _int(init.value)
+        if start is None or not isinstance(cond, BinOp) \
+                or cond.op != '<' or cond.left != self._idx:
+            return None
+        stop = _int(cond.right)
+        step = self._step(loop.body[-1])
+        if stop is None or not step:
+            return None
+        body = loop.body[:-1]
+        if not self._independent(body):
+            return None
+        return self._decide(body, range(start, stop, step))
+
+    def _step(self, stmt):
+        '''returns step of loop index if stmt is its increment'''
+        if isinstance(stmt, Call) and stmt.expr == FuncCall(
+                'inc', (self._idx,)):
+            return 1
+        if not isinstance(stmt, Assign) or stmt.target != self._idx:
+            return None
+        value = stmt.value
+        if isinstance(value, BinOp) and value.op == '+' \
+                and value.left == self._idx:
+            step = _int(value.right)
+            if step is not None and step > 0:
+                return step
+        return None
+
+    def _independent(self, body):
+        '''True if body uses the index only as value'''
+        for stmt in walk(body):
+            if isinstance(stmt, Assign) and stmt.target == self._idx:
+                return False
+            if not stmt.exprs() and self._curr.name in stmt.line():
+                return False
+            for expr in stmt.exprs():
+                expr = expr.map(self._hide)
+                if any(node == self._curr for node in expr.walk()):
+                    return False
+        return True
+
+    def _hide(self, node):
+        return Num('0') if node == self._idx else node
+
+    def _decide(self, body, trips):
+        lines = sum(1 for stmt in body for line in stmt.render())
+        executed = sum(1 for stmt in walk(body))
+        count = len(trips)
+        info = {
+            'trips': count,
+            'lines': (lines + 6, lines * count),
+            'executed': (count * (executed + 2) + 4, executed * count),
+            'unrolled': False}
+        self.loops.append(info)
+        if count > self.threshold or lines * count > self.max_lines:
+            return None
+        info['unrolled'] = True
+        out = list()
+        for idx in trips:
+            value = Num.of(idx)
+
+            def func(node):
+                if node == self._idx:
+                    return value
+                return fold(node)
+            out.extend(substitute(stmt, func) for stmt in body)
+        return out
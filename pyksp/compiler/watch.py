@@ -0,0 +1,95 @@
+'''recompilation of the script on change of its sources.
+
+Watcher lives in the long-lived process, where the compiler and all
+built-ins are imported once. Script module and its local imports are
+polled for changes, and the script is executed again inside the fresh
+CompileContext, so only the script itself is imported and compiled.
+'''
+import os
+import sys
+import time
+
+from cli import build_target
+from cli import unload_modules
+from cli import imported_modules
+
+
+def warm_up():
+    '''imports the compiler with all built-ins modules'''
+    import classic_builtins
+    for name in classic_builtins.__all__:
+        getattr(classic_builtins, name)
+
+
+class Watcher:
+    '''builds the script at path and rebuilds it on every change of
+    the script or local modules, imported by it.
+
+    Files are polled every interval seconds by modification time
+    and size.
+
+    Example:
+    Watcher('my_script.py').run()
+    '''
+
+    def __init__(self, path: str, interval: float=0.5,
+                 output=sys.stdout) -> None:
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self.output = output
+        self._stamps = dict()
+        warm_up()
+        # modules, imported before (by the main module, executed
+        # with kScript.watch()) have to be watched and reloaded
+        unload_modules(imported_modules(set()))
+
+    @staticmethod
+    def _stamp(file):
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def build(self):
+        '''builds the script and remembers state of its inputs.
+        returns result of cli.build_target'''
+        # changes, made during the build are not missed
+        stamps = {file: self._stamp(file) for file in self._stamps}
+        stamps[self.path] = self._stamp(self.path)
+        result = build_target(self.path, watching=True)
+        self._stamps = {file: stamps[file] if file in stamps
+                        else self._stamp(file)
+                        for file in result['inputs']}
+        name = os.path.relpath(self.path)
+        if result['error']:
+            print(f'{name}: failed in {result["time"]:.2f}s\n'
+                  f'{result["error"]}', file=self.output)
+        else:
+            outputs = ', '.join(result['outputs']) or 'clipboard'
+            print(f'{name}: compiled to {outputs} '
+                  f'in {result["time"]:.2f}s', file=self.output)
+        return result
+
+    def changed(self):
+        '''returns list of inputs, changed since the last build'''
+        return [file for file, stamp in self._stamps.items()
+                if self._stamp(file) != stamp]
+
+    def run(self, builds: int=None):
+        '''builds the script and rebuilds it on every change.
+        Stops after builds count of builds, or by KeyboardInterrupt,
+        if builds is None'''
+        count = 0
+        try:
+            while True:
+                self.build()
+                count += 1
+                if builds is not None and count >= builds:
+                    return
+                print(f'watching {len(self._stamps)} files...',
+                      file=self.output)
+                while not self.changed():
+                    time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print('stopped', file=self.output)
@@ -12,4 +12,7 @@ setuptools.setup(
     install_requires=[
         'pyperclip'
     ],
+    entry_points={
+        'console_scripts': ['pyksp=pyksp.compiler.cli:main'],
+    },
     zip_safe=False)